@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the blake2b lattice hash in ``Noise._shuffle``.
+
+Compares constructing a keyed blake2b per lookup (the previous implementation)
+against copying a prepared prototype state (the current one) and checks that
+both produce identical digests.
+
+    python scripts/bench_noise.py [--n 200000]
+"""
+
+import argparse
+import hashlib
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from seedscape.core import noise
+
+
+class _Campaign:
+    seed = "bench-seed"
+
+
+def shuffle_fresh(n: noise.Noise, nconfig: noise.NoiseConfig, *values: int) -> int:
+    h = hashlib.blake2b(key=n._key, salt=nconfig.salt, person=noise.PERSON, digest_size=8)
+    for v in values:
+        h.update(v.to_bytes(8, "big", signed=True))
+    return int.from_bytes(h.digest(), "big", signed=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=200_000, help="hashes per measurement")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    n = noise.Noise(_Campaign())
+    cfg = noise.NoiseType.altitude.value
+
+    for q in range(-50, 50):
+        assert shuffle_fresh(n, cfg, q, -q) == n._shuffle(cfg, q, -q), "digest mismatch"
+
+    coords = [(i % 997 - 498, i // 997) for i in range(args.n)]
+
+    def run_fresh():
+        for q, r in coords:
+            shuffle_fresh(n, cfg, q, r)
+
+    def run_proto():
+        for q, r in coords:
+            n._shuffle(cfg, q, r)
+
+    # Alternate the two so drift in machine load affects both alike.
+    fresh = proto = float("inf")
+    for _ in range(args.repeat):
+        fresh = min(fresh, timeit.timeit(run_fresh, number=1))
+        proto = min(proto, timeit.timeit(run_proto, number=1))
+    print(f"fresh blake2b(key=...):  {fresh / args.n * 1e9:8.1f} ns/hash")
+    print(f"prototype .copy():       {proto / args.n * 1e9:8.1f} ns/hash")
+    print(f"speedup:                 {fresh / proto:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Load test with synthetic exploration traffic or a replayed request log.
+
+``synth`` simulates players exploring the hex map: random walks (one step to a
+neighbour at a time), viewport pans (every newly visible hex plus the overview
+tile) and frontier expansion (always the next unexplored hex next to what is
+already known). ``replay`` re-issues the requests of a log recorded with
+``SEEDSCAPE_REQUEST_LOG`` (or ``synth --record``) at a multiple of their
+original pace.
+
+Without ``--url`` the app runs in-process (on a fresh temporary data dir unless
+``--data-dir`` is given), each player with its own client address so admission
+control sees separate clients; with ``--url`` requests go to a running server,
+e.g. ``poetry run uvicorn seedscape.main:app``.
+
+    python scripts/loadtest.py synth [--players 50] [--duration 30] [--mix walk=2,pan=1,frontier=1]
+    python scripts/loadtest.py replay requests.jsonl [--speed 4]
+
+The report lists throughput, latency percentiles per route, status codes and
+how many hex and tile responses were served from storage, taken from the shared
+generation cache, or generated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Only modules that do not read the environment; seedscape.main is imported once it is set up.
+from seedscape.core import hexgrid, tiles
+
+# Grid of valid hex ids: columns A..Z, rows 1..ROWS (see seedscape.core.hexgrid).
+ROWS = 40
+VIEWPORT_RADIUS = 4
+TILE_ZOOM = 3
+CACHE_HEADER = "X-Seedscape-Cache"
+
+HEX_ROUTE = "/api/{campaign_name}/hex/{hex_id}"
+TILE_ROUTE = "/api/{campaign_name}/tiles/{z}/{x}/{y}.png"
+PATH_ROUTE = "/api/{campaign_name}/path"
+
+
+@dataclass
+class Stats:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: Counter[int] = field(default_factory=Counter)
+    cache: dict[str, Counter[str]] = field(default_factory=lambda: defaultdict(Counter))
+    errors: Counter[str] = field(default_factory=Counter)
+    lag: list[float] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    def add(self, route: str, status: int, seconds: float, cache: str | None) -> None:
+        self.latencies[route].append(seconds)
+        self.statuses[status] += 1
+        if cache is not None:
+            self.cache[route][cache] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(len(v) for v in self.latencies.values())
+
+    def report(self) -> dict[str, Any]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        routes = {}
+        for route, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            routes[route] = {
+                "count": len(values),
+                **{f"p{p}_ms": round(_percentile(values, p) * 1000, 2) for p in (50, 90, 99)},
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+        cache = {}
+        for route, counts in sorted(self.cache.items()):
+            served = sum(counts.values())
+            cache[route] = {**counts, "generated_ratio": round(counts["generated"] / served, 3) if served else 0.0}
+        result: dict[str, Any] = {
+            "requests": self.total,
+            "seconds": round(elapsed, 3),
+            "throughput_rps": round(self.total / elapsed, 1) if elapsed > 0 else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+            "routes": routes,
+            "cache": cache,
+        }
+        if self.errors:
+            result["errors"] = dict(self.errors)
+        if self.lag:
+            lag = sorted(self.lag)
+            result["replay_lag_ms"] = {"p50": round(_percentile(lag, 50) * 1000, 2), "max": round(lag[-1] * 1000, 2)}
+        return result
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"{report['requests']} requests in {report['seconds']:.1f}s: {report['throughput_rps']} req/s")
+    print("status codes: " + ", ".join(f"{code}={n}" for code, n in report["statuses"].items()))
+    print(f"{'route':<48} {'count':>7}" + "".join(f"{h:>9}" for h in ("p50 ms", "p90 ms", "p99 ms", "max ms")))
+    for route, r in report["routes"].items():
+        timings = "".join(f"{r[k]:>9.2f}" for k in ("p50_ms", "p90_ms", "p99_ms", "max_ms"))
+        print(f"{route:<48} {r['count']:>7}{timings}")
+    for route, counts in report["cache"].items():
+        parts = ", ".join(f"{k}={v}" for k, v in counts.items() if k != "generated_ratio")
+        print(f"{route}: {parts} ({counts['generated_ratio']:.1%} generated)")
+    if "replay_lag_ms" in report:
+        lag = report["replay_lag_ms"]
+        print(f"replay lag: p50 {lag['p50']} ms, max {lag['max']} ms")
+    for error, n in report.get("errors", {}).items():
+        print(f"error x{n}: {error}")
+
+
+class Recorder:
+    """Writes issued requests in the format of the server's request log."""
+
+    def __init__(self, out: IO[str] | None):
+        self._out = out
+
+    def write(self, method: str, path: str, route: str, client: str) -> None:
+        if self._out is not None:
+            entry = {"t": round(time.time(), 6), "method": method, "path": path, "route": route, "client": client}
+            self._out.write(json.dumps(entry) + "\n")
+
+
+async def fetch(
+    client: httpx.AsyncClient, stats: Stats, recorder: Recorder, path: str, route: str, who: str = ""
+) -> int:
+    recorder.write("GET", path, route, who)
+    started = time.perf_counter()
+    try:
+        response = await client.get(path)
+    except httpx.HTTPError as e:
+        stats.errors[f"{type(e).__name__}: {e}"] += 1
+        return 0
+    stats.add(route, response.status_code, time.perf_counter() - started, response.headers.get(CACHE_HEADER))
+    return response.status_code
+
+
+@contextlib.asynccontextmanager
+async def target(url: str | None) -> AsyncIterator[Any]:
+    """Yield a factory ``client(player_no)`` for the server under test."""
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=30) as shared:
+            yield lambda n: contextlib.nullcontext(shared)
+        return
+
+    from seedscape import main
+
+    async with main.app.router.lifespan_context(main.app):
+
+        def client(n: int) -> httpx.AsyncClient:
+            transport = httpx.ASGITransport(app=main.app, client=(f"10.0.{n // 250}.{n % 250 + 1}", 40000 + n))
+            return httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=30)
+
+        yield client
+
+
+CAMPAIGN_ROUTE = "/api/{campaign_name}/"
+
+
+async def ensure_campaign(client: httpx.AsyncClient, name: str) -> None:
+    # Only a campaign the target does not know gets created; never post over an existing one.
+    existing = await client.get(f"/api/campaigns/{name}/biomes")
+    if existing.status_code != 404:
+        existing.raise_for_status()
+        return
+    params = [
+        ("name", name),
+        *(("biomes", b) for b in ("plains", "forest", "hills", "mountain", "water")),
+        ("biomes_css", "biomes.css"),
+        *(("features", f) for f in ("none", "ruins", "village", "tower")),
+        *(("encounters", e) for e in ("none", "bandits", "wolves")),
+    ]
+    response = await client.post("/api/campaigns", params=params)
+    response.raise_for_status()
+
+
+# --- synthetic players -------------------------------------------------------
+
+
+def _in_grid(q: int, r: int) -> bool:
+    return hexgrid.axial_to_id(q, r) is not None and r + hexgrid.ID_OFFSET < ROWS
+
+
+class Player:
+    def __init__(self, kind: str, campaign: str, rng: random.Random):
+        self.kind = kind
+        self.campaign = campaign
+        self.rng = rng
+        offset = hexgrid.ID_OFFSET
+        self.pos = (rng.randint(-offset, hexgrid.MAX_COLUMN - offset), rng.randint(-offset, ROWS - offset - 1))
+        self.explored: set[tuple[int, int]] = set()
+        self.frontier: list[tuple[int, int]] = [self.pos]
+
+    def next_requests(self) -> list[tuple[str, str]]:
+        """The requests of the player's next action as ``(path, route)`` pairs."""
+        if self.kind == "walk":
+            return self._walk()
+        if self.kind == "pan":
+            return self._pan()
+        return self._expand()
+
+    def _hex(self, q: int, r: int) -> tuple[str, str]:
+        return f"/api/{self.campaign}/hex/{hexgrid.axial_to_id(q, r)}", HEX_ROUTE
+
+    def _walk(self) -> list[tuple[str, str]]:
+        steps = [n for n in hexgrid.neighbors(*self.pos) if _in_grid(*n)]
+        self.pos = self.rng.choice(steps)
+        self.explored.add(self.pos)
+        requests = [self._hex(*self.pos)]
+        if len(self.explored) > 5 and self.rng.random() < 0.05:
+            goal = self.rng.choice(sorted(self.explored))
+            start_id, goal_id = hexgrid.axial_to_id(*self.pos), hexgrid.axial_to_id(*goal)
+            requests.append((f"/api/{self.campaign}/path?start={start_id}&goal={goal_id}", PATH_ROUTE))
+        return requests
+
+    def _pan(self) -> list[tuple[str, str]]:
+        dq, dr = self.rng.choice(hexgrid.DIRECTIONS)
+        step = self.rng.randint(1, 3)
+        moved = (self.pos[0] + dq * step, self.pos[1] + dr * step)
+        if _in_grid(*moved):
+            self.pos = moved
+        q0, r0 = self.pos
+        visible = {
+            (q, r)
+            for q in range(q0 - VIEWPORT_RADIUS, q0 + VIEWPORT_RADIUS + 1)
+            for r in range(r0 - VIEWPORT_RADIUS, r0 + VIEWPORT_RADIUS + 1)
+            if hexgrid.distance((q, r), self.pos) <= VIEWPORT_RADIUS and _in_grid(q, r)
+        }
+        # Like the frontend: load what came into view and was not loaded before.
+        requests = [self._hex(q, r) for q, r in sorted(visible - self.explored)]
+        self.explored |= visible
+        z, x, y = next(t for t in tiles.tiles_for_hex(*self.pos) if t[0] == TILE_ZOOM)
+        requests.append((f"/api/{self.campaign}/tiles/{z}/{x}/{y}.png", TILE_ROUTE))
+        return requests
+
+    def _expand(self) -> list[tuple[str, str]]:
+        while self.frontier:
+            pos = self.frontier.pop(self.rng.randrange(len(self.frontier)))
+            if pos in self.explored:
+                continue
+            self.explored.add(pos)
+            self.frontier.extend(n for n in hexgrid.neighbors(*pos) if _in_grid(*n) and n not in self.explored)
+            return [self._hex(*pos)]
+        return self._walk()
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("walk", "pan", "frontier"):
+            raise argparse.ArgumentTypeError(f"unknown behaviour {kind!r} (expected walk, pan or frontier)")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+async def run_player(
+    n: int, player: Player, client: httpx.AsyncClient, stats: Stats, recorder: Recorder, deadline: float, think: float
+) -> None:
+    while time.perf_counter() < deadline:
+        for path, route in player.next_requests():
+            await fetch(client, stats, recorder, path, route, f"player-{n}")
+        await asyncio.sleep(player.rng.expovariate(1 / think) if think > 0 else 0)
+
+
+async def synth(args: argparse.Namespace) -> Stats:
+    rng = random.Random(args.seed)
+    kinds = list(args.mix)
+    weights = [args.mix[k] for k in kinds]
+    campaigns = [f"{args.campaign}-{i}" if args.campaigns > 1 else args.campaign for i in range(args.campaigns)]
+    stats = Stats()
+    with contextlib.ExitStack() as files:
+        recorder = Recorder(files.enter_context(open(args.record, "w", encoding="utf-8")) if args.record else None)
+        async with target(args.url) as make_client, contextlib.AsyncExitStack() as clients:
+            setup = await clients.enter_async_context(make_client(0))
+            for name in campaigns:
+                await ensure_campaign(setup, name)
+            players = [
+                Player(rng.choices(kinds, weights)[0], campaigns[n % len(campaigns)], random.Random(rng.random()))
+                for n in range(args.players)
+            ]
+            sessions = [await clients.enter_async_context(make_client(n)) for n in range(args.players)]
+            stats.started = time.perf_counter()
+            deadline = stats.started + args.duration
+            await asyncio.gather(
+                *(
+                    run_player(n, p, c, stats, recorder, deadline, args.think)
+                    for n, (p, c) in enumerate(zip(players, sessions, strict=True))
+                )
+            )
+            stats.finished = time.perf_counter()
+    return stats
+
+
+# --- replay ------------------------------------------------------------------
+
+
+def read_log(path: Path) -> list[dict[str, Any]]:
+    entries = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                if entry.get("method", "GET") == "GET":
+                    entries.append(entry)
+    entries.sort(key=lambda e: e["t"])
+    return entries
+
+
+async def replay(args: argparse.Namespace) -> Stats:
+    entries = read_log(Path(args.log))
+    if not entries:
+        raise SystemExit("error: no GET requests in log")
+    stats = Stats()
+    recorder = Recorder(None)
+    limit = asyncio.Semaphore(args.concurrency)
+    t0 = entries[0]["t"]
+
+    # Each recorded client gets its own connection (and address, in-process), so per-client limits apply as recorded.
+    who = list(dict.fromkeys(e.get("client") or "" for e in entries))
+    async with target(args.url) as make_client, contextlib.AsyncExitStack() as stack:
+        clients = {c: await stack.enter_async_context(make_client(n)) for n, c in enumerate(who)}
+        # Campaigns missing from the target (e.g. a fresh data dir) get created with the default tables.
+        campaigns = {e["path"].split("/")[2] for e in entries if (e.get("route") or "").startswith(CAMPAIGN_ROUTE)}
+        for name in sorted(campaigns):
+            await ensure_campaign(clients[who[0]], name)
+
+        async def issue(entry: dict[str, Any], at: float) -> None:
+            delay = at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with limit:
+                stats.lag.append(max(0.0, time.perf_counter() - at))
+                route = entry.get("route") or entry["path"].split("?")[0]
+                await fetch(clients[entry.get("client") or ""], stats, recorder, entry["path"], route)
+
+        stats.started = time.perf_counter()
+        await asyncio.gather(*(issue(e, stats.started + (e["t"] - t0) / args.speed) for e in entries))
+        stats.finished = time.perf_counter()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="base URL of a running server (default: run the app in-process)")
+    parser.add_argument("--data-dir", help="data dir for the in-process app (default: a fresh temporary dir)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("synth", help="synthesise exploration traffic")
+    p.add_argument("--players", type=int, default=50)
+    p.add_argument("--duration", type=float, default=30.0, help="seconds")
+    p.add_argument("--think", type=float, default=0.2, help="mean pause between a player's actions (s)")
+    p.add_argument("--mix", type=parse_mix, default=parse_mix("walk=2,pan=1,frontier=1"), help="behaviour weights")
+    p.add_argument("--campaign", default="loadtest", help="campaign name (created if missing)")
+    p.add_argument("--campaigns", type=int, default=1, help="spread players over this many campaigns")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--record", help="write the issued requests to this log for replay")
+
+    p = sub.add_parser("replay", help="replay a recorded request log")
+    p.add_argument("log")
+    p.add_argument("--speed", type=float, default=1.0, help="replay this many times faster than recorded")
+    p.add_argument("--concurrency", type=int, default=256, help="max requests in flight")
+
+    args = parser.parse_args()
+    if not args.url:
+        data_dir = args.data_dir or tempfile.mkdtemp(prefix="seedscape-loadtest-")
+        os.environ["SEEDSCAPE_DATA_DIR"] = str(Path(data_dir).resolve())
+        os.environ.setdefault("SEEDSCAPE_MIGRATE_ON_START", "0")
+        print(f"in-process app, data dir {os.environ['SEEDSCAPE_DATA_DIR']}", file=sys.stderr)
+
+    stats = asyncio.run(synth(args) if args.command == "synth" else replay(args))
+    report = stats.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
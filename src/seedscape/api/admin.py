@@ -0,0 +1,47 @@
+import hmac
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from seedscape.api.profiling import ProfiledRoute
+from seedscape.core import envconfig, migrator, profiling, storage
+
+
+def require_admin(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    if not envconfig.SEEDSCAPE_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (SEEDSCAPE_ADMIN_TOKEN not set)")
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode(), envconfig.SEEDSCAPE_ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)], route_class=ProfiledRoute)
+
+
+@router.get("/profiles")
+def list_profiles() -> list[dict[str, Any]]:
+    return profiling.list_profiles()
+
+
+@router.get("/profiles/{profile_id}.{extension}")
+def download_profile(profile_id: str, extension: str) -> FileResponse:
+    path = profiling.profile_file(profile_id, extension)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=path.name, media_type="text/plain" if extension != "prof" else None)
+
+
+@router.get("/migrations")
+def migration_status() -> dict[str, Any]:
+    return migrator.runner.status()
+
+
+@router.post("/migrations", status_code=202)
+def start_migrations(campaign: Annotated[list[str] | None, Query()] = None) -> dict[str, Any]:
+    for name in campaign or []:
+        if not storage.campaign_exists(name):
+            raise HTTPException(status_code=404, detail=f"Campaign '{name}' not found")
+    started = migrator.runner.start(campaign)
+    return {"started": started, **migrator.runner.status()}
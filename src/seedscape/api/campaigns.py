@@ -1,20 +1,35 @@
+import asyncio
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import ValidationError
 
-from seedscape.core import storage
-from seedscape.core.models import BiomeType, CampaignMeta, EncounterType, FeatureType
+from seedscape.api.profiling import ProfiledRoute
+from seedscape.core import archive, catalog, storage
+from seedscape.core.models import BiomeType, CampaignMeta, CampaignSummary, EncounterType, FeatureType
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 log = logging.getLogger(__name__)
 
+MAX_PAGE_SIZE = 1000
 
-@router.get("/campaigns", response_model=list[str])
-def list_campaigns():
-    return storage.list_campaigns()
+
+@router.get("/campaigns", response_model=list[str] | list[CampaignSummary])
+def list_campaigns(
+    response: Response,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 100,
+    sort: Annotated[str, Query(pattern="^(" + "|".join(catalog.SORT_COLUMNS) + ")$")] = "name",
+    order: Annotated[str, Query(pattern="^(asc|desc)$")] = "asc",
+    summary: bool = False,
+) -> list[str] | list[CampaignSummary]:
+    total, page = storage.list_campaign_summaries(offset=offset, limit=limit, sort=sort, descending=order == "desc")
+    response.headers["X-Total-Count"] = str(total)
+    if summary:
+        return page
+    return [s.name for s in page]
 
 
 @router.get("/campaigns/{campaign_name}", response_model=CampaignMeta)
@@ -23,7 +38,7 @@ def get_campaign(campaign_name: str) -> CampaignMeta:
         campaign = storage.load_campaign_meta(campaign_name)
     except ValidationError as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
-    except RuntimeError as e:
+    except (RuntimeError, ValueError) as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
     return campaign
 
@@ -96,3 +111,62 @@ def create_campaign(
     except Exception as e:  # pydantic validation or storage errors
         raise HTTPException(status_code=500, detail=str(e)) from e
     return meta
+
+
+@router.get("/campaigns/{campaign_name}/export")
+def export_campaign(campaign_name: str, offset: Annotated[int, Query(ge=0)] = 0) -> StreamingResponse:
+    try:
+        chunks = archive.iter_export(campaign_name, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    filename = f"{campaign_name}.tar.gz"
+    return StreamingResponse(
+        chunks,
+        media_type=archive.MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/campaigns/{campaign_name}/import")
+def get_import_status(campaign_name: str) -> dict[str, int]:
+    try:
+        return {"received": archive.upload_size(campaign_name)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.put("/campaigns/{campaign_name}/import")
+async def upload_import_chunk(
+    campaign_name: str, request: Request, offset: Annotated[int, Query(ge=0)] = 0
+) -> dict[str, int]:
+    # Streamed to the .part file as it arrives, so a chunk is never held in memory whole.
+    try:
+        with archive.open_upload(campaign_name, offset) as write:
+            async for data in request.stream():
+                await asyncio.to_thread(write, data)
+    except archive.UploadOffsetError as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.expected)}) from e
+    except archive.UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {"received": archive.upload_size(campaign_name)}
+
+
+@router.post("/campaigns/{campaign_name}/import/complete", response_model=CampaignMeta)
+def complete_import(campaign_name: str, sha256: Annotated[str | None, Query()] = None) -> CampaignMeta:
+    try:
+        return archive.complete_upload(campaign_name, sha256=sha256, name=campaign_name)
+    except FileExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.delete("/campaigns/{campaign_name}/import")
+def discard_import(campaign_name: str) -> dict[str, int]:
+    try:
+        archive.discard_upload(campaign_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {"received": 0}
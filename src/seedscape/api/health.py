@@ -0,0 +1,20 @@
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from seedscape.api.profiling import ProfiledRoute
+from seedscape.core import lifecycle
+
+router = APIRouter(prefix="/healthz", route_class=ProfiledRoute)
+
+
+@router.get("/live")
+def live() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready() -> JSONResponse:
+    status: dict[str, Any] = lifecycle.manager.status()
+    return JSONResponse(status_code=200 if lifecycle.manager.ready else 503, content=status)
@@ -1,24 +1,52 @@
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 
-from seedscape.core import generator, storage
+from seedscape.api.profiling import ProfiledRoute
+from seedscape.core import admission, generator, storage
 from seedscape.core.models import Hex
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 log = logging.getLogger(__name__)
 
+# Tells clients (and the load-test harness) where a hex came from.
+CACHE_HEADER = "X-Seedscape-Cache"
+
 
 @router.get("/{campaign_name}/hex/{hex_id}", response_model=Hex)
-def get_hex(campaign_name: str, hex_id: str) -> Hex:
-    data = storage.load_hex(campaign_name, hex_id)
-    if data:
-        return data
+def get_hex(campaign_name: str, hex_id: str, request: Request, response: Response) -> Hex | Response:
+    client = admission.client_id(request)
+    raw = storage.load_hex_json(campaign_name, hex_id)
+    if raw is not None:
+        admission.controller.admit(client, campaign_name, generate=False)
+        if storage.is_current_hex_json(raw):
+            # Written by us in the current schema: skip parsing and response validation.
+            return Response(content=raw, media_type="application/json", headers={CACHE_HEADER: "hit"})
+        response.headers[CACHE_HEADER] = "hit"
+        return storage.parse_hex_json(campaign_name, hex_id, raw)
 
-    campaign = storage.load_campaign_meta(campaign_name)
     try:
-        hex_model = generator.generate_hex(campaign, hex_id)
-        storage.save_hex(campaign_name, hex_id, hex_model)
+        stored = storage.load_overlay_hex_json(campaign_name, hex_id)
+        if stored is not None:
+            admission.controller.admit(client, campaign_name, generate=False)
+            return Response(content=stored, media_type="application/json", headers={CACHE_HEADER: "hit"})
+
+        campaign = storage.load_campaign_meta(campaign_name)
+        rules_key = generator.rules_key(campaign)
+        generated = storage.load_generated(rules_key, hex_id)
+        if generated is not None:
+            # Another campaign with the same seed and rules generated it already.
+            admission.controller.admit(client, campaign_name, generate=False)
+            hex_model = Hex.model_validate({**generated, "id": hex_id, "discovered": True})
+            storage.save_overlay_hex(campaign_name, rules_key, hex_model)
+            response.headers[CACHE_HEADER] = "shared"
+            return hex_model
+
+        admission.controller.admit(client, campaign_name, generate=True)
+        with admission.controller.generation_slot():
+            hex_model = generator.generate_hex(campaign, hex_id)
+            storage.save_overlay_hex(campaign_name, rules_key, hex_model)
+        response.headers[CACHE_HEADER] = "generated"
         return hex_model
     except RuntimeError as e:
         log.error("Hex generation failed for %s/%s: %s", campaign_name, hex_id, e)
@@ -0,0 +1,35 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from seedscape.api.profiling import ProfiledRoute
+from seedscape.core import admission, hexgrid, storage
+from seedscape.core.layers import Pipeline
+from seedscape.core.models import HexId
+from seedscape.core.noise import Noise
+
+router = APIRouter(route_class=ProfiledRoute)
+
+MAX_BATCH = 1024
+
+
+@router.get("/{campaign_name}/layers")
+def get_layers(
+    campaign_name: str,
+    request: Request,
+    hex: Annotated[list[HexId], Query(min_length=1, max_length=MAX_BATCH)],
+    layer: Annotated[list[str] | None, Query()] = None,
+) -> dict[str, dict[HexId, float]]:
+    try:
+        campaign = storage.load_campaign_meta(campaign_name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    admission.controller.admit(admission.client_id(request), campaign_name, generate=True)
+    try:
+        coords = [hexgrid.id_to_axial(hex_id) for hex_id in hex]
+        pipeline = Pipeline(campaign.layers)
+        with admission.controller.generation_slot():
+            values = pipeline.evaluate(Noise(campaign), coords, layer)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {name: dict(zip(hex, column, strict=True)) for name, column in values.items()}
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from seedscape.api.profiling import ProfiledRoute
+from seedscape.core import admission
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/metrics")
+def get_metrics() -> dict[str, dict[str, float | int]]:
+    return {"admission": admission.controller.snapshot()}
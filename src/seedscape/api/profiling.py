@@ -0,0 +1,61 @@
+import functools
+import inspect
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from seedscape.core import profiling
+
+log = logging.getLogger(__name__)
+
+
+def _profiled(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            session = profiling.current.get()
+            if session is None:
+                return await endpoint(*args, **kwargs)
+            return await session.run_async(endpoint, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        session = profiling.current.get()
+        if session is None:
+            return endpoint(*args, **kwargs)
+        return session.run(endpoint, *args, **kwargs)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route whose handler runs under the request's profile session, if there is one."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+
+async def profiling_middleware(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    if not profiling.should_profile(
+        request.headers.get(profiling.PROFILE_HEADER), request.headers.get("X-Admin-Token")
+    ):
+        return await call_next(request)
+
+    session = profiling.ProfileSession(request.method, request.url.path)
+    token = profiling.current.set(session)
+    try:
+        response = await call_next(request)
+    finally:
+        profiling.current.reset(token)
+    if session.captured:
+        try:
+            response.headers[profiling.PROFILE_HEADER + "-Id"] = session.save(response.status_code)
+        except OSError as e:
+            log.error("Saving profile for %s %s failed: %s", request.method, request.url.path, e)
+    return response
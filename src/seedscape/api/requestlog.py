@@ -0,0 +1,60 @@
+"""Optional request log for replaying real traffic with ``scripts/loadtest.py``.
+
+With ``SEEDSCAPE_REQUEST_LOG`` set, every request is appended to that file as
+one JSON line: wall-clock start time, method, path with query string, matched
+route template, client address, status, duration and the ``X-Seedscape-Cache`` outcome.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import IO
+
+from fastapi import Request, Response
+
+from seedscape.api.hexes import CACHE_HEADER
+from seedscape.core import envconfig
+
+_lock = threading.Lock()
+_file: IO[str] | None = None
+
+
+def _log_file() -> IO[str]:
+    global _file
+    if _file is None:
+        path = Path(envconfig.SEEDSCAPE_REQUEST_LOG)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _file = path.open("a", encoding="utf-8", buffering=1)
+    return _file
+
+
+def _route_template(request: Request) -> str | None:
+    template = getattr(request.scope.get("route"), "path", None)
+    if template is None:
+        return None
+    # Depending on the FastAPI version the matched route may lack the prefix it was included with;
+    # the request path has as many trailing segments as the template, the rest is that prefix.
+    segments = request.url.path.split("/")
+    return "/".join(segments[: len(segments) - template.count("/")]) + template
+
+
+async def request_log_middleware(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    started = time.time()
+    perf = time.perf_counter()
+    response = await call_next(request)
+    path = request.url.path + (f"?{request.url.query}" if request.url.query else "")
+    entry = {
+        "t": round(started, 6),
+        "method": request.method,
+        "path": path,
+        "route": _route_template(request),
+        "client": request.client.host if request.client else None,
+        "status": response.status_code,
+        "ms": round((time.perf_counter() - perf) * 1000, 3),
+        "cache": response.headers.get(CACHE_HEADER),
+    }
+    with _lock:
+        _log_file().write(json.dumps(entry) + "\n")
+    return response
@@ -0,0 +1,68 @@
+import logging
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from seedscape.api.hexes import CACHE_HEADER
+from seedscape.api.profiling import ProfiledRoute
+from seedscape.core import admission, generator, hexgrid, storage, tiles
+from seedscape.core.models import CampaignMeta
+
+router = APIRouter(route_class=ProfiledRoute)
+log = logging.getLogger(__name__)
+
+
+def _palette(campaign_name: str) -> dict[str, tiles.RGBA]:
+    css_path = storage.campaign_biomes_css_path(campaign_name)
+    if not css_path:
+        return {}
+    return tiles.parse_palette(css_path.read_text(encoding="utf-8"))
+
+
+def _render(campaign: CampaignMeta, palette: dict[str, tiles.RGBA], z: int, x: int, y: int) -> bytes | None:
+    """Render a tile, or return None if it lies entirely outside the map grid."""
+    on_grid = False
+
+    def color_of(q: int, r: int) -> tiles.RGBA:
+        nonlocal on_grid
+        hex_id = hexgrid.axial_to_id(q, r)
+        if hex_id is None:
+            return tiles.TRANSPARENT
+        on_grid = True
+        # Only the biome is drawn, so unstored hexes skip full generation (features, models).
+        stored = storage.load_hex(campaign.name, hex_id)
+        biome = stored.biome.name if stored is not None else generator.hex_biome_type(campaign, hex_id).name
+        return palette.get(biome, tiles.UNKNOWN_BIOME)
+
+    data = tiles.render_tile(z, x, y, color_of)
+    return data if on_grid else None
+
+
+@router.get("/{campaign_name}/tiles/{z}/{x}/{y}.png", response_class=Response)
+def get_tile(campaign_name: str, z: int, x: int, y: int, request: Request) -> Response:
+    if not 0 <= z <= tiles.MAX_ZOOM:
+        raise HTTPException(status_code=404, detail=f"zoom expected from 0..{tiles.MAX_ZOOM}")
+    try:
+        campaign = storage.load_campaign_meta(campaign_name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+    palette = _palette(campaign_name)
+    key = tiles.palette_key(palette)
+    data = storage.load_tile(campaign_name, key, z, x, y)
+    client = admission.client_id(request)
+    admission.controller.admit(client, campaign_name, generate=data is None)
+    cache = "hit" if data is not None else "generated"
+    if data is None:
+        epoch = storage.tile_epoch(campaign_name)
+        try:
+            with admission.controller.generation_slot():
+                data = _render(campaign, palette, z, x, y)
+        except RuntimeError as e:
+            log.error("Tile rendering failed for %s %d/%d/%d: %s", campaign_name, z, x, y, e)
+            raise HTTPException(status_code=500, detail=str(e)) from e
+        if data is None:
+            # Not cached, so requests for arbitrary far-off tiles cannot fill the disk.
+            raise HTTPException(status_code=404, detail="tile lies outside the map grid")
+        storage.save_tile(campaign_name, key, z, x, y, data, epoch=epoch)
+    return Response(content=data, media_type="image/png", headers={CACHE_HEADER: cache})
@@ -0,0 +1,77 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from seedscape.api.profiling import ProfiledRoute
+from seedscape.core import admission, generator, pathfinding, storage
+from seedscape.core.models import CampaignMeta, Hex, HexId, TravelPath
+
+router = APIRouter(route_class=ProfiledRoute)
+log = logging.getLogger(__name__)
+
+PATHFINDER_CACHE_SIZE = 32
+
+# One pathfinder per recently used campaign so its cost cache survives between requests.
+_pathfinders: OrderedDict[str, pathfinding.Pathfinder] = OrderedDict()
+_pathfinders_lock = threading.Lock()
+
+
+def _hex_source(campaign: CampaignMeta):
+    def load_or_generate(hex_id: HexId) -> Hex:
+        return storage.load_hex(campaign.name, hex_id) or generator.generate_hex(campaign, hex_id)
+
+    return load_or_generate
+
+
+def _invalidate_cost(campaign_name: str, hex_id: HexId) -> None:
+    with _pathfinders_lock:
+        finder = _pathfinders.get(campaign_name)
+    if finder is not None:
+        finder.invalidate(hex_id)
+
+
+storage.on_biome_change(_invalidate_cost)
+
+
+def _pathfinder(campaign_name: str) -> pathfinding.Pathfinder:
+    try:
+        campaign = storage.load_campaign_meta(campaign_name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    with _pathfinders_lock:
+        finder = _pathfinders.get(campaign_name)
+        if finder is None or finder.campaign != campaign:
+            finder = pathfinding.Pathfinder(campaign, _hex_source(campaign))
+            _pathfinders[campaign_name] = finder
+        _pathfinders.move_to_end(campaign_name)
+        if len(_pathfinders) > PATHFINDER_CACHE_SIZE:
+            _pathfinders.popitem(last=False)
+    return finder
+
+
+@router.get("/{campaign_name}/path", response_model=TravelPath)
+def get_path(
+    campaign_name: str,
+    request: Request,
+    start: Annotated[HexId, Query(...)],
+    goal: Annotated[HexId, Query(...)],
+    max_expansions: Annotated[int, Query(ge=1, le=pathfinding.DEFAULT_MAX_EXPANSIONS)] = (
+        pathfinding.DEFAULT_MAX_EXPANSIONS
+    ),
+) -> TravelPath:
+    finder = _pathfinder(campaign_name)
+    admission.controller.admit(admission.client_id(request), campaign_name, generate=True)
+    try:
+        with admission.controller.generation_slot():
+            result = finder.find_path(start, goal, max_expansions=max_expansions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except RuntimeError as e:
+        log.error("Path search failed for %s %s->%s: %s", campaign_name, start, goal, e)
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if result is None:
+        raise HTTPException(status_code=404, detail="No path found within search limits")
+    return result
@@ -0,0 +1,108 @@
+"""Command line entry point: ``seedscape <command> ...``."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from seedscape.core import archive, migrator, regenerate, storage
+from seedscape.core.models import CampaignMeta
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    out = Path(args.output or f"{args.campaign}.tar.gz")
+    offset = out.stat().st_size if args.resume and out.exists() else 0
+    with out.open("ab" if offset else "wb") as f:
+        for chunk in archive.iter_export(args.campaign, offset=offset):
+            f.write(chunk)
+    print(f"{archive.file_sha256(out)}  {out}")
+    return 0
+
+
+def _cmd_import(args: argparse.Namespace) -> int:
+    path = Path(args.archive)
+    if args.sha256 and archive.file_sha256(path) != args.sha256.lower():
+        print("error: archive checksum mismatch", file=sys.stderr)
+        return 1
+    with path.open("rb") as f:
+        meta = archive.import_archive(f, name=args.name)
+    print(f"imported campaign {meta.name}")
+    return 0
+
+
+def _cmd_reindex(args: argparse.Namespace) -> int:
+    storage.rebuild_catalog()
+    total, _ = storage.list_campaign_summaries(limit=0)
+    print(f"indexed {total} campaigns")
+    return 0
+
+
+def _cmd_regenerate(args: argparse.Namespace) -> int:
+    meta = None
+    if args.meta:
+        meta = CampaignMeta.model_validate_json(Path(args.meta).read_bytes())
+        meta = meta.model_copy(update={"name": args.campaign})
+    regen = regenerate.Regenerator(args.campaign, meta, workers=args.workers, batch_size=args.batch_size)
+    for diff in regen.diffs(apply=args.apply):
+        print(diff.to_json())
+    action = "updated" if args.apply else "would change"
+    print(f"scanned {regen.scanned} hexes, {action} {regen.changed}", file=sys.stderr)
+    return 0
+
+
+def _cmd_migrate(args: argparse.Namespace) -> int:
+    for name in args.campaigns or storage.list_campaigns():
+        progress = migrator.Migrator(name, batch_size=args.batch_size, pause=args.pause).run()
+        print(f"{name}: scanned {progress.scanned} hexes, migrated {progress.migrated}, failed {progress.failed}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="seedscape")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("export", help="pack a campaign into a single .tar.gz archive")
+    p.add_argument("campaign")
+    p.add_argument("-o", "--output", help="archive path (default: <campaign>.tar.gz)")
+    p.add_argument("--resume", action="store_true", help="continue a partially written archive")
+    p.set_defaults(func=_cmd_export)
+
+    p = sub.add_parser("import", help="unpack a campaign archive")
+    p.add_argument("archive")
+    p.add_argument("--name", help="store under this campaign name instead of the archived one")
+    p.add_argument("--sha256", help="expected sha256 of the archive file")
+    p.set_defaults(func=_cmd_import)
+
+    p = sub.add_parser("regenerate", help="regenerate stored hexes against the campaign rules, printing a diff")
+    p.add_argument("campaign")
+    p.add_argument("--meta", help="candidate meta.json to diff against (default: the stored one)")
+    p.add_argument("--apply", action="store_true", help="write changes (and --meta) instead of a dry run")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--batch-size", type=int, default=regenerate.DEFAULT_BATCH_SIZE)
+    p.set_defaults(func=_cmd_regenerate)
+
+    p = sub.add_parser("reindex", help="rebuild the campaign catalog from the campaign directories")
+    p.set_defaults(func=_cmd_reindex)
+
+    p = sub.add_parser("migrate", help="rewrite stored hexes of older schema versions (resumable)")
+    p.add_argument("campaigns", nargs="*", help="campaigns to migrate (default: all)")
+    p.add_argument("--batch-size", type=int, default=None, help="hexes per batch")
+    p.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    p.set_defaults(func=_cmd_migrate)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (ValueError, FileExistsError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
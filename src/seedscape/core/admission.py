@@ -0,0 +1,195 @@
+"""Admission control for generation-heavy endpoints.
+
+Every request is charged against a token bucket for its client; requests that
+have to generate hexes are charged more and additionally against a bucket for
+the campaign. Generation itself runs in a bounded number of slots with a bounded
+wait queue, so a flood of misses is turned away early instead of piling up in
+the server's thread pool.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from seedscape.core import envconfig
+
+if TYPE_CHECKING:
+    from starlette.requests import Request
+
+HIT_COST = 1.0
+GENERATION_COST = 5.0
+MAX_TRACKED_KEYS = 10_000
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; maps to an HTTP status with ``Retry-After``."""
+
+    def __init__(self, status_code: int, retry_after: float, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, cost: float, now: float) -> float:
+        """Take ``cost`` tokens; return 0 on success, else the seconds until they are available."""
+        self._refill(now)
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class _Buckets:
+    """Token buckets per key, forgetting the least recently used keys beyond a limit."""
+
+    def __init__(self, rate: float, capacity: float, max_keys: int = MAX_TRACKED_KEYS):
+        self.rate = rate
+        self.capacity = capacity
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def get(self, key: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity, now)
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        *,
+        client_rate: float,
+        client_burst: float,
+        campaign_rate: float,
+        campaign_burst: float,
+        max_generations: int,
+        max_queue: int,
+        queue_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_generations < 1:
+            raise ValueError(f"max_generations expected to be 1 or greater, but is {max_generations}")
+        for name, value in (("client_rate", client_rate), ("campaign_rate", campaign_rate)):
+            if value <= 0:
+                raise ValueError(f"{name} expected to be greater than 0, but is {value}")
+        self._clients = _Buckets(client_rate, client_burst)
+        self._campaigns = _Buckets(campaign_rate, campaign_burst)
+        self._max_generations = max_generations
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(max_generations)
+        self._active = 0
+        self._waiting = 0
+        self._counters = {
+            "admitted_hits": 0,
+            "admitted_generations": 0,
+            "rejected_client_rate": 0,
+            "rejected_campaign_rate": 0,
+            "rejected_queue_full": 0,
+            "rejected_queue_timeout": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> AdmissionController:
+        return cls(
+            client_rate=envconfig.SEEDSCAPE_CLIENT_RATE,
+            client_burst=envconfig.SEEDSCAPE_CLIENT_BURST,
+            campaign_rate=envconfig.SEEDSCAPE_CAMPAIGN_RATE,
+            campaign_burst=envconfig.SEEDSCAPE_CAMPAIGN_BURST,
+            max_generations=envconfig.SEEDSCAPE_MAX_GENERATIONS,
+            max_queue=envconfig.SEEDSCAPE_GENERATION_QUEUE,
+            queue_timeout=envconfig.SEEDSCAPE_GENERATION_TIMEOUT,
+        )
+
+    def admit(self, client: str, campaign: str, *, generate: bool) -> None:
+        """Charge a request against the rate limits; raise ``AdmissionRejected`` (429) if exhausted."""
+        cost = GENERATION_COST if generate else HIT_COST
+        with self._lock:
+            now = self._clock()
+            client_bucket = self._clients.get(client, now)
+            wait = client_bucket.take(cost, now)
+            if wait:
+                self._counters["rejected_client_rate"] += 1
+                raise AdmissionRejected(429, wait, "client rate limit exceeded")
+            if generate:
+                wait = self._campaigns.get(campaign, now).take(cost, now)
+                if wait:
+                    client_bucket.tokens += cost  # refund, the request is not served
+                    self._counters["rejected_campaign_rate"] += 1
+                    raise AdmissionRejected(429, wait, "campaign rate limit exceeded")
+                self._counters["admitted_generations"] += 1
+            else:
+                self._counters["admitted_hits"] += 1
+
+    @contextmanager
+    def generation_slot(self) -> Iterator[None]:
+        """Hold one of the bounded generation slots; raise ``AdmissionRejected`` (503) when overloaded."""
+        with self._lock:
+            if self._active >= self._max_generations and self._waiting >= self._max_queue:
+                self._counters["rejected_queue_full"] += 1
+                raise AdmissionRejected(503, self._queue_timeout, "generation queue full")
+            self._waiting += 1
+        acquired = self._slots.acquire(timeout=self._queue_timeout)
+        with self._lock:
+            self._waiting -= 1
+            if not acquired:
+                self._counters["rejected_queue_timeout"] += 1
+                raise AdmissionRejected(503, self._queue_timeout, "generation queue timeout")
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+
+    def snapshot(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "generations_active": self._active,
+                "generations_waiting": self._waiting,
+                "max_generations": self._max_generations,
+                "max_queue": self._max_queue,
+                "tracked_clients": len(self._clients),
+                "tracked_campaigns": len(self._campaigns),
+                **self._counters,
+            }
+
+
+def client_id(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+controller = AdmissionController.from_env()
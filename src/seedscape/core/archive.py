@@ -0,0 +1,337 @@
+"""Streaming campaign export/import as a single tar+gzip archive.
+
+Archive layout (in this order)::
+
+    meta.json
+    <biomes_css>          (if present)
+    hexes/<hex_id>.json   (sorted by file name)
+    CHECKSUM              (sha256 over all preceding member names and contents)
+
+Hexes stored as overlays on the shared generation cache are written out in
+full, so archives are self-contained; on import, hexes that match the local
+generation cache are turned back into overlays.
+
+The export is byte-for-byte reproducible as long as the campaign files do not
+change, which lets an interrupted download resume at any byte offset by
+regenerating the stream and skipping what was already sent.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import tarfile
+import zlib
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import IO
+
+from seedscape.core import storage
+from seedscape.core.models import CampaignMeta, Hex
+
+CHECKSUM_NAME = "CHECKSUM"
+MEDIA_TYPE = "application/gzip"
+CHUNK_SIZE = 64 * 1024
+# Most bytes a single upload request may append; larger archives are sent in several.
+MAX_UPLOAD_CHUNK = 64 * 1024 * 1024
+
+_CAMPAIGN_NAME_RE = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+_HEX_MEMBER_RE = re.compile(r"^hexes/[^/]+\.json$")
+
+
+def validate_campaign_name(name: str) -> str:
+    if not _CAMPAIGN_NAME_RE.match(name):
+        raise ValueError(f"invalid campaign name {name!r}")
+    return name
+
+
+def imports_dir() -> Path:
+    return storage.DATA_DIR / "imports"
+
+
+class _ChunkSink:
+    """Write-only file object that collects written bytes until drained."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _member_digest_update(digest, name: str, data: bytes) -> None:
+    digest.update(name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(len(data).to_bytes(8, "big"))
+    digest.update(data)
+
+
+def _css_file(campaign_dir: Path, meta: CampaignMeta) -> Path | None:
+    css = (campaign_dir / meta.biomes_css).resolve()
+    if campaign_dir.resolve() not in css.parents or not css.is_file():
+        return None
+    return css
+
+
+def _file_member(name: str, path: Path) -> tuple[str, bytes, int]:
+    return name, path.read_bytes(), int(path.stat().st_mtime)
+
+
+def _export_files(campaign_name: str, meta: CampaignMeta) -> Iterator[tuple[str, bytes, int]]:
+    campaign_dir = storage.CAMPAIGNS_DIR / campaign_name
+    yield _file_member("meta.json", campaign_dir / "meta.json")
+    css = _css_file(campaign_dir, meta)
+    if css is not None:
+        yield _file_member(css.relative_to(campaign_dir.resolve()).as_posix(), css)
+    full = set(storage.iter_hex_ids(campaign_name))
+    for hex_id in sorted(full | set(storage.iter_overlay_ids(campaign_name))):
+        if hex_id in full:
+            yield _file_member(f"hexes/{hex_id}.json", campaign_dir / "hexes" / f"{hex_id}.json")
+            continue
+        hex_model = storage.load_overlay_hex(campaign_name, hex_id)
+        if hex_model is not None:
+            overlay = campaign_dir / "overlays" / f"{hex_id}.json"
+            data = hex_model.model_dump_json(indent=2).encode("utf-8")
+            yield f"hexes/{hex_id}.json", data, int(overlay.stat().st_mtime)
+
+
+def _tarinfo(name: str, size: int, mtime: int) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = mtime
+    info.mode = 0o644
+    return info
+
+
+def iter_export(campaign_name: str, offset: int = 0) -> Iterator[bytes]:
+    """Return the compressed archive of a campaign as an iterator of chunks, starting at byte ``offset``.
+
+    The campaign is checked eagerly (``ValueError`` if unknown); files are then read
+    and compressed one at a time, so memory use does not grow with the number of hexes.
+    """
+    validate_campaign_name(campaign_name)
+    if offset < 0:
+        raise ValueError(f"offset expected to be 0 or greater, but is {offset}")
+    meta = storage.load_campaign_meta(campaign_name)
+    return _generate_export(_export_files(campaign_name, meta), offset)
+
+
+def _generate_export(files: Iterator[tuple[str, bytes, int]], offset: int) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    digest = hashlib.sha256()
+    skip = offset
+
+    def emit(data: bytes) -> Iterator[bytes]:
+        nonlocal skip
+        if skip >= len(data):
+            skip -= len(data)
+            return
+        yield data[skip:]
+        skip = 0
+
+    with (
+        gzip.GzipFile(fileobj=sink, mode="wb", mtime=0) as gz,
+        tarfile.open(fileobj=gz, mode="w|", format=tarfile.PAX_FORMAT) as tar,
+    ):
+        for name, data, mtime in files:
+            _member_digest_update(digest, name, data)
+            tar.addfile(_tarinfo(name, len(data), mtime), _BytesReader(data))
+            yield from emit(sink.drain())
+        checksum = digest.hexdigest().encode("ascii")
+        tar.addfile(_tarinfo(CHECKSUM_NAME, len(checksum), 0), _BytesReader(checksum))
+    yield from emit(sink.drain())
+
+
+class _BytesReader:
+    def __init__(self, data: bytes) -> None:
+        self._data = memoryview(data)
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            size = len(self._data) - self._pos
+        chunk = self._data[self._pos : self._pos + size].tobytes()
+        self._pos += len(chunk)
+        return chunk
+
+
+def import_archive(fileobj: IO[bytes], name: str | None = None) -> CampaignMeta:
+    """Unpack an archive produced by :func:`iter_export` into a new campaign.
+
+    The archive is read as a stream and extracted into a staging directory that
+    is moved into place only after the embedded checksum matched. ``name``
+    overrides the campaign name stored in the archive.
+    Raises ``ValueError`` for malformed archives and ``FileExistsError`` if the
+    campaign already exists.
+    """
+    staging_root = imports_dir()
+    staging_root.mkdir(parents=True, exist_ok=True)
+    staging = staging_root / f"staging-{os.getpid()}-{id(fileobj)}"
+    shutil.rmtree(staging, ignore_errors=True)
+    (staging / "hexes").mkdir(parents=True)
+    try:
+        meta = _extract(fileobj, staging)
+        if name is not None:
+            meta = meta.model_copy(update={"name": name})
+        validate_campaign_name(meta.name)
+        (staging / "meta.json").write_text(meta.model_dump_json(indent=2), encoding="utf-8")
+
+        target = storage.CAMPAIGNS_DIR / meta.name
+        if target.exists():
+            raise FileExistsError(f"Campaign {meta.name} already exists.")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging.rename(target)
+        storage.compact_hexes(meta.name)
+        storage.index_campaign(meta.name)
+        return meta
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _extract(fileobj: IO[bytes], staging: Path) -> CampaignMeta:
+    digest = hashlib.sha256()
+    meta: CampaignMeta | None = None
+    checksum: str | None = None
+    try:
+        with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+            for member in tar:
+                if checksum is not None:
+                    raise ValueError("archive has members after CHECKSUM")
+                if not member.isfile():
+                    raise ValueError(f"unexpected archive member {member.name!r}")
+                src = tar.extractfile(member)
+                data = src.read() if src else b""
+                if member.name == CHECKSUM_NAME:
+                    checksum = data.decode("ascii").strip()
+                    continue
+                _member_digest_update(digest, member.name, data)
+                if member.name == "meta.json":
+                    meta = CampaignMeta.model_validate_json(data)
+                    continue
+                if meta is None:
+                    raise ValueError("archive must start with meta.json")
+                if _HEX_MEMBER_RE.match(member.name):
+                    Hex.model_validate_json(data)
+                elif member.name != meta.biomes_css:
+                    raise ValueError(f"unexpected archive member {member.name!r}")
+                target = (staging / member.name).resolve()
+                if staging.resolve() not in target.parents:
+                    raise ValueError(f"unexpected archive member {member.name!r}")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(data)
+    except (tarfile.TarError, EOFError, gzip.BadGzipFile, zlib.error) as e:
+        raise ValueError(f"corrupt campaign archive: {e}") from e
+    if meta is None:
+        raise ValueError("archive does not contain meta.json")
+    if checksum is None:
+        raise ValueError("archive does not contain a CHECKSUM")
+    if checksum != digest.hexdigest():
+        raise ValueError("archive checksum mismatch")
+    return meta
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# -- resumable uploads ----------------------------------------------------------
+
+
+class UploadOffsetError(ValueError):
+    def __init__(self, expected: int, got: int):
+        super().__init__(f"upload offset mismatch: expected {expected}, got {got}")
+        self.expected = expected
+
+
+class UploadTooLargeError(ValueError):
+    def __init__(self, limit: int):
+        super().__init__(f"upload chunk exceeds {limit} bytes")
+        self.limit = limit
+
+
+def _upload_path(upload_id: str) -> Path:
+    validate_campaign_name(upload_id)
+    return imports_dir() / f"{upload_id}.part"
+
+
+def upload_size(upload_id: str) -> int:
+    path = _upload_path(upload_id)
+    return path.stat().st_size if path.exists() else 0
+
+
+@contextlib.contextmanager
+def open_upload(upload_id: str, offset: int, limit: int | None = None) -> Iterator[Callable[[bytes], None]]:
+    """Yield a ``write(data)`` that appends to a pending upload which has ``offset`` bytes.
+
+    Raises ``UploadOffsetError`` if ``offset`` does not match the bytes already
+    received, so a client can query :func:`upload_size` and resume from there.
+    Writing more than ``limit`` bytes (default ``MAX_UPLOAD_CHUNK``) raises ``UploadTooLargeError`` and drops
+    everything written since ``offset``; bytes received before another error
+    (e.g. a dropped connection) are kept, so the upload can resume after them.
+    """
+    path = _upload_path(upload_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    current = upload_size(upload_id)
+    if offset != current:
+        raise UploadOffsetError(current, offset)
+    limit = MAX_UPLOAD_CHUNK if limit is None else limit
+    written = 0
+    with path.open("ab") as f:
+
+        def write(data: bytes) -> None:
+            nonlocal written
+            written += len(data)
+            if written > limit:
+                raise UploadTooLargeError(limit)
+            f.write(data)
+
+        try:
+            yield write
+        except UploadTooLargeError:
+            f.truncate(offset)
+            raise
+
+
+def append_upload(upload_id: str, offset: int, data: bytes) -> int:
+    """Append ``data`` to a pending upload that currently has ``offset`` bytes (see :func:`open_upload`)."""
+    with open_upload(upload_id, offset) as write:
+        write(data)
+    return offset + len(data)
+
+
+def complete_upload(upload_id: str, sha256: str | None = None, name: str | None = None) -> CampaignMeta:
+    path = _upload_path(upload_id)
+    if not path.exists():
+        raise ValueError(f"no pending upload {upload_id!r}")
+    if sha256 is not None and file_sha256(path) != sha256.lower():
+        path.unlink()
+        raise ValueError("upload checksum mismatch")
+    try:
+        with path.open("rb") as f:
+            meta = import_archive(f, name=name)
+    except ValueError:
+        path.unlink()  # corrupt upload, the client has to start over
+        raise
+    path.unlink()
+    return meta
+
+
+def discard_upload(upload_id: str) -> None:
+    _upload_path(upload_id).unlink(missing_ok=True)
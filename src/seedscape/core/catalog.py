@@ -0,0 +1,139 @@
+"""SQLite index of all campaigns with summary fields.
+
+The catalog is maintained by the storage layer on every campaign/hex write so
+that listing campaigns costs O(page) instead of scanning every campaign
+directory. It is a cache of what is on disk and can always be rebuilt from the
+campaign directories.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from seedscape.core.models import CampaignMeta, CampaignSummary
+
+SORT_COLUMNS = {
+    "name": "name",
+    "created_at": "created_at",
+    "last_activity": "last_activity",
+    "hex_count": "hex_count",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    name TEXT PRIMARY KEY,
+    description TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    last_activity REAL,
+    hex_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS campaigns_created_at ON campaigns (created_at, name);
+CREATE INDEX IF NOT EXISTS campaigns_last_activity ON campaigns (last_activity, name);
+CREATE INDEX IF NOT EXISTS campaigns_hex_count ON campaigns (hex_count, name);
+"""
+
+
+class Catalog:
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._connect().execute("SELECT 1 FROM campaigns LIMIT 1").fetchone() is None
+
+    def upsert_campaign(self, meta: CampaignMeta) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO campaigns (name, description, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET description = excluded.description",
+                (meta.name, meta.description, meta.created_at.isoformat()),
+            )
+
+    def set_campaign(self, meta: CampaignMeta, hex_count: int, last_activity: float | None) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO campaigns (name, description, created_at, last_activity, hex_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (meta.name, meta.description, meta.created_at.isoformat(), last_activity, hex_count),
+            )
+
+    def remove_campaign(self, name: str) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM campaigns WHERE name = ?", (name,))
+
+    def record_hex_write(self, campaign: str, *, created: bool, now: float) -> None:
+        with self._lock:
+            self._connect().execute(
+                "UPDATE campaigns SET hex_count = hex_count + ?, last_activity = ? WHERE name = ?",
+                (1 if created else 0, now, campaign),
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM campaigns").fetchone()[0]
+
+    def page(
+        self, *, offset: int = 0, limit: int = 100, sort: str = "name", descending: bool = False
+    ) -> list[CampaignSummary]:
+        column = SORT_COLUMNS.get(sort)
+        if column is None:
+            raise ValueError(f"sort expected one of {sorted(SORT_COLUMNS)}, but is {sort!r}")
+        direction = "DESC" if descending else "ASC"
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT name, description, created_at, last_activity, hex_count FROM campaigns "
+                    f"ORDER BY {column} {direction}, name {direction} LIMIT ? OFFSET ?",
+                    (limit, offset),
+                )
+                .fetchall()
+            )
+        return [
+            CampaignSummary(
+                name=name,
+                description=description,
+                created_at=datetime.fromisoformat(created_at),
+                last_activity=datetime.fromtimestamp(last_activity, timezone.utc) if last_activity else None,
+                hex_count=hex_count,
+            )
+            for name, description, created_at, last_activity, hex_count in rows
+        ]
+
+
+def scan_hexes(hexes_dir: Path) -> tuple[int, float | None]:
+    """Count stored hexes and find the latest modification time by scanning a directory."""
+    count = 0
+    latest: float | None = None
+    if not hexes_dir.is_dir():
+        return count, latest
+    with os.scandir(hexes_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                count += 1
+                mtime = entry.stat().st_mtime
+                if latest is None or mtime > latest:
+                    latest = mtime
+    return count, latest
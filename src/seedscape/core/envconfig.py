@@ -15,3 +15,68 @@ def _get_dir(varname: str, default_subdir: str) -> Path:
 SEEDSCAPE_DATA_DIR = _get_dir("SEEDSCAPE_DATA_DIR", "data")
 
 SEEDSCAPE_FRONTEND_DIR = _get_dir("SEEDSCAPE_FRONTEND_DIR", "frontend")
+
+
+def _get_float(varname: str, default: float) -> float:
+    from_env = os.getenv(varname)
+    if from_env:
+        return float(from_env)
+    else:
+        return default
+
+
+def _get_positive_float(varname: str, default: float) -> float:
+    value = _get_float(varname, default)
+    if value <= 0:
+        raise ValueError(f"{varname} expected to be greater than 0, but is {value}")
+    return value
+
+
+# Admission control for generation-heavy endpoints (token buckets: tokens/s and burst size)
+SEEDSCAPE_CLIENT_RATE = _get_positive_float("SEEDSCAPE_CLIENT_RATE", 50.0)
+SEEDSCAPE_CLIENT_BURST = _get_positive_float("SEEDSCAPE_CLIENT_BURST", 500.0)
+SEEDSCAPE_CAMPAIGN_RATE = _get_positive_float("SEEDSCAPE_CAMPAIGN_RATE", 200.0)
+SEEDSCAPE_CAMPAIGN_BURST = _get_positive_float("SEEDSCAPE_CAMPAIGN_BURST", 2000.0)
+SEEDSCAPE_MAX_GENERATIONS = int(_get_float("SEEDSCAPE_MAX_GENERATIONS", 8))
+SEEDSCAPE_GENERATION_QUEUE = int(_get_float("SEEDSCAPE_GENERATION_QUEUE", 32))
+SEEDSCAPE_GENERATION_TIMEOUT = _get_float("SEEDSCAPE_GENERATION_TIMEOUT", 2.0)
+
+
+def _get_bool(varname: str, default: bool) -> bool:
+    from_env = os.getenv(varname)
+    if from_env:
+        return from_env.strip().lower() in ("1", "true", "yes", "on")
+    else:
+        return default
+
+
+# Admin endpoints are only available when a token is configured (sent as X-Admin-Token)
+SEEDSCAPE_ADMIN_TOKEN = os.getenv("SEEDSCAPE_ADMIN_TOKEN", "")
+
+# Request profiling: master switch, random sample rate (0..1), number of profiles to keep
+SEEDSCAPE_PROFILING = _get_bool("SEEDSCAPE_PROFILING", False)
+SEEDSCAPE_PROFILE_SAMPLE_RATE = _get_float("SEEDSCAPE_PROFILE_SAMPLE_RATE", 0.0)
+SEEDSCAPE_PROFILE_MAX_FILES = int(_get_float("SEEDSCAPE_PROFILE_MAX_FILES", 100))
+
+# Background schema migration of stored hexes: start with the server, hexes per batch, pause between batches (s)
+SEEDSCAPE_MIGRATE_ON_START = _get_bool("SEEDSCAPE_MIGRATE_ON_START", True)
+SEEDSCAPE_MIGRATION_BATCH = int(_get_float("SEEDSCAPE_MIGRATION_BATCH", 200))
+SEEDSCAPE_MIGRATION_PAUSE = _get_float("SEEDSCAPE_MIGRATION_PAUSE", 0.5)
+
+
+def _get_list(varname: str) -> list[str] | None:
+    from_env = os.getenv(varname)
+    if from_env is None:
+        return None
+    return [item.strip() for item in from_env.split(",") if item.strip()]
+
+
+# Warm-up on start: campaigns to preload (default: the most recently active ones), hot chunks per campaign
+SEEDSCAPE_PRELOAD_CAMPAIGNS = _get_list("SEEDSCAPE_PRELOAD_CAMPAIGNS")
+SEEDSCAPE_PRELOAD_RECENT = int(_get_float("SEEDSCAPE_PRELOAD_RECENT", 20))
+SEEDSCAPE_WARM_CHUNKS = int(_get_float("SEEDSCAPE_WARM_CHUNKS", 4))
+# Deadline (s) for draining background work and pending writes on shutdown
+SEEDSCAPE_SHUTDOWN_TIMEOUT = _get_float("SEEDSCAPE_SHUTDOWN_TIMEOUT", 10.0)
+
+# Append one JSON line per request to this file (for replay with scripts/loadtest.py)
+SEEDSCAPE_REQUEST_LOG = os.getenv("SEEDSCAPE_REQUEST_LOG", "")
@@ -1,9 +1,24 @@
 import hashlib
 import random
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+from seedscape.core import hexgrid, migrations
 from seedscape.core.models import Biome, BiomeType, CampaignMeta, Encounter, EncounterType, Feature, FeatureType, Hex
 from seedscape.core.noise import Noise
+from seedscape.core.placement import FeaturePlacer
+
+# Bump whenever generate_hex produces different output for the same rules, so
+# hexes in the shared generation cache are not reused across the change.
+GENERATOR_VERSION = "2"
+GENERATED_FIELDS = ("biome", "features", "encounter")
+PLACER_CACHE_SIZE = 16
+
+_placers: OrderedDict[str, FeaturePlacer] = OrderedDict()
+_rules_keys: OrderedDict[int, tuple[CampaignMeta, str]] = OrderedDict()
+# Guards both caches; generation runs concurrently in the server's threadpool.
+_cache_lock = threading.Lock()
 
 
 class Generator:
@@ -12,18 +27,77 @@ class Generator:
         self._campaign = campaign
 
 
+def _hex_random(seed: str, hex_id: str) -> random.Random:
+    seed_bytes = f"{seed}:{hex_id}".encode()
+    seed_int = int.from_bytes(hashlib.sha256(seed_bytes).digest()[:8], "big")
+    return random.Random(seed_int)
+
+
+def hex_biome_type(campaign: CampaignMeta, hex_id: str) -> BiomeType:
+    # Must stay the first draw of generate_hex's random stream.
+    return _hex_random(campaign.seed, hex_id).choice(campaign.biome_types)
+
+
+def rules_key(campaign: CampaignMeta) -> str:
+    """Hash of everything generate_hex depends on: seed, type tables and generator version.
+
+    The hex schema version is part of the key too, so a cache entry never has to
+    be rewritten by a migration: newer schemas generate under a new key.
+
+    Campaigns with the same key generate identical hexes. Results are memoized per
+    meta object, which callers treat as read-only (see ``storage.load_campaign_meta``).
+    """
+    with _cache_lock:
+        cached = _rules_keys.get(id(campaign))
+    if cached is not None and cached[0] is campaign:
+        return cached[1]
+    rules = campaign.model_dump_json(include={"seed", "biome_types", "feature_types", "encounter_types"})
+    versions = f"{GENERATOR_VERSION}\0{migrations.CURRENT_HEX_VERSION}"
+    key = hashlib.blake2b(f"{versions}\0{rules}".encode(), digest_size=16).hexdigest()
+    with _cache_lock:
+        _rules_keys[id(campaign)] = (campaign, key)
+        if len(_rules_keys) > PLACER_CACHE_SIZE:
+            _rules_keys.popitem(last=False)
+    return key
+
+
+def feature_placer(campaign: CampaignMeta) -> FeaturePlacer:
+    """The (cached) placer for the campaign's density-based feature types."""
+    key = rules_key(campaign)
+    with _cache_lock:
+        placer = _placers.get(key)
+        if placer is None:
+            placer = FeaturePlacer(campaign, lambda hex_id: hex_biome_type(campaign, hex_id).name)
+            _placers[key] = placer
+            if len(_placers) > PLACER_CACHE_SIZE:
+                _placers.popitem(last=False)
+        else:
+            _placers.move_to_end(key)
+    return placer
+
+
+def _placed_features(campaign: CampaignMeta, hex_id: str) -> list[Feature]:
+    placer = feature_placer(campaign)
+    if not placer.active:
+        return []
+    try:
+        q, r = hexgrid.id_to_axial(hex_id)
+    except ValueError:
+        return []
+    return [Feature(name=name) for name in placer.features_at(q, r)]
+
+
 def generate_hex(
     campaign: CampaignMeta,
     hex_id: str,
     *,
     now: datetime | None = None,
 ) -> Hex:
-    seed = campaign.seed
-    seed_bytes = f"{seed}:{hex_id}".encode()
-    seed_int = int.from_bytes(hashlib.sha256(seed_bytes).digest()[:8], "big")
-    rnd = random.Random(seed_int)
+    rnd = _hex_random(campaign.seed, hex_id)
     tbiome: BiomeType = rnd.choice(campaign.biome_types)
-    tfeature: FeatureType = rnd.choice(campaign.feature_types)
+    # Density-based feature types are placed with spacing constraints; the rest keep one random pick per hex.
+    scattered = [t for t in campaign.feature_types if t.density is None]
+    tfeature: FeatureType | None = rnd.choice(scattered) if scattered else None
     tencounter: EncounterType = rnd.choice(campaign.encounter_types)
 
     biome = Biome(
@@ -33,9 +107,9 @@ def generate_hex(
         humidity=tbiome.min_humidity,
     )
 
-    feature = Feature(
-        name=tfeature.name,
-    )
+    features = _placed_features(campaign, hex_id)
+    if tfeature is not None:
+        features.insert(0, Feature(name=tfeature.name))
 
     encounter = Encounter(
         name=tencounter.name,
@@ -45,7 +119,7 @@ def generate_hex(
         hex = Hex(
             id=hex_id,
             biome=biome,
-            features=[feature],
+            features=features,
             encounter=encounter,
             discovered=True,
             created_at=now,
@@ -54,7 +128,7 @@ def generate_hex(
         hex = Hex(
             id=hex_id,
             biome=biome,
-            features=[feature],
+            features=features,
             encounter=encounter,
             discovered=True,
         )
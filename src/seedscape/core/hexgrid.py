@@ -0,0 +1,38 @@
+import re
+
+from seedscape.core.models import HexId
+from seedscape.core.noise import DIRECTIONS
+
+# Mirrors the frontend id scheme (axialToId in frontend/main.js):
+# column letter = q + ID_OFFSET, row number = r + ID_OFFSET + 1.
+ID_OFFSET = 6
+MAX_COLUMN = ord("Z") - ord("A")
+
+_HEX_ID_RE = re.compile(r"^([A-Z])([1-9][0-9]*)$")
+
+
+def id_to_axial(hex_id: HexId) -> tuple[int, int]:
+    m = _HEX_ID_RE.match(hex_id)
+    if not m:
+        raise ValueError(f"hex id expected as <letter><row>, but is {hex_id!r}")
+    col = ord(m.group(1)) - ord("A")
+    row = int(m.group(2)) - 1
+    return col - ID_OFFSET, row - ID_OFFSET
+
+
+def axial_to_id(q: int, r: int) -> HexId | None:
+    col = q + ID_OFFSET
+    row = r + ID_OFFSET
+    if col < 0 or col > MAX_COLUMN or row < 0:
+        return None
+    return f"{chr(ord('A') + col)}{row + 1}"
+
+
+def distance(a: tuple[int, int], b: tuple[int, int]) -> int:
+    dq = a[0] - b[0]
+    dr = a[1] - b[1]
+    return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+
+
+def neighbors(q: int, r: int) -> list[tuple[int, int]]:
+    return [(q + dq, r + dr) for dq, dr in DIRECTIONS]
@@ -0,0 +1,208 @@
+"""Composable noise layer pipeline.
+
+A campaign's ``layers`` (see :class:`~seedscape.core.models.NoiseLayer`) are
+compiled once into a :class:`Pipeline`. Evaluating it for a batch of hexes
+computes every requested layer (and what it depends on) in a single pass:
+plane coordinates are derived once per hex, and each noise source keeps one
+lattice memo for the whole batch, so neighbouring hexes and all octaves share
+their lattice hashes.
+
+Built-in layers are ``altitude``, ``humidity`` and ``temperature``; campaign
+layers of the same name replace them.
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+
+from seedscape.core import _math
+from seedscape.core.models import LayerWarp, NoiseLayer
+from seedscape.core.noise import Noise, NoiseConfig, NoiseType
+
+Values = dict[str, float]
+Expr = Callable[[Values], float]
+
+BUILTIN_LAYERS = {t.name: t.value for t in NoiseType}
+
+_BINOPS: dict[type[ast.operator], Callable[[float, float], float]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARYOPS: dict[type[ast.unaryop], Callable[[float], float]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _clamp(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
+    return max(lo, min(hi, x))
+
+
+_FUNCTIONS: dict[str, Callable[..., float]] = {
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "clamp": _clamp,
+    "lerp": _math.lerp,
+}
+
+
+def compile_expr(source: str) -> tuple[Expr, set[str]]:
+    """Compile an arithmetic layer expression into a function of layer values.
+
+    Only numbers, layer names, ``+ - * / **`` and the functions ``min``, ``max``,
+    ``abs``, ``clamp`` and ``lerp`` are allowed. Returns the function and the
+    names of the layers it reads.
+    """
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"invalid layer expression {source!r}: {e.msg}") from e
+    refs: set[str] = set()
+
+    def build(node: ast.AST) -> Expr:
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            const = float(node.value)
+            return lambda values: const
+        if isinstance(node, ast.Name):
+            name = node.id
+            refs.add(name)
+            return lambda values: values[name]
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            binop = _BINOPS[type(node.op)]
+            left, right = build(node.left), build(node.right)
+            return lambda values: binop(left(values), right(values))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARYOPS:
+            unop = _UNARYOPS[type(node.op)]
+            operand = build(node.operand)
+            return lambda values: unop(operand(values))
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in _FUNCTIONS
+            and not node.keywords
+        ):
+            func = _FUNCTIONS[node.func.id]
+            args = [build(a) for a in node.args]
+            return lambda values: func(*(a(values) for a in args))
+        raise ValueError(f"unsupported element {ast.dump(node)} in layer expression {source!r}")
+
+    return build(tree.body), refs
+
+
+@dataclass(frozen=True)
+class _NoiseStep:
+    name: str
+    config: NoiseConfig
+    warp: LayerWarp | None
+
+
+@dataclass(frozen=True)
+class _ExprStep:
+    name: str
+    expr: Expr
+
+
+class Pipeline:
+    def __init__(self, layers: Sequence[NoiseLayer] = ()):
+        steps: dict[str, _NoiseStep | _ExprStep] = {
+            name: _NoiseStep(name, config, None) for name, config in BUILTIN_LAYERS.items()
+        }
+        deps: dict[str, set[str]] = {name: set() for name in steps}
+        for layer in layers:
+            if layer.expr is not None:
+                expr, refs = compile_expr(layer.expr)
+                steps[layer.name] = _ExprStep(layer.name, expr)
+                deps[layer.name] = refs
+            else:
+                config = NoiseConfig(
+                    layer.salt or layer.name,
+                    freq_base=layer.freq_base,
+                    octaves=layer.octaves,
+                    lacunarity=layer.lacunarity,
+                    gain=layer.gain,
+                )
+                steps[layer.name] = _NoiseStep(layer.name, config, layer.warp)
+                deps[layer.name] = {layer.warp.x, layer.warp.y} if layer.warp else set()
+        self._steps = steps
+        self._deps = deps
+        self._order = self._topological_order()
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._order)
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if state.get(name) == 2:
+                return
+            if name not in self._steps:
+                raise ValueError(f"layer {path[-1]!r} references unknown layer {name!r}")
+            if state.get(name) == 1:
+                raise ValueError(f"layer cycle: {' -> '.join((*path, name))}")
+            state[name] = 1
+            for dep in sorted(self._deps[name]):
+                visit(dep, (*path, name))
+            state[name] = 2
+            order.append(name)
+
+        for name in self._steps:
+            visit(name, (name,))
+        return order
+
+    def _plan(self, names: Iterable[str]) -> list[str]:
+        needed: set[str] = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in self._steps:
+                raise ValueError(f"unknown layer {name!r}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self._deps[name])
+        return [name for name in self._order if name in needed]
+
+    def evaluate(
+        self,
+        noise: Noise,
+        coords: Sequence[tuple[int, int]],
+        names: Iterable[str] | None = None,
+    ) -> dict[str, list[float]]:
+        """Evaluate layers ``names`` (default: all) for every axial ``(q, r)`` in ``coords``.
+
+        Returns one list of values per requested layer, aligned with ``coords``.
+        """
+        requested = list(names) if names is not None else self.names
+        plan = self._plan(requested)
+        memos: dict[NoiseConfig, dict[tuple[int, int], float]] = {}
+        planes = [_math.axial_to_plane(q, r) for q, r in coords]
+        columns: dict[str, list[float]] = {}
+
+        for name in plan:
+            step = self._steps[name]
+            if isinstance(step, _ExprStep):
+                rows = [{dep: columns[dep][k] for dep in self._deps[name]} for k in range(len(coords))]
+                try:
+                    columns[name] = [step.expr(row) for row in rows]
+                except ArithmeticError as e:
+                    raise ValueError(f"layer {name!r} failed to evaluate: {e}") from e
+                continue
+            memo = memos.setdefault(step.config, {})
+            if step.warp is None:
+                columns[name] = [noise.fbm(step.config, x, y, memo) for x, y in planes]
+            else:
+                wx, wy, strength = columns[step.warp.x], columns[step.warp.y], step.warp.strength
+                columns[name] = [
+                    noise.fbm(step.config, x + strength * (wx[k] - 0.5), y + strength * (wy[k] - 0.5), memo)
+                    for k, (x, y) in enumerate(planes)
+                ]
+        return {name: columns[name] for name in requested}
@@ -0,0 +1,195 @@
+"""Server lifecycle: warm-up before serving, draining before exit.
+
+On start the :class:`Lifecycle` warms up in a background thread: it parses the
+metas of the preloaded campaigns, builds their feature placement for the
+chunks around their most recently written hexes, and runs the noise and
+generation code once, so the first requests do not pay for it. Only then does
+it report ready (and start the background migrator, if enabled and any
+migrations are registered).
+
+On SIGTERM it stops reporting ready at once, so load balancers stop routing
+to it while in-flight requests finish. At shutdown it stops the migrator,
+waits for pending storage writes and closes the catalog, all within
+``SEEDSCAPE_SHUTDOWN_TIMEOUT``.
+"""
+
+from __future__ import annotations
+
+import logging
+import signal
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from types import FrameType
+from typing import Any
+
+from seedscape.core import envconfig, generator, hexgrid, layers, migrations, migrator, placement, storage
+from seedscape.core.noise import Noise
+
+log = logging.getLogger(__name__)
+
+STARTING = "starting"
+READY = "ready"
+DRAINING = "draining"
+STOPPED = "stopped"
+
+
+@dataclass
+class WarmupReport:
+    campaigns: list[str] = field(default_factory=list)
+    chunks: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+def preload_campaigns() -> list[str]:
+    if envconfig.SEEDSCAPE_PRELOAD_CAMPAIGNS is not None:
+        return [name for name in envconfig.SEEDSCAPE_PRELOAD_CAMPAIGNS if storage.campaign_exists(name)]
+    _, recent = storage.list_campaign_summaries(
+        limit=envconfig.SEEDSCAPE_PRELOAD_RECENT, sort="last_activity", descending=True
+    )
+    return [summary.name for summary in recent]
+
+
+def warm_campaign(name: str, max_chunks: int) -> int:
+    """Preload one campaign; returns the number of placement chunks built."""
+    meta = storage.load_campaign_meta(name)
+    generator.rules_key(meta)
+    coords = []
+    for hex_id in storage.recent_hex_ids(name, max_chunks * 8):
+        try:
+            coords.append(hexgrid.id_to_axial(hex_id))
+        except ValueError:
+            continue
+    if not coords:
+        coords = [(0, 0)]
+    chunks = list(dict.fromkeys(placement.chunk_of(q, r) for q, r in coords))[:max_chunks]
+    placer = generator.feature_placer(meta)
+    if placer.active:
+        for chunk in chunks:
+            placer.chunk(*chunk)
+    layers.Pipeline(meta.layers).evaluate(Noise(meta), coords)
+    q, r = coords[0]
+    generator.generate_hex(meta, hexgrid.axial_to_id(q, r) or "G7")
+    return len(chunks) if placer.active else 0
+
+
+class Lifecycle:
+    def __init__(self) -> None:
+        self.state = STARTING
+        self.report: WarmupReport | None = None
+        self._thread: threading.Thread | None = None
+        # State moves between the warm-up thread, the signal handler and shutdown. Reentrant,
+        # as the SIGTERM handler may interrupt the main thread while it holds the lock.
+        self._state_lock = threading.RLock()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def start(self, *, migrate: bool = False) -> None:
+        """Warm up in the background, then become ready (and start migrating if ``migrate``)."""
+        with self._state_lock:
+            self.state = STARTING
+        self._thread = threading.Thread(target=self._start, args=(migrate,), name="seedscape-warmup", daemon=True)
+        self._thread.start()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    def _start(self, migrate: bool) -> None:
+        self.report = self.warm_up()
+        if not self._transition(STARTING, READY):
+            return  # shutdown began during warm-up
+        log.info(
+            "Ready after warm-up of %d campaigns (%d chunks) in %.2fs",
+            len(self.report.campaigns),
+            self.report.chunks,
+            self.report.seconds,
+        )
+        if migrate and migrations.has_migrations():
+            migrator.runner.start()
+
+    def warm_up(self) -> WarmupReport:
+        report = WarmupReport()
+        started = time.perf_counter()
+        storage.CAMPAIGNS_DIR.mkdir(parents=True, exist_ok=True)
+        storage.GENERATED_DIR.mkdir(parents=True, exist_ok=True)
+        for name in preload_campaigns():
+            if self.state != STARTING:
+                break
+            try:
+                report.chunks += warm_campaign(name, envconfig.SEEDSCAPE_WARM_CHUNKS)
+                report.campaigns.append(name)
+            except (OSError, ValueError, RuntimeError) as e:
+                # A broken campaign must not keep the server from becoming ready.
+                log.warning("Warm-up of campaign '%s' failed: %s", name, e)
+                report.errors[name] = str(e)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _transition(self, expected: str, new: str) -> bool:
+        """Set the state to ``new`` if it is ``expected``; return whether it was."""
+        with self._state_lock:
+            if self.state != expected:
+                return False
+            self.state = new
+            return True
+
+    def begin_drain(self) -> None:
+        with self._state_lock:
+            if self.state != STOPPED:
+                self.state = DRAINING
+
+    def shutdown(self, timeout: float | None = None) -> bool:
+        """Stop background work, wait for pending writes and close storage.
+
+        Returns False if the deadline passed before everything was drained.
+        """
+        self.begin_drain()
+        deadline = time.monotonic() + (envconfig.SEEDSCAPE_SHUTDOWN_TIMEOUT if timeout is None else timeout)
+        migrator.runner.stop(timeout=max(0.0, deadline - time.monotonic()))
+        if self._thread is not None:
+            self._thread.join(max(0.0, deadline - time.monotonic()))
+        drained = storage.drain_writes(max(0.0, deadline - time.monotonic()))
+        if drained:
+            storage.close()
+        else:
+            log.warning("Shutdown deadline passed with %d writes pending", storage.pending_writes())
+        with self._state_lock:
+            self.state = STOPPED
+        return drained and not migrator.runner.running
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "status": self.state,
+            "pending_writes": storage.pending_writes(),
+            "warmup": asdict(self.report) if self.report is not None else None,
+        }
+
+
+def on_sigterm(callback: Callable[[], None]) -> Callable[[], None]:
+    """Call ``callback`` on SIGTERM before the previously installed handler runs.
+
+    Returns a function that restores the previous handler. Does nothing outside
+    the main thread or if the current handler is not a Python callable.
+    """
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous) or threading.current_thread() is not threading.main_thread():
+        return lambda: None
+
+    def handler(signum: int, frame: FrameType | None) -> None:
+        callback()
+        previous(signum, frame)
+
+    def restore() -> None:
+        signal.signal(signal.SIGTERM, previous)
+
+    signal.signal(signal.SIGTERM, handler)
+    return restore
+
+
+manager = Lifecycle()
@@ -0,0 +1,91 @@
+"""Schema migrations for stored hexes and campaign metas.
+
+Stored JSON carries the model's ``version`` field. An upgrade step is a function
+that takes the raw dict of one version and returns the dict of the next one;
+steps are registered with :func:`hex_migration` / :func:`meta_migration`::
+
+    @hex_migration("0.1", "0.2")
+    def _add_tags(data):
+        data["tags"] = []
+        return data
+
+When the model's default ``version`` is bumped, every older file is upgraded step
+by step on read (see ``storage.load_hex``) or ahead of time by the background
+migrator (``seedscape.core.migrator``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from seedscape.core.models import CampaignMeta, Hex
+
+Upgrade = Callable[[dict[str, Any]], dict[str, Any]]
+
+# Files written before the version field existed are treated as this version.
+INITIAL_VERSION = "0.1"
+CURRENT_HEX_VERSION: str = Hex.model_fields["version"].default
+CURRENT_META_VERSION: str = CampaignMeta.model_fields["version"].default
+
+
+@dataclass(frozen=True)
+class Migration:
+    from_version: str
+    to_version: str
+    upgrade: Upgrade
+
+
+HEX_MIGRATIONS: dict[str, Migration] = {}
+META_MIGRATIONS: dict[str, Migration] = {}
+
+
+def _register(registry: dict[str, Migration], from_version: str, to_version: str) -> Callable[[Upgrade], Upgrade]:
+    def decorator(upgrade: Upgrade) -> Upgrade:
+        if from_version in registry:
+            raise ValueError(f"duplicate migration from version {from_version}")
+        registry[from_version] = Migration(from_version, to_version, upgrade)
+        return upgrade
+
+    return decorator
+
+
+def hex_migration(from_version: str, to_version: str) -> Callable[[Upgrade], Upgrade]:
+    return _register(HEX_MIGRATIONS, from_version, to_version)
+
+
+def meta_migration(from_version: str, to_version: str) -> Callable[[Upgrade], Upgrade]:
+    return _register(META_MIGRATIONS, from_version, to_version)
+
+
+def _upgrade(data: dict[str, Any], registry: dict[str, Migration], current: str, kind: str) -> bool:
+    version = data.get("version", INITIAL_VERSION)
+    if version == current:
+        return False
+    seen = set()
+    while version != current:
+        migration = registry.get(version)
+        if migration is None or version in seen:
+            raise ValueError(f"no {kind} migration path from version {version} to {current}")
+        seen.add(version)
+        upgraded = migration.upgrade(dict(data))
+        data.clear()
+        data.update(upgraded)
+        version = data["version"] = migration.to_version
+    return True
+
+
+def has_migrations() -> bool:
+    """Whether any upgrade step is registered, i.e. stored files can be out of date."""
+    return bool(HEX_MIGRATIONS or META_MIGRATIONS)
+
+
+def upgrade_hex(data: dict[str, Any]) -> bool:
+    """Upgrade raw hex data in place to the current version; return whether anything changed."""
+    return _upgrade(data, HEX_MIGRATIONS, CURRENT_HEX_VERSION, "hex")
+
+
+def upgrade_meta(data: dict[str, Any]) -> bool:
+    """Upgrade raw campaign meta data in place to the current version; return whether anything changed."""
+    return _upgrade(data, META_MIGRATIONS, CURRENT_META_VERSION, "campaign meta")
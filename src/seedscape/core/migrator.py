@@ -0,0 +1,191 @@
+"""Background migration of stored hexes to the current schema version.
+
+Reads already upgrade old hexes and overlays lazily (see ``storage.parse_hex_json``
+and ``storage.load_overlay_hex``); the :class:`Migrator` rewrites the rest ahead of
+time so old files do not linger. Entries of the shared generation cache are never
+rewritten: their rules key includes the schema version they were written with.
+It works in batches of ``batch_size`` hexes and sleeps ``pause`` seconds
+between batches to keep the disk available for requests.
+
+Progress is kept in ``<campaign>/migration.json``. After a restart the
+migrator resumes by rescanning the campaign: files that are already current
+are recognised from the last bytes of the file and skipped, and a campaign
+recorded as done for the current version is not scanned at all.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from seedscape.core import envconfig, storage
+
+log = logging.getLogger(__name__)
+
+PROGRESS_FILE = "migration.json"
+
+
+@dataclass
+class MigrationProgress:
+    campaign: str
+    hex_version: str
+    total: int = 0
+    scanned: int = 0
+    migrated: int = 0
+    failed: int = 0
+    done: bool = False
+    updated_at: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _progress_path(campaign: str) -> Path:
+    return storage.CAMPAIGNS_DIR / campaign / PROGRESS_FILE
+
+
+def load_progress(campaign: str) -> MigrationProgress | None:
+    path = _progress_path(campaign)
+    if not path.exists():
+        return None
+    try:
+        return MigrationProgress(**json.loads(path.read_text(encoding="utf-8")))
+    except (ValueError, TypeError):
+        log.warning("Ignoring unreadable migration progress for campaign '%s'", campaign)
+        return None
+
+
+def _save_progress(progress: MigrationProgress) -> None:
+    progress.updated_at = time.time()
+    path = _progress_path(progress.campaign)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(progress.to_dict()), encoding="utf-8")
+    tmp.replace(path)
+
+
+class Migrator:
+    def __init__(
+        self,
+        campaign: str,
+        *,
+        batch_size: int | None = None,
+        pause: float | None = None,
+        stop: threading.Event | None = None,
+    ):
+        self.campaign = campaign
+        self.batch_size = batch_size or envconfig.SEEDSCAPE_MIGRATION_BATCH
+        self.pause = envconfig.SEEDSCAPE_MIGRATION_PAUSE if pause is None else pause
+        self._stop = stop or threading.Event()
+        previous = load_progress(campaign)
+        if previous is not None and previous.hex_version == storage.HEX_VERSION:
+            self.progress = previous
+        else:
+            self.progress = MigrationProgress(campaign, storage.HEX_VERSION)
+
+    def _stored(self) -> Iterator[tuple[str, bool]]:
+        """Full hex files, then overlays; shared generated entries never need rewriting."""
+        for hex_id in storage.iter_hex_ids(self.campaign):
+            yield hex_id, False
+        for hex_id in storage.iter_overlay_ids(self.campaign):
+            yield hex_id, True
+
+    def run(self) -> MigrationProgress:
+        """Migrate the campaign's old hexes; returns early (not done) when stopped."""
+        progress = self.progress
+        if progress.done:
+            return progress
+        storage.load_campaign_meta(self.campaign)  # upgrades meta.json as a side effect
+        progress.total = sum(1 for _ in self._stored())
+        progress.scanned = 0
+        in_batch = 0
+        for hex_id, overlay in self._stored():
+            if self._stop.is_set():
+                _save_progress(progress)
+                return progress
+            progress.scanned += 1
+            try:
+                if not storage.hex_needs_migration(self.campaign, hex_id, overlay=overlay):
+                    continue
+                if overlay:
+                    storage.load_overlay_hex(self.campaign, hex_id)
+                else:
+                    storage.load_hex(self.campaign, hex_id)
+                progress.migrated += 1
+            except (OSError, ValueError, RuntimeError) as e:
+                progress.failed += 1
+                log.warning("Failed to migrate hex %s of campaign '%s': %s", hex_id, self.campaign, e)
+            in_batch += 1
+            if in_batch >= self.batch_size:
+                in_batch = 0
+                _save_progress(progress)
+                self._stop.wait(self.pause)
+        progress.done = progress.failed == 0
+        _save_progress(progress)
+        return progress
+
+
+class MigrationRunner:
+    """Runs :class:`Migrator` over campaigns on one background thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._current: Migrator | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, campaigns: Iterable[str] | None = None) -> bool:
+        """Start migrating ``campaigns`` (default: all); False if already running."""
+        with self._lock:
+            if self.running:
+                return False
+            self._stop.clear()
+            names = list(campaigns) if campaigns is not None else storage.list_campaigns()
+            self._thread = threading.Thread(target=self._run, args=(names,), name="seedscape-migrator", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self, campaigns: list[str]) -> None:
+        for name in campaigns:
+            if self._stop.is_set():
+                return
+            try:
+                self._current = Migrator(name, stop=self._stop)
+                progress = self._current.run()
+            except (OSError, ValueError) as e:
+                log.warning("Migration of campaign '%s' failed: %s", name, e)
+                continue
+            finally:
+                self._current = None
+            if progress.migrated or progress.failed:
+                log.info(
+                    "Migrated campaign '%s': %d hexes rewritten, %d failed", name, progress.migrated, progress.failed
+                )
+
+    def status(self) -> dict[str, Any]:
+        current = self._current
+        campaigns = {}
+        for name in storage.list_campaigns():
+            if current is not None and current.campaign == name:
+                campaigns[name] = current.progress.to_dict()
+            elif (progress := load_progress(name)) is not None:
+                campaigns[name] = progress.to_dict()
+        return {"running": self.running, "hex_version": storage.HEX_VERSION, "campaigns": campaigns}
+
+
+runner = MigrationRunner()
@@ -17,6 +17,7 @@ class BiomeType(BaseModel):
     max_temperature: float
     min_humidity: float
     max_humidity: float
+    travel_cost: float = Field(default=1.0, gt=0)
 
 
 class Biome(BaseModel):
@@ -30,7 +31,26 @@ FeatureName = str
 
 
 class FeatureType(BaseModel):
+    """A kind of feature.
+
+    Without ``density`` one feature type is picked per hex at random. With it, the
+    type is placed by :mod:`seedscape.core.placement`: each hex is a candidate with
+    probability ``density`` (scaled by ``biome_affinity`` of the hex's biome; biomes
+    missing from a non-empty affinity map get 0), and two features of the type are
+    at least ``min_spacing`` hexes apart.
+    """
+
     name: FeatureName
+    density: float | None = Field(default=None, gt=0, le=1)
+    min_spacing: int = Field(default=1, ge=1, le=16)
+    biome_affinity: dict[BiomeName, float] = Field(default_factory=dict)
+
+    @field_validator("biome_affinity")
+    @classmethod
+    def validate_affinity(cls, v: dict[BiomeName, float]) -> dict[BiomeName, float]:
+        if any(weight < 0 for weight in v.values()):
+            raise ValueError("biome affinity weights must not be negative")
+        return v
 
 
 class Feature(BaseModel):
@@ -66,6 +86,52 @@ class Hex(BaseModel):
         return v
 
 
+class HexOverlay(BaseModel):
+    """The campaign-specific part of a hex whose generated fields live in the shared generation cache.
+
+    ``base`` is the rules key (``generator.rules_key``) the hex was generated with.
+    """
+
+    id: HexId
+    base: str
+    discovered: bool = False
+    notes: str | None = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    version: str = "0.1"
+
+
+class TravelPath(BaseModel):
+    start: HexId
+    goal: HexId
+    path: list[HexId]
+    cost: float
+    expanded: int
+
+
+class LayerWarp(BaseModel):
+    x: str
+    y: str
+    strength: float = 4.0
+
+
+class NoiseLayer(BaseModel):
+    """A named scalar field over the hex map.
+
+    Either a noise source (the default, configured by the fbm parameters and an
+    optional domain warp by two other layers) or, if ``expr`` is set, an
+    arithmetic expression over other layers such as ``"0.6 * humidity + 0.4 * (1 - altitude)"``.
+    """
+
+    name: str
+    freq_base: float = 0.05
+    octaves: int = 4
+    lacunarity: float = 2.0
+    gain: float = 0.5
+    salt: str | None = None
+    warp: LayerWarp | None = None
+    expr: str | None = None
+
+
 class CampaignMeta(BaseModel):
     name: str
     seed: str
@@ -77,6 +143,15 @@ class CampaignMeta(BaseModel):
     feature_types: list[FeatureType] = Field(..., min_length=1)
     encounter_types: list[EncounterType] = Field(..., min_length=1)
     base_temperature: float
+    layers: list[NoiseLayer] = Field(default_factory=list)
+
+
+class CampaignSummary(BaseModel):
+    name: str
+    description: str = ""
+    created_at: datetime
+    last_activity: datetime | None = None
+    hex_count: int = 0
 
 
 class UserAccount(BaseModel):
@@ -1,6 +1,7 @@
 import hashlib
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from seedscape.core import _math
@@ -9,14 +10,17 @@ if TYPE_CHECKING:  # avoid importing heavy pydantic models at runtime
     from seedscape.core.models import CampaignMeta
 
 
+@lru_cache(maxsize=256)
 def _get_blake2b_key(seed: str) -> bytes:
     return hashlib.blake2b(seed.encode("utf-8"), digest_size=hashlib.blake2b.MAX_KEY_SIZE).digest()
 
 
+@lru_cache(maxsize=256)
 def _get_blake2b_salt(kind: str) -> bytes:
     return hashlib.blake2b(kind.encode("utf-8"), digest_size=hashlib.blake2b.SALT_SIZE).digest()
 
 
+@lru_cache(maxsize=256)
 def _get_blake2b_person(person: str) -> bytes:
     return hashlib.blake2b(person.encode("utf-8"), digest_size=hashlib.blake2b.PERSON_SIZE).digest()
 
@@ -44,6 +48,7 @@ class NoiseConfig:
 class NoiseType(Enum):
     altitude = NoiseConfig("altitude", freq_base=0.05, octaves=4, lacunarity=2.0, gain=0.5)
     humidity = NoiseConfig("humidity", freq_base=0.05, octaves=4, lacunarity=2.0, gain=0.5)
+    temperature = NoiseConfig("temperature", freq_base=0.03, octaves=3, lacunarity=2.0, gain=0.5)
 
 
 PERSON = _get_blake2b_person("SeedScape")
@@ -51,13 +56,30 @@ DIRECTIONS = [(+1, 0), (+1, -1), (0, -1), (-1, 0), (-1, +1), (0, +1)]
 HEX_DIAMETER = 5000
 
 
+@lru_cache(maxsize=256)
+def _get_blake2b_prototype(key: bytes, salt: bytes) -> "hashlib.blake2b":
+    # Keyed blake2b hashes a full key block on construction. The state after that is
+    # identical for every lattice lookup of a (key, salt) pair, so build it once and
+    # hand out copies. The prototype itself is never updated.
+    return hashlib.blake2b(key=key, salt=salt, person=PERSON, digest_size=8)
+
+
 class Noise:
     def __init__(self, campaign: "CampaignMeta"):
         self._key = _get_blake2b_key(campaign.seed)
         self._campaign = campaign
+        # Keyed by salt, the only part of a NoiseConfig the hash depends on: bytes cache
+        # their hash, while hashing the frozen dataclass hashes all of its fields per call.
+        self._prototypes: dict[bytes, hashlib.blake2b] = {}
+
+    def _hasher(self, nconfig: NoiseConfig) -> "hashlib.blake2b":
+        proto = self._prototypes.get(nconfig.salt)
+        if proto is None:
+            proto = self._prototypes[nconfig.salt] = _get_blake2b_prototype(self._key, nconfig.salt)
+        return proto.copy()
 
     def _shuffle(self, nconfig: NoiseConfig, *values: int) -> int:
-        h = hashlib.blake2b(key=self._key, salt=nconfig.salt, person=PERSON, digest_size=8)
+        h = self._hasher(nconfig)
         for v in values:
             h.update(v.to_bytes(8, "big", signed=True))
         return int.from_bytes(h.digest(), "big", signed=False)
@@ -66,16 +88,26 @@ class Noise:
         shuffled = self._shuffle(nconfig, q, r)
         return shuffled / 2**64
 
-    def _value_noise(self, nconfig: NoiseConfig, u: float, v: float):
+    def _lattice(self, nconfig: NoiseConfig, i: int, j: int, memo: dict[tuple[int, int], float] | None) -> float:
+        if memo is None:
+            return self._hash01(nconfig, i, j)
+        value = memo.get((i, j))
+        if value is None:
+            value = memo[(i, j)] = self._hash01(nconfig, i, j)
+        return value
+
+    def _value_noise(
+        self, nconfig: NoiseConfig, u: float, v: float, memo: dict[tuple[int, int], float] | None = None
+    ) -> float:
         i = _math.floor(u)
         j = _math.floor(v)
         du = u - i
         dv = v - j
 
-        v00 = self._hash01(nconfig, i, j)
-        v10 = self._hash01(nconfig, i + 1, j)
-        v01 = self._hash01(nconfig, i, j + 1)
-        v11 = self._hash01(nconfig, i + 1, j + 1)
+        v00 = self._lattice(nconfig, i, j, memo)
+        v10 = self._lattice(nconfig, i + 1, j, memo)
+        v01 = self._lattice(nconfig, i, j + 1, memo)
+        v11 = self._lattice(nconfig, i + 1, j + 1, memo)
 
         sx = _math.fade(du)
         sy = _math.fade(dv)
@@ -83,14 +115,22 @@ class Noise:
         b = _math.lerp(v01, v11, sx)
         return _math.lerp(a, b, sy)
 
-    def hex_noise(self, nconfig: NoiseConfig, q: int, r: int):
-        x, y = _math.axial_to_plane(q, r)
+    def fbm(self, nconfig: NoiseConfig, x: float, y: float, memo: dict[tuple[int, int], float] | None = None) -> float:
+        """Fractal value noise at plane coordinates ``(x, y)``, ~0..1.
+
+        ``memo`` caches lattice hashes for ``nconfig``; pass the same dict while
+        sampling many nearby points to hash each lattice corner only once.
+        """
         amp, total, freq = 1.0, 0.0, nconfig.freq_base
         amp_sum = 0.0
         for _ in range(nconfig.octaves):
-            total += amp * self._value_noise(nconfig, x * freq, y * freq)
+            total += amp * self._value_noise(nconfig, x * freq, y * freq, memo)
             amp_sum += amp
             amp *= nconfig.gain
             freq *= nconfig.lacunarity
         n = total / amp_sum  # ~0..1
         return n
+
+    def hex_noise(self, nconfig: NoiseConfig, q: int, r: int):
+        x, y = _math.axial_to_plane(q, r)
+        return self.fbm(nconfig, x, y)
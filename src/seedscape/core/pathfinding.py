@@ -0,0 +1,141 @@
+import heapq
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+from seedscape.core import generator, hexgrid
+from seedscape.core.models import CampaignMeta, Hex, HexId, TravelPath
+
+DEFAULT_MAX_EXPANSIONS = 5000
+DEFAULT_MAX_DISTANCE = 64
+DEFAULT_COST_CACHE_SIZE = 65536
+
+HexSource = Callable[[HexId], Hex]
+
+
+class Pathfinder:
+    """A* search over the hex grid of one campaign.
+
+    Entering a hex costs the ``travel_cost`` of its biome type. Hexes are pulled
+    lazily from ``hex_source`` (stored hexes, falling back to generation) and
+    their costs are kept in a bounded LRU cache, so repeated queries over the
+    same region do not touch storage or the generator again. :meth:`invalidate`
+    drops the cost of a hex whose stored biome changed.
+    """
+
+    def __init__(
+        self,
+        campaign: CampaignMeta,
+        hex_source: HexSource | None = None,
+        *,
+        cache_size: int = DEFAULT_COST_CACHE_SIZE,
+    ):
+        if cache_size < 1:
+            raise ValueError(f"cache_size expected to be 1 or greater, but is {cache_size}")
+        self._campaign = campaign
+        self._hex_source = hex_source or (lambda hex_id: generator.generate_hex(campaign, hex_id))
+        self._biome_costs = {bt.name: bt.travel_cost for bt in campaign.biome_types}
+        # Cheapest step anywhere in the campaign keeps the heuristic admissible.
+        self._min_cost = min(self._biome_costs.values())
+        self._cache_size = cache_size
+        self._costs: OrderedDict[HexId, float] = OrderedDict()
+        # Bumped by invalidate(), so a lookup that raced with it does not cache its stale cost.
+        self._version = 0
+        # Requests share one pathfinder per campaign from the threadpool.
+        self._lock = threading.Lock()
+
+    @property
+    def campaign(self) -> CampaignMeta:
+        return self._campaign
+
+    def cost(self, hex_id: HexId) -> float:
+        with self._lock:
+            cached = self._costs.get(hex_id)
+            if cached is not None:
+                self._costs.move_to_end(hex_id)
+                return cached
+            version = self._version
+        hex_model = self._hex_source(hex_id)
+        value = self._biome_costs.get(hex_model.biome.name, 1.0)
+        with self._lock:
+            if self._version == version:
+                self._costs[hex_id] = value
+                if len(self._costs) > self._cache_size:
+                    self._costs.popitem(last=False)
+        return value
+
+    def invalidate(self, hex_id: HexId) -> None:
+        """Forget the cached cost of a hex whose stored biome changed."""
+        with self._lock:
+            self._costs.pop(hex_id, None)
+            self._version += 1
+
+    def find_path(
+        self,
+        start: HexId,
+        goal: HexId,
+        *,
+        max_expansions: int = DEFAULT_MAX_EXPANSIONS,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+    ) -> TravelPath | None:
+        """Return the cheapest path from ``start`` to ``goal``.
+
+        Raises ``ValueError`` for malformed ids or if the goal lies further than
+        ``max_distance`` steps away. Returns ``None`` if no path was found within
+        ``max_expansions`` expanded hexes.
+        """
+        start_qr = hexgrid.id_to_axial(start)
+        goal_qr = hexgrid.id_to_axial(goal)
+        if hexgrid.distance(start_qr, goal_qr) > max_distance:
+            raise ValueError(f"goal {goal} is more than {max_distance} hexes away from {start}")
+
+        came_from: dict[tuple[int, int], tuple[int, int]] = {}
+        ids: dict[tuple[int, int], HexId] = {start_qr: start}
+        best: dict[tuple[int, int], float] = {start_qr: 0.0}
+        # (f, tie-breaker, g, node); the counter keeps ordering deterministic.
+        frontier: list[tuple[float, int, float, tuple[int, int]]] = [(0.0, 0, 0.0, start_qr)]
+        counter = 1
+        expanded = 0
+
+        while frontier:
+            _, _, g, node = heapq.heappop(frontier)
+            if g > best.get(node, float("inf")):
+                continue  # stale entry
+            if node == goal_qr:
+                return TravelPath(
+                    start=start,
+                    goal=goal,
+                    path=self._reconstruct(came_from, ids, node),
+                    cost=g,
+                    expanded=expanded,
+                )
+            expanded += 1
+            if expanded > max_expansions:
+                return None
+
+            for nb in hexgrid.neighbors(*node):
+                nb_id = hexgrid.axial_to_id(*nb)
+                if nb_id is None or hexgrid.distance(nb, start_qr) > max_distance:
+                    continue
+                ng = g + self.cost(nb_id)
+                if ng < best.get(nb, float("inf")):
+                    best[nb] = ng
+                    came_from[nb] = node
+                    ids[nb] = nb_id
+                    f = ng + hexgrid.distance(nb, goal_qr) * self._min_cost
+                    heapq.heappush(frontier, (f, counter, ng, nb))
+                    counter += 1
+        return None
+
+    @staticmethod
+    def _reconstruct(
+        came_from: dict[tuple[int, int], tuple[int, int]],
+        ids: dict[tuple[int, int], HexId],
+        node: tuple[int, int],
+    ) -> list[HexId]:
+        path = [ids[node]]
+        while node in came_from:
+            node = came_from[node]
+            path.append(ids[node])
+        path.reverse()
+        return path
@@ -0,0 +1,147 @@
+"""Deterministic feature placement with minimum spacing.
+
+Feature types with a ``density`` are scattered as a hard-core point process
+(Matérn type II, a cheap relative of Poisson-disc sampling): every hex is a
+candidate with a probability from the type's density and biome affinity, and
+gets a random priority; a candidate is kept only if it has the highest priority
+among all candidates closer than ``min_spacing``. Both values are hashed from
+the campaign seed, the type and the hex coordinates, so whether a hex holds a
+feature depends only on its ``min_spacing - 1`` neighbourhood. Any chunk can
+therefore be computed on its own, in any order or process, and agrees with its
+neighbours along the boundary.
+
+The kept points are thinner than the candidate density (the more so the larger
+the spacing), and evenly spread without clumps, i.e. blue noise.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+
+from seedscape.core import hexgrid
+from seedscape.core.models import BiomeName, CampaignMeta, FeatureName, FeatureType, HexId
+
+CHUNK_SIZE = 16
+CHUNK_CACHE_SIZE = 64
+
+Chunk = dict[tuple[int, int], list[FeatureName]]
+
+_UNIT = float(1 << 64)
+
+
+def _ring_offsets(radius: int) -> list[tuple[int, int]]:
+    """Axial offsets of all hexes within ``radius`` of the origin, excluding it."""
+    return [
+        (dq, dr)
+        for dq in range(-radius, radius + 1)
+        for dr in range(max(-radius, -dq - radius), min(radius, -dq + radius) + 1)
+        if (dq, dr) != (0, 0)
+    ]
+
+
+def chunk_of(q: int, r: int) -> tuple[int, int]:
+    return q // CHUNK_SIZE, r // CHUNK_SIZE
+
+
+def chunk_hexes(cq: int, cr: int) -> Iterator[tuple[int, int]]:
+    for q in range(cq * CHUNK_SIZE, (cq + 1) * CHUNK_SIZE):
+        for r in range(cr * CHUNK_SIZE, (cr + 1) * CHUNK_SIZE):
+            yield q, r
+
+
+class FeaturePlacer:
+    """Places the campaign's density-based feature types, one chunk at a time.
+
+    ``biome_of`` returns the biome name of a hex id; it must be deterministic.
+    """
+
+    def __init__(self, campaign: CampaignMeta, biome_of: Callable[[HexId], BiomeName]):
+        self._seed = campaign.seed
+        self._types = [t for t in campaign.feature_types if t.density is not None]
+        self._biome_of = biome_of
+        self._offsets = {t.name: _ring_offsets(t.min_spacing - 1) for t in self._types}
+        self._chunks: OrderedDict[tuple[int, int], Chunk] = OrderedDict()
+        # Placers are shared between request threads; chunks are computed outside
+        # the lock (at worst twice, with the same result).
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return bool(self._types)
+
+    def features_at(self, q: int, r: int) -> list[FeatureName]:
+        if not self._types:
+            return []
+        return self.chunk(*chunk_of(q, r)).get((q, r), [])
+
+    def chunk(self, cq: int, cr: int) -> Chunk:
+        """Placed features of the chunk at chunk coordinates ``(cq, cr)``, keyed by axial coordinates."""
+        key = (cq, cr)
+        with self._lock:
+            cached = self._chunks.get(key)
+            if cached is not None:
+                self._chunks.move_to_end(key)
+                return cached
+        result = self._compute_chunk(cq, cr)
+        with self._lock:
+            self._chunks[key] = result
+            if len(self._chunks) > CHUNK_CACHE_SIZE:
+                self._chunks.popitem(last=False)
+        return result
+
+    def _compute_chunk(self, cq: int, cr: int) -> Chunk:
+        result: Chunk = {}
+        biomes: dict[tuple[int, int], BiomeName | None] = {}
+        for ftype in self._types:
+            for q, r in self._place(ftype, cq, cr, biomes):
+                result.setdefault((q, r), []).append(ftype.name)
+        return result
+
+    def _place(
+        self, ftype: FeatureType, cq: int, cr: int, biomes: dict[tuple[int, int], BiomeName | None]
+    ) -> Iterator[tuple[int, int]]:
+        priorities: dict[tuple[int, int], float | None] = {}
+
+        def priority(q: int, r: int) -> float | None:
+            key = (q, r)
+            if key not in priorities:
+                priorities[key] = self._candidate(ftype, q, r, biomes)
+            return priorities[key]
+
+        offsets = self._offsets[ftype.name]
+        for q, r in chunk_hexes(cq, cr):
+            own = priority(q, r)
+            if own is None:
+                continue
+            # Ties on priority are broken by coordinates so the order is total.
+            if all(
+                (other := priority(q + dq, r + dr)) is None or (other, q + dq, r + dr) < (own, q, r)
+                for dq, dr in offsets
+            ):
+                yield q, r
+
+    def _candidate(
+        self,
+        ftype: FeatureType,
+        q: int,
+        r: int,
+        biomes: dict[tuple[int, int], BiomeName | None],
+    ) -> float | None:
+        """Priority of the hex as a candidate for ``ftype``, or None if it is not one."""
+        if (q, r) not in biomes:
+            hex_id = hexgrid.axial_to_id(q, r)
+            biomes[(q, r)] = self._biome_of(hex_id) if hex_id is not None else None
+        biome = biomes[(q, r)]
+        if biome is None:
+            return None
+        affinity = ftype.biome_affinity.get(biome, 0.0 if ftype.biome_affinity else 1.0)
+        chance = (ftype.density or 0.0) * affinity
+        if chance <= 0:
+            return None
+        digest = hashlib.blake2b(f"{self._seed}:{ftype.name}:{q}:{r}".encode(), digest_size=16).digest()
+        if int.from_bytes(digest[:8], "big") / _UNIT >= chance:
+            return None
+        return int.from_bytes(digest[8:], "big") / _UNIT
@@ -0,0 +1,184 @@
+"""Opt-in per-request profiling.
+
+A :class:`ProfileSession` records the route handler of one request twice: with
+``cProfile`` (exact call counts and times, saved as ``.prof`` plus a text
+summary) and with a stack sampler on the handler's thread (saved as collapsed
+stacks, the input format of flame graph tools). Sessions are stored under
+``<data dir>/profiles`` and only the newest ``SEEDSCAPE_PROFILE_MAX_FILES`` are
+kept.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import hmac
+import io
+import json
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from pathlib import Path
+from types import FrameType
+from typing import Any, TypeVar
+
+from seedscape.core import envconfig, storage
+
+PROFILE_HEADER = "X-Seedscape-Profile"
+SAMPLE_INTERVAL = 0.001
+PROFILE_EXTENSIONS = ("prof", "collapsed", "txt")
+
+T = TypeVar("T")
+
+# cProfile cannot run in two threads at once on newer Pythons; concurrent
+# profiled requests beyond the first simply run unprofiled.
+_profiler_lock = threading.Lock()
+
+current: ContextVar[ProfileSession | None] = ContextVar("seedscape_profile_session", default=None)
+
+
+def profiles_dir() -> Path:
+    return storage.DATA_DIR / "profiles"
+
+
+def should_profile(header_value: str | None, admin_token: str | None) -> bool:
+    """Decide whether to profile a request: explicitly requested by an admin, or sampled."""
+    if not envconfig.SEEDSCAPE_PROFILING:
+        return False
+    if (
+        header_value == "1"
+        and envconfig.SEEDSCAPE_ADMIN_TOKEN
+        and admin_token is not None
+        and hmac.compare_digest(admin_token.encode(), envconfig.SEEDSCAPE_ADMIN_TOKEN.encode())
+    ):
+        return True
+    rate = envconfig.SEEDSCAPE_PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+class _StackSampler:
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self.stacks: Counter[str] = Counter()
+        self._thread = threading.Thread(target=self._run, name="seedscape-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+
+def _collapse(frame: FrameType | None) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfileSession:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.profile = cProfile.Profile()
+        self.stacks: Counter[str] = Counter()
+        self.duration = 0.0
+
+    @property
+    def captured(self) -> bool:
+        return self.duration > 0
+
+    def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if not _profiler_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        sampler = _StackSampler(threading.get_ident())
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            return self.profile.runcall(func, *args, **kwargs)
+        finally:
+            self.duration += time.perf_counter() - started
+            sampler.stop()
+            self.stacks.update(sampler.stacks)
+            _profiler_lock.release()
+
+    async def run_async(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        # Coroutines share the event loop thread, so this also records whatever
+        # else the loop runs meanwhile; good enough for the few async handlers.
+        if not _profiler_lock.acquire(blocking=False):
+            return await func(*args, **kwargs)
+        sampler = _StackSampler(threading.get_ident())
+        sampler.start()
+        started = time.perf_counter()
+        self.profile.enable()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self.profile.disable()
+            self.duration += time.perf_counter() - started
+            sampler.stop()
+            self.stacks.update(sampler.stacks)
+            _profiler_lock.release()
+
+    def save(self, status_code: int) -> str:
+        directory = profiles_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        base = directory / profile_id
+
+        self.profile.dump_stats(str(base.with_suffix(".prof")))
+        summary = io.StringIO()
+        pstats.Stats(self.profile, stream=summary).sort_stats("cumulative").print_stats(40)
+        base.with_suffix(".txt").write_text(summary.getvalue(), encoding="utf-8")
+        base.with_suffix(".collapsed").write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()), encoding="utf-8"
+        )
+        info = {
+            "id": profile_id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": status_code,
+            "duration_ms": round(self.duration * 1000, 3),
+            "created_at": time.time(),
+        }
+        base.with_suffix(".json").write_text(json.dumps(info), encoding="utf-8")
+        enforce_retention()
+        return profile_id
+
+
+def list_profiles() -> list[dict[str, Any]]:
+    directory = profiles_dir()
+    if not directory.exists():
+        return []
+    return [json.loads(p.read_text(encoding="utf-8")) for p in sorted(directory.glob("*.json"), reverse=True)]
+
+
+def profile_file(profile_id: str, extension: str) -> Path | None:
+    if extension not in PROFILE_EXTENSIONS or "/" in profile_id or profile_id.startswith("."):
+        return None
+    path = profiles_dir() / f"{profile_id}.{extension}"
+    return path if path.exists() else None
+
+
+def enforce_retention(max_files: int | None = None) -> None:
+    keep = envconfig.SEEDSCAPE_PROFILE_MAX_FILES if max_files is None else max_files
+    infos = sorted(profiles_dir().glob("*.json"), reverse=True)
+    for stale in infos[keep:]:
+        for ext in ("json", *PROFILE_EXTENSIONS):
+            stale.with_suffix(f".{ext}").unlink(missing_ok=True)
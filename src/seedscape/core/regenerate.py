@@ -0,0 +1,155 @@
+"""Re-run generation for stored hexes after a campaign's rules changed.
+
+Stored hexes keep whatever biome, features and encounter they were generated
+with. :class:`Regenerator` regenerates them against a (new) ``CampaignMeta``,
+yields the differences and optionally writes them back in batches. User-authored
+fields (``notes``, ``discovered``) and ``created_at`` are kept. Hexes stored as
+overlays on the shared generation cache stay overlays, on the new rules.
+
+Hex files are streamed from disk in fixed-size chunks and at most a few chunks
+are in flight at once, so memory stays bounded regardless of campaign size.
+Results are yielded in the order the chunks were read, independent of the
+number of workers.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any
+
+from seedscape.core import generator, storage
+from seedscape.core.models import CampaignMeta, Hex, HexId
+
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_BATCH_SIZE = 512
+GENERATED_FIELDS = generator.GENERATED_FIELDS
+
+
+@dataclass
+class HexDiff:
+    hex_id: HexId
+    changes: dict[str, tuple[Any, Any]]
+    updated: Hex = field(repr=False)
+    overlay: bool = field(default=False, repr=False)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"id": self.hex_id, "changes": {k: {"old": old, "new": new} for k, (old, new) in self.changes.items()}}
+        )
+
+
+def _diff_hex(meta: CampaignMeta, stored: Hex) -> HexDiff | None:
+    fresh = generator.generate_hex(meta, stored.id)
+    changes = {}
+    for name in GENERATED_FIELDS:
+        old = stored.model_dump(mode="json", include={name})[name]
+        new = fresh.model_dump(mode="json", include={name})[name]
+        if old != new:
+            changes[name] = (old, new)
+    if not changes:
+        return None
+    updated = stored.model_copy(update={name: getattr(fresh, name) for name in GENERATED_FIELDS})
+    return HexDiff(stored.id, changes, updated)
+
+
+def _diff_chunk(meta_json: str, campaign_name: str, hex_ids: list[tuple[HexId, bool]]) -> list[HexDiff]:
+    meta = CampaignMeta.model_validate_json(meta_json)
+    diffs = []
+    for hex_id, overlay in hex_ids:
+        stored = storage.load_overlay_hex(campaign_name, hex_id) if overlay else storage.load_hex(campaign_name, hex_id)
+        if stored is None:
+            continue
+        diff = _diff_hex(meta, stored)
+        if diff is not None:
+            diff.overlay = overlay
+            diffs.append(diff)
+    return diffs
+
+
+def _iter_hexes(campaign_name: str) -> Iterator[tuple[HexId, bool]]:
+    for hex_id in storage.iter_hex_ids(campaign_name):
+        yield hex_id, False
+    for hex_id in storage.iter_overlay_ids(campaign_name):
+        yield hex_id, True
+
+
+def _chunks(names: Iterator[tuple[HexId, bool]], size: int) -> Iterator[list[tuple[HexId, bool]]]:
+    while chunk := list(islice(names, size)):
+        yield chunk
+
+
+class Regenerator:
+    def __init__(
+        self,
+        campaign_name: str,
+        meta: CampaignMeta | None = None,
+        *,
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        if workers < 1:
+            raise ValueError(f"workers expected to be 1 or greater, but is {workers}")
+        self.campaign_name = campaign_name
+        self.meta = meta or storage.load_campaign_meta(campaign_name)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.scanned = 0
+        self.changed = 0
+
+    def diffs(self, *, apply: bool = False) -> Iterator[HexDiff]:
+        """Yield a :class:`HexDiff` for every stored hex that would change.
+
+        With ``apply`` the updated hexes are saved in batches of ``batch_size``
+        and, once all hexes are done, ``meta`` is saved as the campaign meta.
+        """
+        pending: list[HexDiff] = []
+        for diff in self._run():
+            self.changed += 1
+            yield diff
+            if apply:
+                pending.append(diff)
+                if len(pending) >= self.batch_size:
+                    self._flush(pending)
+        if apply:
+            self._flush(pending)
+            storage.save_campaign_meta(self.meta)
+
+    def _flush(self, pending: list[HexDiff]) -> None:
+        rules_key = generator.rules_key(self.meta)
+        for diff in pending:
+            if diff.overlay:
+                storage.save_overlay_hex(self.campaign_name, rules_key, diff.updated)
+            else:
+                storage.save_hex(self.campaign_name, diff.hex_id, diff.updated)
+        pending.clear()
+
+    def _run(self) -> Iterator[HexDiff]:
+        meta_json = self.meta.model_dump_json()
+        chunks = _chunks(_iter_hexes(self.campaign_name), self.chunk_size)
+
+        if self.workers == 1:
+            for names in chunks:
+                self.scanned += len(names)
+                yield from _diff_chunk(meta_json, self.campaign_name, names)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight: deque[tuple[int, Future[list[HexDiff]]]] = deque()
+            for names in chunks:
+                in_flight.append((len(names), pool.submit(_diff_chunk, meta_json, self.campaign_name, names)))
+                if len(in_flight) >= 2 * self.workers:
+                    yield from self._collect(in_flight.popleft())
+            while in_flight:
+                yield from self._collect(in_flight.popleft())
+
+    def _collect(self, item: tuple[int, Future[list[HexDiff]]]) -> list[HexDiff]:
+        count, future = item
+        self.scanned += count
+        return future.result()
@@ -1,10 +1,35 @@
 from __future__ import annotations
 
+import functools
+import heapq
 import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any, TypeVar, cast
 
+from pydantic import ValidationError
+
+from seedscape.core import catalog, generator, hexgrid, migrations, tiles
 from seedscape.core.envconfig import SEEDSCAPE_DATA_DIR
-from seedscape.core.models import BiomeType, CampaignMeta, EncounterType, FeatureType, Hex
+from seedscape.core.models import (
+    BiomeType,
+    CampaignMeta,
+    CampaignSummary,
+    EncounterType,
+    FeatureType,
+    Hex,
+    HexOverlay,
+)
+
+log = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
 
 
 def _detect_data_dir() -> Path:
@@ -15,16 +40,131 @@ def _detect_data_dir() -> Path:
 
 DATA_DIR = _detect_data_dir()
 CAMPAIGNS_DIR = DATA_DIR / "campaigns"
+# Shared, content-addressed store of generated hexes: generated/<rules key>/<hex id>.json
+GENERATED_DIR = DATA_DIR / "generated"
+CATALOG = catalog.Catalog(DATA_DIR / "catalog.sqlite")
+_catalog_ready = False
+_meta_cache: dict[str, tuple[tuple[int, int], CampaignMeta]] = {}
+# Invalidation count per campaign and the lock ordering it with tile writes (see save_tile).
+_tile_epochs: dict[str, int] = {}
+_tiles_lock = threading.Lock()
+# Callbacks for caches derived from hex biomes outside storage (see on_biome_change).
+_biome_listeners: list[Callable[[str, str], None]] = []
+
+
+class _PendingWrites:
+    """Counts writes in progress so shutdown can wait for them to finish."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._count = 0
+
+    def __enter__(self) -> None:
+        with self._cond:
+            self._count += 1
+
+    def __exit__(self, *exc: object) -> None:
+        with self._cond:
+            self._count -= 1
+            if self._count == 0:
+                self._cond.notify_all()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def wait(self, timeout: float | None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self._count == 0, timeout)
+
+
+_pending_writes = _PendingWrites()
+
+# Striped locks serialising check-then-write sequences on the same hex within the process.
+_HEX_LOCK_STRIPES = 64
+_hex_locks = [threading.RLock() for _ in range(_HEX_LOCK_STRIPES)]
+
+
+def _hex_lock(campaign: str, hex_id: str) -> threading.RLock:
+    return _hex_locks[hash((campaign, hex_id)) % _HEX_LOCK_STRIPES]
+
+
+def _write(func: F) -> F:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _pending_writes:
+            return func(*args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+def pending_writes() -> int:
+    return _pending_writes.count
+
+
+def drain_writes(timeout: float | None = None) -> bool:
+    """Wait until no write is in progress; False if ``timeout`` ran out first."""
+    return _pending_writes.wait(timeout)
+
+
+def close() -> None:
+    CATALOG.close()
+
+
+HEX_VERSION = migrations.CURRENT_HEX_VERSION
+# Hexes are written by model_dump_json, which puts "version" last. Checking the
+# tail is enough to tell whether a stored file is current without parsing it.
+_CURRENT_HEX_TAIL = re.compile(rb'"version":\s*"' + re.escape(HEX_VERSION.encode()) + rb'"\s*}\s*$')
 
 
 def _campaign_path(name: str) -> Path:
     return CAMPAIGNS_DIR / name
 
 
-def list_campaigns() -> list[str]:
-    if not CAMPAIGNS_DIR.exists():
-        return []
-    return [p.name for p in CAMPAIGNS_DIR.iterdir() if p.is_dir()]
+def _catalog() -> catalog.Catalog:
+    global _catalog_ready
+    if not _catalog_ready:
+        # First use against an existing data dir without catalog: index it once.
+        if CATALOG.is_empty() and CAMPAIGNS_DIR.exists():
+            rebuild_catalog()
+        _catalog_ready = True
+    return CATALOG
+
+
+def index_campaign(name: str) -> None:
+    """(Re)build the catalog entry of one campaign from its directory."""
+    try:
+        meta = load_campaign_meta(name)
+    except (ValueError, ValidationError) as e:
+        log.warning("Skipping campaign '%s' in catalog: %s", name, e)
+        CATALOG.remove_campaign(name)
+        return
+    hex_count, last_activity = catalog.scan_hexes(_campaign_path(name) / "hexes")
+    overlay_count, overlay_activity = catalog.scan_hexes(_campaign_path(name) / "overlays")
+    if overlay_activity is not None and (last_activity is None or overlay_activity > last_activity):
+        last_activity = overlay_activity
+    CATALOG.set_campaign(meta, hex_count + overlay_count, last_activity)
+
+
+def rebuild_catalog() -> None:
+    """Re-index all campaign directories, e.g. after files were copied in by hand."""
+    names = {p.name for p in CAMPAIGNS_DIR.iterdir() if p.is_dir()} if CAMPAIGNS_DIR.exists() else set()
+    for summary in CATALOG.page(limit=-1):
+        if summary.name not in names:
+            CATALOG.remove_campaign(summary.name)
+    for name in sorted(names):
+        index_campaign(name)
+
+
+def list_campaigns(*, offset: int = 0, limit: int = -1) -> list[str]:
+    return [s.name for s in _catalog().page(offset=offset, limit=limit)]
+
+
+def list_campaign_summaries(
+    *, offset: int = 0, limit: int = 100, sort: str = "name", descending: bool = False
+) -> tuple[int, list[CampaignSummary]]:
+    cat = _catalog()
+    return cat.count(), cat.page(offset=offset, limit=limit, sort=sort, descending=descending)
 
 
 def campaign_exists(name: str) -> bool:
@@ -56,17 +196,44 @@ def create_campaign(
 
 
 def load_campaign_meta(campaign_name: str) -> CampaignMeta:
+    """Load a campaign's meta; parsed results are reused until meta.json changes on disk.
+
+    The returned model is shared between callers and must be treated as read-only.
+    """
     path = _campaign_path(campaign_name) / "meta.json"
-    if not path.exists():
-        raise ValueError(f"Campaign {campaign_name} not found.")
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return CampaignMeta.model_validate(data)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise ValueError(f"Campaign {campaign_name} not found.") from None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _meta_cache.get(campaign_name)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    data = json.loads(path.read_bytes())
+    if migrations.upgrade_meta(data):
+        meta = CampaignMeta.model_validate(data)
+        log.info("Migrated campaign meta '%s' to version %s", campaign_name, meta.version)
+        path.write_text(meta.model_dump_json(indent=2), encoding="utf-8")
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+    else:
+        meta = CampaignMeta.model_validate(data)
+    _meta_cache[campaign_name] = (stamp, meta)
+    return meta
 
 
+@_write
 def save_campaign_meta(meta: CampaignMeta) -> None:
     path = _campaign_path(meta.name)
     path.mkdir(parents=True, exist_ok=True)
     (path / "meta.json").write_text(meta.model_dump_json(indent=2), encoding="utf-8")
+    _meta_cache.pop(meta.name, None)
+    _catalog().upsert_campaign(meta)
+    _pin_overlays(meta.name, generator.rules_key(meta))
+    # Generated biomes depend on the campaign rules, so every cached tile may be stale.
+    with _tiles_lock:
+        _bump_tile_epoch(meta.name)
+        shutil.rmtree(_tiles_path(meta.name), ignore_errors=True)
 
 
 def campaign_biomes_css_path(campaign: str) -> Path | None:
@@ -85,14 +252,429 @@ def _hex_path(campaign: str, hex_id: str) -> Path:
 
 
 def load_hex(campaign: str, hex_id: str) -> Hex | None:
+    """A stored hex: a full hex file, or else an overlay on a shared generated hex."""
+    raw = load_hex_json(campaign, hex_id)
+    if raw is None:
+        return load_overlay_hex(campaign, hex_id)
+    return parse_hex_json(campaign, hex_id, raw)
+
+
+def parse_hex_json(campaign: str, hex_id: str, raw: bytes) -> Hex:
+    """Parse stored hex JSON, upgrading (and rewriting) files of an older schema version."""
+    if is_current_hex_json(raw):
+        return Hex.model_validate_json(raw)
+    data = json.loads(raw)
+    migrations.upgrade_hex(data)
+    hex_model = Hex.model_validate(data)
+    # Also rewrites current-version files without a version field, so they take the fast path next time.
+    _rewrite_hex(campaign, hex_id, raw, hex_model)
+    return hex_model
+
+
+def _rewrite_hex(campaign: str, hex_id: str, raw: bytes, hex_model: Hex) -> None:
+    """Replace the stored hex ``raw`` with ``hex_model``, unless it was written anew since it was read."""
     path = _hex_path(campaign, hex_id)
-    if not path.exists():
+    with _pending_writes, _hex_lock(campaign, hex_id):
+        try:
+            if path.read_bytes() != raw:
+                return
+        except FileNotFoundError:
+            return
+        _write_hex(path, hex_model)
+
+
+def iter_hex_ids(campaign: str) -> Iterator[str]:
+    """Ids of all stored hexes of a campaign, in directory order."""
+    hexes_dir = _campaign_path(campaign) / "hexes"
+    if not hexes_dir.is_dir():
+        return
+    with os.scandir(hexes_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                yield entry.name[: -len(".json")]
+
+
+def hex_needs_migration(campaign: str, hex_id: str, *, overlay: bool = False) -> bool:
+    """Check a stored hex's (or overlay's) schema version by reading only the end of the file."""
+    path = _overlay_path(campaign, hex_id) if overlay else _hex_path(campaign, hex_id)
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 64))
+        return not is_current_hex_json(f.read())
+
+
+def recent_hex_ids(campaign: str, limit: int) -> list[str]:
+    """Ids of the ``limit`` most recently written hexes (full or overlay) of a campaign."""
+    entries: list[tuple[float, str]] = []
+    for sub in ("hexes", "overlays"):
+        directory = _campaign_path(campaign) / sub
+        if not directory.is_dir():
+            continue
+        with os.scandir(directory) as it:
+            entries.extend(
+                (e.stat().st_mtime, e.name[: -len(".json")]) for e in it if e.name.endswith(".json") and e.is_file()
+            )
+    return [hex_id for _, hex_id in heapq.nlargest(limit, entries)]
+
+
+def load_hex_json(campaign: str, hex_id: str) -> bytes | None:
+    """Raw JSON of a stored hex, as written by :func:`save_hex`, or ``None``."""
+    try:
+        return _hex_path(campaign, hex_id).read_bytes()
+    except FileNotFoundError:
         return None
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return Hex.model_validate(data)
 
 
+def is_current_hex_json(raw: bytes) -> bool:
+    """Whether stored hex JSON has the current schema version and can be served as is."""
+    return _CURRENT_HEX_TAIL.search(raw, max(0, len(raw) - 64)) is not None
+
+
+@_write
 def save_hex(campaign: str, hex_id: str, hex_data: Hex) -> None:
+    """Store a hex, as an overlay if its generated fields match the shared cache, else in full.
+
+    Only the cache entry under the campaign's current rules is compared, so edits of
+    ``notes`` or ``discovered`` keep a hex shared. Either form replaces the other.
+    """
     path = _hex_path(campaign, hex_id)
+    overlay = _overlay_path(campaign, hex_id)
+    try:
+        rules_key: str | None = generator.rules_key(load_campaign_meta(campaign))
+    except ValueError:
+        rules_key = None  # no meta (yet), e.g. while an import is unpacked
+    with _hex_lock(campaign, hex_id):
+        created = not path.exists() and not overlay.exists()
+        changes_biome = _changes_biome(campaign, hex_id, hex_data, generated=False)
+        generated = load_generated(rules_key, hex_id) if rules_key else None
+        shared = generated is not None and hex_data.model_dump(mode="json", include=set(generated)) == generated
+        if rules_key and shared:
+            overlay.parent.mkdir(parents=True, exist_ok=True)
+            _write_overlay(overlay, rules_key, hex_data)
+            path.unlink(missing_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_hex(path, hex_data)
+            overlay.unlink(missing_ok=True)
+    _catalog().record_hex_write(campaign, created=created, now=time.time())
+    if changes_biome:
+        _biome_changed(campaign, hex_id)
+
+
+def _overlay_path(campaign: str, hex_id: str) -> Path:
+    return _campaign_path(campaign) / "overlays" / f"{hex_id}.json"
+
+
+def _generated_path(rules_key: str, hex_id: str) -> Path:
+    return GENERATED_DIR / rules_key / f"{hex_id}.json"
+
+
+def load_generated(rules_key: str, hex_id: str) -> dict[str, Any] | None:
+    """Generated fields of a hex from the shared generation cache, or ``None``."""
+    try:
+        return json.loads(_generated_path(rules_key, hex_id).read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def _tmp_path(path: Path) -> Path:
+    """A temporary sibling of ``path`` private to the writing process and thread."""
+    return path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+@_write
+def save_generated(rules_key: str, hex_data: Hex) -> None:
+    path = _generated_path(rules_key, hex_data.id)
     path.parent.mkdir(parents=True, exist_ok=True)
+    # Shared between campaigns (and processes), so never expose a half-written file.
+    tmp = _tmp_path(path)
+    tmp.write_text(hex_data.model_dump_json(include=set(generator.GENERATED_FIELDS)), encoding="utf-8")
+    tmp.replace(path)
+
+
+def compose_hex(overlay: dict[str, Any], generated: dict[str, Any]) -> Hex:
+    """Merge raw overlay and generated data and upgrade the result to the current schema."""
+    data = {**generated, **{k: v for k, v in overlay.items() if k != "base"}}
+    migrations.upgrade_hex(data)
+    return Hex.model_validate(data)
+
+
+def iter_overlay_ids(campaign: str) -> Iterator[str]:
+    """Ids of all hexes of a campaign stored as overlays."""
+    overlays_dir = _campaign_path(campaign) / "overlays"
+    if not overlays_dir.is_dir():
+        return
+    with os.scandir(overlays_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                yield entry.name[: -len(".json")]
+
+
+def load_hex_overlay(campaign: str, hex_id: str) -> HexOverlay | None:
+    try:
+        return HexOverlay.model_validate_json(_overlay_path(campaign, hex_id).read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def _generated_fields(campaign: str, hex_id: str, rules_key: str) -> dict[str, Any] | None:
+    """Generated fields of a hex under ``rules_key`` from the shared cache.
+
+    A missing entry is regenerated (and cached) if ``rules_key`` is the campaign's
+    current rules; for other rules it is ``None``.
+    """
+    generated = load_generated(rules_key, hex_id)
+    if generated is not None:
+        return generated
+    meta = load_campaign_meta(campaign)
+    if generator.rules_key(meta) != rules_key:
+        return None
+    fresh = generator.generate_hex(meta, hex_id)
+    save_generated(rules_key, fresh)
+    return fresh.model_dump(mode="json", include=set(generator.GENERATED_FIELDS))
+
+
+def _overlay_base(campaign: str, hex_id: str, base: str) -> dict[str, Any]:
+    """Generated fields an overlay rests on, regenerated if missing and the campaign rules still match."""
+    generated = _generated_fields(campaign, hex_id, base)
+    if generated is None:
+        raise RuntimeError(f"Generated hex {hex_id} for rules {base} is missing from the generation cache")
+    return generated
+
+
+def load_overlay_hex(campaign: str, hex_id: str) -> Hex | None:
+    """Compose a hex stored as an overlay with its generated fields from the shared cache.
+
+    Overlays of an older schema version are upgraded and rewritten, like full hexes.
+    """
+    try:
+        raw = _overlay_path(campaign, hex_id).read_bytes()
+    except FileNotFoundError:
+        return None
+    overlay = json.loads(raw)
+    generated = _overlay_base(campaign, hex_id, overlay["base"])
+    hex_model = compose_hex(overlay, generated)
+    if not is_current_hex_json(raw):
+        _rewrite_overlay(campaign, raw, overlay["base"], generated, hex_model)
+    return hex_model
+
+
+def load_overlay_hex_json(campaign: str, hex_id: str) -> bytes | None:
+    """JSON of a hex stored as an overlay, or ``None``.
+
+    Current overlays are merged with their generated fields as plain JSON, without
+    building a model, since both files were written by us; older ones go through
+    :func:`load_overlay_hex` and are upgraded.
+    """
+    try:
+        raw = _overlay_path(campaign, hex_id).read_bytes()
+    except FileNotFoundError:
+        return None
+    if not is_current_hex_json(raw):
+        hex_model = load_overlay_hex(campaign, hex_id)
+        return hex_model.model_dump_json().encode() if hex_model is not None else None
+    overlay = json.loads(raw)
+    generated = _overlay_base(campaign, hex_id, overlay.pop("base"))
+    return json.dumps({"id": overlay.pop("id"), **generated, **overlay}).encode()
+
+
+def _rewrite_overlay(campaign: str, raw: bytes, base: str, generated: dict[str, Any], hex_model: Hex) -> None:
+    """Store an upgraded overlay hex, unless the overlay was written anew since it was read.
+
+    The shared entry of ``base`` keeps its old schema, so the overlay stays on it
+    only if the upgrade left the generated fields alone. Otherwise it moves to
+    the current rules if they generate the same hex, or is stored in full.
+    """
+    hex_id = hex_model.id
+    upgraded = hex_model.model_dump(mode="json", include=set(generator.GENERATED_FIELDS))
+    path = _overlay_path(campaign, hex_id)
+    with _pending_writes, _hex_lock(campaign, hex_id):
+        try:
+            if path.read_bytes() != raw:
+                return
+        except FileNotFoundError:
+            return
+        if upgraded == generated:
+            _write_overlay(path, base, hex_model)
+        else:
+            _rebase_or_store_full(campaign, hex_model, generator.rules_key(load_campaign_meta(campaign)))
+
+
+def _write_overlay(path: Path, rules_key: str, hex_data: Hex) -> None:
+    overlay = HexOverlay(base=rules_key, **hex_data.model_dump(exclude=set(generator.GENERATED_FIELDS)))
+    path.write_text(overlay.model_dump_json(indent=2), encoding="utf-8")
+
+
+def _rebase_or_store_full(campaign: str, hex_model: Hex, rules_key: str) -> None:
+    """Store an overlay hex on ``rules_key`` if those rules generate the same fields, else in full.
+
+    Callers hold the hex's lock.
+    """
+    path = _overlay_path(campaign, hex_model.id)
+    generated = hex_model.model_dump(mode="json", include=set(generator.GENERATED_FIELDS))
+    if _generated_fields(campaign, hex_model.id, rules_key) == generated:
+        _write_overlay(path, rules_key, hex_model)
+        return
+    full = _hex_path(campaign, hex_model.id)
+    full.parent.mkdir(parents=True, exist_ok=True)
+    _write_hex(full, hex_model)
+    path.unlink(missing_ok=True)
+
+
+def _pin_overlays(campaign: str, rules_key: str) -> None:
+    """Make overlays on other rules than ``rules_key`` independent of the shared cache.
+
+    Only the current rules can regenerate a missing cache entry, so an overlay on
+    older rules is moved onto ``rules_key`` (the current rules) if they generate
+    the same hex, and is stored in full otherwise.
+    """
+    for hex_id in list(iter_overlay_ids(campaign)):
+        path = _overlay_path(campaign, hex_id)
+        with _hex_lock(campaign, hex_id):
+            try:
+                overlay = json.loads(path.read_bytes())
+            except FileNotFoundError:
+                continue
+            base = overlay["base"]
+            if base == rules_key:
+                continue
+            generated = load_generated(base, hex_id)
+            if generated is None:
+                log.warning("Cannot pin hex %s of campaign '%s': rules %s not cached", hex_id, campaign, base)
+                continue
+            _rebase_or_store_full(campaign, compose_hex(overlay, generated), rules_key)
+
+
+@_write
+def save_overlay_hex(campaign: str, rules_key: str, hex_data: Hex) -> None:
+    """Store a freshly generated hex as a campaign overlay on the shared generation cache.
+
+    The generated fields of ``hex_data`` must be what the rules ``rules_key`` produce.
+    """
+    if load_generated(rules_key, hex_data.id) is None:
+        save_generated(rules_key, hex_data)
+    path = _overlay_path(campaign, hex_data.id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    full = _hex_path(campaign, hex_data.id)
+    with _hex_lock(campaign, hex_data.id):
+        created = not path.exists() and not full.exists()
+        changes_biome = _changes_biome(campaign, hex_data.id, hex_data, generated=True)
+        _write_overlay(path, rules_key, hex_data)
+        full.unlink(missing_ok=True)
+    _catalog().record_hex_write(campaign, created=created, now=time.time())
+    if changes_biome:
+        _biome_changed(campaign, hex_data.id)
+
+
+@_write
+def compact_hexes(campaign: str) -> int:
+    """Turn full hex files whose generated fields match the shared cache into overlays.
+
+    Only hexes already in the cache under the campaign's current rules are
+    compacted, so imported content never ends up in the shared cache. Returns the
+    number of hexes compacted.
+    """
+    rules_key = generator.rules_key(load_campaign_meta(campaign))
+    compacted = 0
+    for hex_id in list(iter_hex_ids(campaign)):
+        generated = load_generated(rules_key, hex_id)
+        if generated is None:
+            continue
+        hex_model = load_hex(campaign, hex_id)
+        if hex_model is None or hex_model.model_dump(mode="json", include=set(generated)) != generated:
+            continue
+        _overlay_path(campaign, hex_id).parent.mkdir(parents=True, exist_ok=True)
+        _write_overlay(_overlay_path(campaign, hex_id), rules_key, hex_model)
+        _hex_path(campaign, hex_id).unlink()
+        compacted += 1
+    return compacted
+
+
+def _write_hex(path: Path, hex_data: Hex) -> None:
     path.write_text(hex_data.model_dump_json(indent=2), encoding="utf-8")
+
+
+def _tiles_path(campaign: str) -> Path:
+    return _campaign_path(campaign) / "tiles"
+
+
+def _tile_path(campaign: str, palette_key: str, z: int, x: int, y: int) -> Path:
+    return _tiles_path(campaign) / palette_key / str(z) / str(x) / f"{y}.png"
+
+
+def tile_epoch(campaign: str) -> int:
+    """Counter bumped whenever cached tiles of a campaign are invalidated; see :func:`save_tile`."""
+    return _tile_epochs.get(campaign, 0)
+
+
+def _bump_tile_epoch(campaign: str) -> None:
+    """Callers hold ``_tiles_lock`` while bumping and deleting the invalidated tiles."""
+    _tile_epochs[campaign] = _tile_epochs.get(campaign, 0) + 1
+
+
+def load_tile(campaign: str, palette_key: str, z: int, x: int, y: int) -> bytes | None:
+    path = _tile_path(campaign, palette_key, z, x, y)
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+@_write
+def save_tile(campaign: str, palette_key: str, z: int, x: int, y: int, data: bytes, *, epoch: int) -> bool:
+    """Cache a rendered tile, unless tiles were invalidated since ``epoch`` (from :func:`tile_epoch`).
+
+    A render that started before a hex changed may have drawn its old biome, and
+    its tile must not outlive the invalidation. Returns whether the tile was saved.
+    """
+    path = _tile_path(campaign, palette_key, z, x, y)
+    with _tiles_lock:
+        if tile_epoch(campaign) != epoch:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp_path(path)
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    return True
+
+
+def _changes_biome(campaign: str, hex_id: str, hex_data: Hex, *, generated: bool) -> bool:
+    """Whether storing ``hex_data`` changes the biome the hex is seen with.
+
+    Cached tiles and travel costs only depend on the biome. A hex that is not
+    stored yet is seen as generated, so storing it as generated (``generated``)
+    changes nothing.
+    """
+    try:
+        stored = load_hex(campaign, hex_id)
+    except (ValueError, RuntimeError):
+        return True
+    if stored is None:
+        return not generated
+    return stored.biome.name != hex_data.biome.name
+
+
+def on_biome_change(listener: Callable[[str, str], None]) -> None:
+    """Call ``listener(campaign, hex_id)`` after a save changed the biome of a hex."""
+    _biome_listeners.append(listener)
+
+
+def _biome_changed(campaign: str, hex_id: str) -> None:
+    invalidate_hex_tiles(campaign, hex_id)
+    for listener in _biome_listeners:
+        listener(campaign, hex_id)
+
+
+def invalidate_hex_tiles(campaign: str, hex_id: str) -> None:
+    try:
+        q, r = hexgrid.id_to_axial(hex_id)
+    except ValueError:
+        return  # not on the map grid, never rendered
+    root = _tiles_path(campaign)
+    with _tiles_lock:
+        _bump_tile_epoch(campaign)
+        if not root.exists():
+            return
+        for palette_dir in root.iterdir():
+            for z, x, y in tiles.tiles_for_hex(q, r):
+                (palette_dir / str(z) / str(x) / f"{y}.png").unlink(missing_ok=True)
@@ -0,0 +1,124 @@
+"""Server-side raster tiles of the hex map.
+
+Tiles use the frontend's pointy-top layout with hex ``G7`` (axial 0,0) centred on
+the world origin. At zoom ``z`` a hex has an outer radius of ``2**z`` pixels and
+every tile is ``TILE_SIZE`` pixels square; tile ``(x, y)`` covers world pixels
+``[x * TILE_SIZE, (x + 1) * TILE_SIZE)`` horizontally and likewise vertically.
+"""
+
+import hashlib
+import math
+import re
+import struct
+import zlib
+from collections.abc import Callable
+
+TILE_SIZE = 256
+MAX_ZOOM = 5
+
+RGBA = tuple[int, int, int, int]
+TRANSPARENT: RGBA = (0, 0, 0, 0)
+UNKNOWN_BIOME: RGBA = (128, 128, 128, 255)
+
+_SQRT3 = math.sqrt(3)
+_CSS_RULE_RE = re.compile(r"\.hex\.([A-Za-z0-9_-]+)\s*\{[^}]*?\bfill\s*:\s*#([0-9A-Fa-f]{3}|[0-9A-Fa-f]{6})\b")
+
+
+def parse_palette(css: str) -> dict[str, RGBA]:
+    """Extract ``.hex.<biome> { fill: #rrggbb }`` rules from a campaign's biomes CSS."""
+    palette: dict[str, RGBA] = {}
+    for name, color in _CSS_RULE_RE.findall(css):
+        if len(color) == 3:
+            color = "".join(c * 2 for c in color)
+        palette[name] = (int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16), 255)
+    return palette
+
+
+def palette_key(palette: dict[str, RGBA]) -> str:
+    """Short stable hash of a palette; cached tiles are stored per palette."""
+    raw = ";".join(f"{name}={color}" for name, color in sorted(palette.items()))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def hex_size(z: int) -> float:
+    return float(2**z)
+
+
+def axial_center(q: int, r: int, size: float) -> tuple[float, float]:
+    return size * (_SQRT3 * q + _SQRT3 / 2 * r), size * 1.5 * r
+
+
+def pixel_to_axial(px: float, py: float, size: float) -> tuple[int, int]:
+    fq = (_SQRT3 / 3 * px - py / 3) / size
+    fr = (2 / 3 * py) / size
+    fs = -fq - fr
+    q, r, s = round(fq), round(fr), round(fs)
+    dq, dr, ds = abs(q - fq), abs(r - fr), abs(s - fs)
+    if dq > dr and dq > ds:
+        q = -r - s
+    elif dr > ds:
+        r = -q - s
+    return q, r
+
+
+def tiles_for_hex(q: int, r: int) -> list[tuple[int, int, int]]:
+    """All ``(z, x, y)`` tiles, over every zoom level, that a hex overlaps."""
+    result: list[tuple[int, int, int]] = []
+    for z in range(MAX_ZOOM + 1):
+        size = hex_size(z)
+        cx, cy = axial_center(q, r, size)
+        hw = _SQRT3 / 2 * size
+        x0, x1 = math.floor((cx - hw) / TILE_SIZE), math.floor((cx + hw) / TILE_SIZE)
+        y0, y1 = math.floor((cy - size) / TILE_SIZE), math.floor((cy + size) / TILE_SIZE)
+        result.extend((z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+    return result
+
+
+def render_tile(z: int, x: int, y: int, color_of: Callable[[int, int], RGBA]) -> bytes:
+    """Rasterise one tile to PNG bytes.
+
+    ``color_of`` is asked once per hex that appears in the tile. Pixels are
+    sampled at their centres; rows are assembled from per-hex colour runs so the
+    Python loop only does the axial rounding per pixel.
+    """
+    if not 0 <= z <= MAX_ZOOM:
+        raise ValueError(f"zoom expected from 0..{MAX_ZOOM}, but is {z}")
+    size = hex_size(z)
+    ox, oy = x * TILE_SIZE, y * TILE_SIZE
+    colors: dict[tuple[int, int], bytes] = {}
+    rows = []
+    for py in range(TILE_SIZE):
+        wy = oy + py + 0.5
+        row = bytearray(b"\x00")  # PNG filter type "None"
+        run_hex: tuple[int, int] | None = None
+        run_len = 0
+        for px in range(TILE_SIZE):
+            h = pixel_to_axial(ox + px + 0.5, wy, size)
+            if h != run_hex:
+                if run_hex is not None:
+                    row += colors[run_hex] * run_len
+                if h not in colors:
+                    colors[h] = bytes(color_of(*h))
+                run_hex, run_len = h, 0
+            run_len += 1
+        if run_hex is not None:
+            row += colors[run_hex] * run_len
+        rows.append(bytes(row))
+    return encode_png(TILE_SIZE, TILE_SIZE, b"".join(rows))
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def encode_png(width: int, height: int, filtered_rows: bytes) -> bytes:
+    """Encode 8-bit RGBA scanlines (each prefixed with its filter byte) as PNG."""
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", header),
+            _png_chunk(b"IDAT", zlib.compress(filtered_rows, 6)),
+            _png_chunk(b"IEND", b""),
+        ]
+    )
@@ -1,15 +1,55 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
-from seedscape.api import campaigns, hexes
+from seedscape.api import admin, campaigns, health, hexes, layers, metrics, tiles, travel
+from seedscape.api.profiling import profiling_middleware
+from seedscape.api.requestlog import request_log_middleware
+from seedscape.core import envconfig, lifecycle
+from seedscape.core.admission import AdmissionRejected
 from seedscape.core.envconfig import SEEDSCAPE_FRONTEND_DIR
 
-app = FastAPI(title="Seedscape", version="0.1")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    restore_sigterm = lifecycle.on_sigterm(lifecycle.manager.begin_drain)
+    lifecycle.manager.start(migrate=envconfig.SEEDSCAPE_MIGRATE_ON_START)
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(lifecycle.manager.shutdown)
+        restore_sigterm()
+
+
+app = FastAPI(title="Seedscape", version="0.1", lifespan=lifespan)
+app.middleware("http")(profiling_middleware)
+if envconfig.SEEDSCAPE_REQUEST_LOG:
+    app.middleware("http")(request_log_middleware)
+
+
+@app.exception_handler(AdmissionRejected)
+def admission_rejected(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.reason},
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
 
 app.include_router(hexes.router, prefix="/api")
 app.include_router(campaigns.router, prefix="/api")
+app.include_router(travel.router, prefix="/api")
+app.include_router(tiles.router, prefix="/api")
+app.include_router(layers.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(health.router)
 
 frontend_dir = SEEDSCAPE_FRONTEND_DIR
 app.mount("/", StaticFiles(directory=str(frontend_dir), html=True), name="frontend")
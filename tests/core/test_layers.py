@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from seedscape.core import layers, noise
+from seedscape.core.models import LayerWarp, NoiseLayer
+
+
+class _Campaign:
+    def __init__(self, seed: str):
+        self.seed = seed
+
+
+COORDS = [(q, r) for q in range(-3, 4) for r in range(-3, 4)]
+
+
+def test_builtin_layers_match_hex_noise():
+    n = noise.Noise(_Campaign("layers"))
+    values = layers.Pipeline().evaluate(n, COORDS, ["altitude", "temperature"])
+    for k, (q, r) in enumerate(COORDS):
+        assert values["altitude"][k] == n.hex_noise(noise.NoiseType.altitude.value, q, r)
+        assert values["temperature"][k] == n.hex_noise(noise.NoiseType.temperature.value, q, r)
+
+
+def test_expressions_and_warp():
+    pipeline = layers.Pipeline(
+        [
+            NoiseLayer(name="vegetation", expr="clamp(0.6 * humidity + 0.4 * (1 - altitude))"),
+            NoiseLayer(name="danger", freq_base=0.1, warp=LayerWarp(x="altitude", y="humidity", strength=8)),
+        ]
+    )
+    n = noise.Noise(_Campaign("layers"))
+    values = pipeline.evaluate(n, COORDS)
+    assert set(values) >= {"altitude", "humidity", "temperature", "vegetation", "danger"}
+    for k in range(len(COORDS)):
+        expected = max(0.0, min(1.0, 0.6 * values["humidity"][k] + 0.4 * (1 - values["altitude"][k])))
+        assert math.isclose(values["vegetation"][k], expected)
+        assert 0.0 <= values["danger"][k] <= 1.0
+
+    unwarped = layers.Pipeline([NoiseLayer(name="danger", freq_base=0.1)]).evaluate(n, COORDS, ["danger"])
+    assert unwarped["danger"] != values["danger"]
+
+
+def test_evaluate_hashes_each_lattice_corner_once(monkeypatch):
+    n = noise.Noise(_Campaign("layers"))
+    calls = []
+    original = n._hash01
+    monkeypatch.setattr(n, "_hash01", lambda cfg, i, j: calls.append((cfg, i, j)) or original(cfg, i, j))
+    layers.Pipeline().evaluate(n, COORDS, ["altitude"])
+    assert len(calls) == len(set(calls))
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        [NoiseLayer(name="x", expr="__import__('os')")],
+        [NoiseLayer(name="x", expr="missing + 1")],
+        [NoiseLayer(name="a", expr="b"), NoiseLayer(name="b", expr="a")],
+        [NoiseLayer(name="x", expr="1 +")],
+    ],
+)
+def test_invalid_pipelines_raise(spec):
+    with pytest.raises(ValueError):
+        layers.Pipeline(spec)
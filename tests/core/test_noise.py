@@ -68,3 +68,15 @@ def test_hex_noise_range_and_determinism():
 
     v2 = n1.hex_noise(cfg, 11, -4)
     assert v11 != v2
+
+
+def test_shuffle_prototype_matches_fresh_construction():
+    n = noise.Noise(_Campaign("seed-proto"))
+    cfg = noise.NoiseType.humidity.value
+    for q, r in [(0, 0), (3, -7), (-123456, 98765)]:
+        h = hashlib.blake2b(key=n._key, salt=cfg.salt, person=noise.PERSON, digest_size=8)
+        h.update(q.to_bytes(8, "big", signed=True))
+        h.update(r.to_bytes(8, "big", signed=True))
+        assert n._shuffle(cfg, q, r) == int.from_bytes(h.digest(), "big", signed=False)
+    # Copies must not leak state into the shared prototype
+    assert n._shuffle(cfg, 1, 2) == n._shuffle(cfg, 1, 2)
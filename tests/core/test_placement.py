@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from seedscape.core import generator, hexgrid, placement
+from seedscape.core.models import BiomeType, CampaignMeta, EncounterType, FeatureType
+from seedscape.core.placement import FeaturePlacer, chunk_hexes
+
+
+def biome_type(name: str) -> BiomeType:
+    return BiomeType(
+        name=name,
+        min_altitude=0,
+        max_altitude=1,
+        min_temperature=0,
+        max_temperature=1,
+        min_humidity=0,
+        max_humidity=1,
+    )
+
+
+def make_campaign(*feature_types: FeatureType) -> CampaignMeta:
+    return CampaignMeta(
+        name="p",
+        seed="placement",
+        biome_types=[biome_type("forest"), biome_type("plains")],
+        biomes_css="biomes.css",
+        feature_types=list(feature_types),
+        encounter_types=[EncounterType(name="e")],
+        base_temperature=20.0,
+    )
+
+
+def make_placer(campaign: CampaignMeta) -> FeaturePlacer:
+    return FeaturePlacer(campaign, lambda hex_id: generator.hex_biome_type(campaign, hex_id).name)
+
+
+CHUNKS = list(itertools.product(range(-1, 2), range(-1, 2)))
+
+
+def placed(placer: FeaturePlacer, name: str) -> set[tuple[int, int]]:
+    return {pos for c in CHUNKS for pos, names in placer.chunk(*c).items() if name in names}
+
+
+def test_min_spacing_holds_across_chunk_boundaries():
+    campaign = make_campaign(FeatureType(name="village", density=0.5, min_spacing=4))
+    villages = placed(make_placer(campaign), "village")
+
+    assert len(villages) > 10
+    for a, b in itertools.combinations(villages, 2):
+        assert hexgrid.distance(a, b) >= 4
+
+
+def test_chunks_are_independent_of_generation_order():
+    campaign = make_campaign(
+        FeatureType(name="village", density=0.3, min_spacing=3),
+        FeatureType(name="tower", density=0.1, min_spacing=5),
+    )
+    forward = make_placer(campaign)
+    backward = make_placer(campaign)
+    expected = {c: forward.chunk(*c) for c in CHUNKS}
+    for c in reversed(CHUNKS):
+        assert backward.chunk(*c) == expected[c]
+
+    # A single hex lookup on a cold placer agrees with the chunk computed in bulk.
+    q, r = min(expected[(0, 0)])
+    assert make_placer(campaign).features_at(q, r) == expected[(0, 0)][(q, r)]
+
+
+def test_biome_affinity_and_density():
+    campaign = make_campaign(
+        FeatureType(name="hut", density=1.0, biome_affinity={"forest": 1.0}),
+        FeatureType(name="rare", density=0.05),
+    )
+    placer = make_placer(campaign)
+    huts = placed(placer, "hut")
+    rare = placed(placer, "rare")
+
+    grid = [pos for c in CHUNKS for pos in chunk_hexes(*c) if hexgrid.axial_to_id(*pos) is not None]
+    forest = {pos for pos in grid if generator.hex_biome_type(campaign, hexgrid.axial_to_id(*pos)).name == "forest"}
+    assert huts == forest
+    assert 0 < len(rare) < 0.1 * len(grid)
+
+
+def test_generate_hex_uses_placement():
+    campaign = make_campaign(
+        FeatureType(name="none"),
+        FeatureType(name="village", density=0.5, min_spacing=3),
+    )
+    placer = make_placer(campaign)
+    villages = placed(placer, "village")
+    q, r = next(iter(villages))
+
+    h = generator.generate_hex(campaign, hexgrid.axial_to_id(q, r))
+    assert [f.name for f in h.features] == ["none", "village"]
+
+    only_placed = make_campaign(FeatureType(name="village", density=0.5, min_spacing=3))
+    empty = next(pos for pos in chunk_hexes(0, 0) if pos not in villages)
+    assert generator.generate_hex(only_placed, hexgrid.axial_to_id(*empty)).features == []
+
+
+def test_chunk_cache_is_thread_safe(monkeypatch):
+    monkeypatch.setattr(placement, "CHUNK_CACHE_SIZE", 2)
+    campaign = make_campaign(FeatureType(name="village", density=0.3, min_spacing=2))
+    placer = make_placer(campaign)
+    expected = {c: make_placer(campaign).chunk(*c) for c in CHUNKS}
+
+    def lookups(_: int) -> bool:
+        return all(placer.chunk(*c) == expected[c] for _ in range(3) for c in CHUNKS)
+
+    with ThreadPoolExecutor(6) as pool:
+        assert all(pool.map(lookups, range(6)))
+    assert len(placer._chunks) == 2
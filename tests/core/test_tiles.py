@@ -0,0 +1,42 @@
+import struct
+import zlib
+
+from seedscape.core import tiles
+
+
+def test_parse_palette_hex_forms():
+    css = ".hex.plains { fill: #a3d977; }\n.hex.water{fill:#7af}\n.other { fill: #000000; }"
+    palette = tiles.parse_palette(css)
+    assert palette == {"plains": (0xA3, 0xD9, 0x77, 255), "water": (0x77, 0xAA, 0xFF, 255)}
+    assert tiles.palette_key(palette) == tiles.palette_key(dict(reversed(palette.items())))
+
+
+def test_pixel_to_axial_inverts_centers():
+    for q, r in [(0, 0), (3, -2), (-4, 5)]:
+        cx, cy = tiles.axial_center(q, r, 8.0)
+        assert tiles.pixel_to_axial(cx, cy, 8.0) == (q, r)
+
+
+def test_tiles_for_hex_covers_origin_quadrants():
+    found = set(tiles.tiles_for_hex(0, 0))
+    assert {(0, 0, 0), (0, -1, -1), (5, 0, 0), (5, -1, -1)} <= found
+
+
+def test_render_tile_png_and_colors():
+    asked = []
+
+    def color_of(q, r):
+        asked.append((q, r))
+        return (255, 0, 0, 255) if (q, r) == (0, 0) else tiles.TRANSPARENT
+
+    png = tiles.render_tile(5, 0, 0, color_of)
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert len(asked) == len(set(asked))
+
+    width, height = struct.unpack(">II", png[16:24])
+    assert (width, height) == (tiles.TILE_SIZE, tiles.TILE_SIZE)
+    idat_len = struct.unpack(">I", png[33:37])[0]
+    raw = zlib.decompress(png[41 : 41 + idat_len])
+    stride = 1 + 4 * tiles.TILE_SIZE
+    assert raw[1:5] == bytes((255, 0, 0, 255))  # top-left pixel lies in hex (0, 0)
+    assert len(raw) == stride * tiles.TILE_SIZE
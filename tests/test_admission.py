@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import importlib
+import threading
+
+import pytest
+
+from seedscape.core import admission
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_controller(clock: FakeClock, **overrides) -> admission.AdmissionController:
+    settings = {
+        "client_rate": 1.0,
+        "client_burst": 10.0,
+        "campaign_rate": 1.0,
+        "campaign_burst": 10.0,
+        "max_generations": 1,
+        "max_queue": 0,
+        "queue_timeout": 0.01,
+    }
+    settings.update(overrides)
+    return admission.AdmissionController(clock=clock, **settings)
+
+
+def test_generation_costs_more_than_hits():
+    clock = FakeClock()
+    ctl = make_controller(clock)
+
+    ctl.admit("c", "camp", generate=True)
+    ctl.admit("c", "camp", generate=True)
+    with pytest.raises(admission.AdmissionRejected) as exc:
+        ctl.admit("c", "camp", generate=True)
+    assert exc.value.status_code == 429
+    assert exc.value.retry_after_header == "5"
+
+    # A different client still gets hits served
+    for _ in range(10):
+        ctl.admit("other", "camp", generate=False)
+
+    clock.now += 5
+    ctl.admit("c", "camp", generate=True)
+
+
+def test_campaign_bucket_is_shared_between_clients():
+    clock = FakeClock()
+    ctl = make_controller(clock, client_burst=100.0)
+    ctl.admit("a", "camp", generate=True)
+    ctl.admit("b", "camp", generate=True)
+    with pytest.raises(admission.AdmissionRejected):
+        ctl.admit("c", "camp", generate=True)
+    ctl.admit("c", "elsewhere", generate=True)
+    assert ctl.snapshot()["rejected_campaign_rate"] == 1
+
+
+def test_generation_slots_are_bounded():
+    ctl = make_controller(FakeClock())
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with ctl.generation_slot():
+            entered.set()
+            release.wait()
+
+    t = threading.Thread(target=hold)
+    t.start()
+    entered.wait()
+    try:
+        assert ctl.snapshot()["generations_active"] == 1
+        with pytest.raises(admission.AdmissionRejected) as exc, ctl.generation_slot():
+            pass
+        assert exc.value.status_code == 503
+    finally:
+        release.set()
+        t.join()
+    with ctl.generation_slot():
+        pass
+    assert ctl.snapshot()["generations_active"] == 0
+
+
+def test_rates_must_be_positive(monkeypatch):
+    with pytest.raises(ValueError, match="client_rate"):
+        make_controller(FakeClock(), client_rate=0.0)
+
+    monkeypatch.setenv("SEEDSCAPE_CAMPAIGN_RATE", "0")
+    import seedscape.core.envconfig as envconfig
+
+    with pytest.raises(ValueError, match="SEEDSCAPE_CAMPAIGN_RATE"):
+        importlib.reload(envconfig)
+    monkeypatch.delenv("SEEDSCAPE_CAMPAIGN_RATE")
+    importlib.reload(envconfig)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import importlib
+import json
 from pathlib import Path
 
+import pytest
 from fastapi.testclient import TestClient
 
 
@@ -14,8 +16,12 @@ def make_client(tmp_path: Path) -> TestClient:
     # Use real frontend so static mount works
     os.environ["SEEDSCAPE_FRONTEND_DIR"] = str((Path(__file__).resolve().parents[1] / "frontend").resolve())
 
+    import seedscape.api.admin as admin
     import seedscape.api.campaigns as campaigns
     import seedscape.api.hexes as hexes
+    import seedscape.api.layers as layers
+    import seedscape.api.tiles as tiles
+    import seedscape.api.travel as travel
     import seedscape.core.envconfig as envconfig
     import seedscape.core.storage as storage
     import seedscape.main as main
@@ -23,7 +29,11 @@ def make_client(tmp_path: Path) -> TestClient:
     importlib.reload(envconfig)
     importlib.reload(storage)
     importlib.reload(campaigns)
+    importlib.reload(admin)
     importlib.reload(hexes)
+    importlib.reload(layers)
+    importlib.reload(tiles)
+    importlib.reload(travel)
     main = importlib.reload(main)
     return TestClient(main.app)
 
@@ -90,3 +100,312 @@ def test_hex_endpoint(tmp_path):
     data = r.json()
     assert data["id"] == "A1"
     assert data["biome"]["name"] == "b1"
+
+    # Second request is served from storage with the same content
+    r = client.get("/api/c2/hex/A1")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    assert r.json() == data
+
+
+def test_path_endpoint(tmp_path):
+    client = make_client(tmp_path)
+
+    params = [
+        ("name", "c3"),
+        ("biomes", "b1"),
+        ("biomes_css", "biomes.css"),
+        ("features", "f1"),
+        ("encounters", "e1"),
+    ]
+    assert client.post("/api/campaigns", params=params).status_code == 200
+
+    r = client.get("/api/c3/path", params={"start": "G7", "goal": "I7"})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["path"][0] == "G7" and data["path"][-1] == "I7"
+    assert len(data["path"]) == 3
+    assert data["cost"] == 2.0
+
+    # Saving a hex with another biome drops its cached travel cost.
+    import seedscape.api.travel as travel
+    import seedscape.core.storage as storage
+
+    costs = travel._pathfinders["c3"]._costs
+    assert "H7" in costs
+    assert client.get("/api/c3/hex/H7").status_code == 200  # stored as generated: same biome
+    assert "H7" in costs
+    h = storage.load_hex("c3", "H7")
+    storage.save_hex("c3", "H7", h.model_copy(update={"notes": "x"}))
+    assert "H7" in costs
+    storage.save_hex("c3", "H7", h.model_copy(update={"biome": h.biome.model_copy(update={"name": "b2"})}))
+    assert "H7" not in costs
+
+    r = client.get("/api/c3/path", params={"start": "G7", "goal": "nope"})
+    assert r.status_code == 400
+
+    r = client.get("/api/missing/path", params={"start": "G7", "goal": "I7"})
+    assert r.status_code == 404
+
+
+def test_export_import_endpoints(tmp_path, monkeypatch):
+    client = make_client(tmp_path)
+
+    params = [
+        ("name", "c4"),
+        ("biomes", "b1"),
+        ("biomes_css", "biomes.css"),
+        ("features", "f1"),
+        ("encounters", "e1"),
+    ]
+    assert client.post("/api/campaigns", params=params).status_code == 200
+    assert client.get("/api/c4/hex/A1").status_code == 200
+
+    r = client.get("/api/campaigns/c4/export")
+    assert r.status_code == 200
+    data = r.content
+
+    assert client.put("/api/campaigns/c5/import", params={"offset": 0}, content=data[:10]).json() == {"received": 10}
+    r = client.put("/api/campaigns/c5/import", params={"offset": 0}, content=data[10:])
+    assert r.status_code == 409 and r.headers["Upload-Offset"] == "10"
+    r = client.put("/api/campaigns/c5/import", params={"offset": 10}, content=data[10:])
+    assert r.json() == {"received": len(data)}
+
+    # Chunks above the limit are rejected without being buffered or kept.
+    import seedscape.core.archive as archive
+
+    monkeypatch.setattr(archive, "MAX_UPLOAD_CHUNK", 16)
+    r = client.put("/api/campaigns/c6/import", params={"offset": 0}, content=iter([data[:10], data[10:20]]))
+    assert r.status_code == 413
+    assert client.get("/api/campaigns/c6/import").json() == {"received": 0}
+
+    r = client.post("/api/campaigns/c5/import/complete")
+    assert r.status_code == 200 and r.json()["name"] == "c5"
+    assert client.get("/api/c5/hex/A1").json()["id"] == "A1"
+
+    assert client.get("/api/campaigns/missing/export").status_code == 404
+
+
+def test_tile_endpoint_caches_and_invalidates(tmp_path, monkeypatch):
+    client = make_client(tmp_path)
+
+    params = [
+        ("name", "c6"),
+        ("biomes", "b1"),
+        ("biomes_css", "biomes.css"),
+        ("features", "f1"),
+        ("encounters", "e1"),
+    ]
+    assert client.post("/api/campaigns", params=params).status_code == 200
+    (tmp_path / "campaigns" / "c6" / "biomes.css").write_text(".hex.b1 { fill: #00ff00; }", encoding="utf-8")
+
+    # Tiles only draw biomes, so unstored hexes are never fully generated for them.
+    from seedscape.core import generator
+
+    with monkeypatch.context() as m:
+        m.setattr(generator, "generate_hex", lambda *a, **kw: pytest.fail("tile rendering generated a hex"))
+        r = client.get("/api/c6/tiles/3/0/0.png")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "image/png"
+    assert r.content.startswith(b"\x89PNG")
+    cached = list((tmp_path / "campaigns" / "c6" / "tiles").rglob("*.png"))
+    assert len(cached) == 1
+
+    # Generating a hex inside the tile keeps the image, changing its biome drops it
+    assert client.get("/api/c6/hex/G7").status_code == 200
+    assert cached[0].exists()
+    from seedscape.core import storage
+
+    h = storage.load_hex("c6", "G7")
+    storage.save_hex("c6", "G7", h.model_copy(update={"biome": h.biome.model_copy(update={"name": "b2"})}))
+    assert not cached[0].exists()
+
+    assert client.get("/api/c6/tiles/99/0/0.png").status_code == 404
+    assert client.get("/api/c6/tiles/3/-40/-40.png").status_code == 404
+    assert list((tmp_path / "campaigns" / "c6" / "tiles").rglob("*.png")) == []
+
+
+def test_metrics_reports_admission(tmp_path):
+    client = make_client(tmp_path)
+
+    r = client.get("/api/metrics")
+    assert r.status_code == 200
+    assert "generations_active" in r.json()["admission"]
+
+
+def test_campaign_listing_pagination(tmp_path):
+    client = make_client(tmp_path)
+
+    for name in ("p1", "p2", "p3"):
+        params = [
+            ("name", name),
+            ("biomes", "b1"),
+            ("biomes_css", "biomes.css"),
+            ("features", "f1"),
+            ("encounters", "e1"),
+        ]
+        assert client.post("/api/campaigns", params=params).status_code == 200
+
+    r = client.get("/api/campaigns", params={"limit": 2, "order": "desc"})
+    assert r.json() == ["p3", "p2"]
+    assert r.headers["X-Total-Count"] == "3"
+
+    r = client.get("/api/campaigns", params={"offset": 2, "summary": True})
+    assert [s["name"] for s in r.json()] == ["p3"]
+    assert r.json()[0]["hex_count"] == 0
+
+    assert client.get("/api/campaigns", params={"sort": "bogus"}).status_code == 422
+
+
+def test_layers_endpoint(tmp_path):
+    client = make_client(tmp_path)
+
+    params = [
+        ("name", "c7"),
+        ("biomes", "b1"),
+        ("biomes_css", "biomes.css"),
+        ("features", "f1"),
+        ("encounters", "e1"),
+    ]
+    assert client.post("/api/campaigns", params=params).status_code == 200
+
+    r = client.get("/api/c7/layers", params=[("hex", "G7"), ("hex", "H7"), ("layer", "altitude")])
+    assert r.status_code == 200
+    data = r.json()
+    assert set(data) == {"altitude"} and set(data["altitude"]) == {"G7", "H7"}
+
+    r = client.get("/api/c7/layers", params=[("hex", "G7"), ("layer", "nope")])
+    assert r.status_code == 400
+
+
+def test_profiling_on_request_and_admin_download(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEEDSCAPE_PROFILING", "1")
+    monkeypatch.setenv("SEEDSCAPE_ADMIN_TOKEN", "secret")
+    monkeypatch.setenv("SEEDSCAPE_PROFILE_MAX_FILES", "1")
+    client = make_client(tmp_path)
+
+    params = [
+        ("name", "c8"),
+        ("biomes", "b1"),
+        ("biomes_css", "biomes.css"),
+        ("features", "f1"),
+        ("encounters", "e1"),
+    ]
+    assert client.post("/api/campaigns", params=params).status_code == 200
+
+    # Header without admin token is ignored
+    r = client.get("/api/c8/hex/A1", headers={"X-Seedscape-Profile": "1"})
+    assert "X-Seedscape-Profile-Id" not in r.headers
+
+    admin_headers = {"X-Admin-Token": "secret"}
+    for hex_id in ("A2", "A3"):
+        r = client.get(f"/api/c8/hex/{hex_id}", headers={"X-Seedscape-Profile": "1", **admin_headers})
+        assert r.status_code == 200
+    profile_id = r.headers["X-Seedscape-Profile-Id"]
+
+    assert client.get("/api/admin/profiles").status_code == 403
+    r = client.get("/api/admin/profiles", headers=admin_headers)
+    assert [p["id"] for p in r.json()] == [profile_id]  # retention keeps only the newest
+    assert r.json()[0]["path"] == "/api/c8/hex/A3"
+
+    r = client.get(f"/api/admin/profiles/{profile_id}.txt", headers=admin_headers)
+    assert r.status_code == 200 and "get_hex" in r.text
+    assert client.get(f"/api/admin/profiles/{profile_id}.exe", headers=admin_headers).status_code == 404
+
+
+def test_admin_migrations(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEEDSCAPE_ADMIN_TOKEN", "secret")
+    client = make_client(tmp_path)
+    admin_headers = {"X-Admin-Token": "secret"}
+    params = [
+        ("name", "c9"),
+        ("biomes", "b1"),
+        ("biomes_css", "biomes.css"),
+        ("features", "f1"),
+        ("encounters", "e1"),
+    ]
+    assert client.post("/api/campaigns", params=params).status_code == 200
+    assert client.get("/api/c9/hex/A1").status_code == 200
+
+    assert client.post("/api/admin/migrations", params={"campaign": "nope"}, headers=admin_headers).status_code == 404
+    r = client.post("/api/admin/migrations", params={"campaign": "c9"}, headers=admin_headers)
+    assert r.status_code == 202 and r.json()["started"]
+
+    import seedscape.core.migrator as migrator
+
+    migrator.runner._thread.join(10)
+    r = client.get("/api/admin/migrations", headers=admin_headers)
+    progress = r.json()["campaigns"]["c9"]
+    assert (progress["migrated"], progress["failed"], progress["done"]) == (0, 0, True)
+
+
+def test_cloned_campaign_reuses_generated_hexes(tmp_path, monkeypatch):
+    client = make_client(tmp_path)
+    from seedscape.core import generator, storage
+    from seedscape.core.models import BiomeType, EncounterType, FeatureType
+
+    for name in ("table1", "table2"):
+        storage.create_campaign(
+            name,
+            seed="template",
+            biome_types=[
+                BiomeType(
+                    name="b1",
+                    min_altitude=0,
+                    max_altitude=1,
+                    min_temperature=0,
+                    max_temperature=1,
+                    min_humidity=0,
+                    max_humidity=1,
+                )
+            ],
+            biomes_css="biomes.css",
+            feature_types=[FeatureType(name="f1")],
+            encounter_types=[EncounterType(name="e1")],
+        )
+
+    first = client.get("/api/table1/hex/C4")
+    assert first.status_code == 200
+
+    def no_generation(*args, **kwargs):
+        raise AssertionError("hex should come from the generation cache")
+
+    monkeypatch.setattr(generator, "generate_hex", no_generation)
+    second = client.get("/api/table2/hex/C4")
+    assert second.status_code == 200
+    assert {k: second.json()[k] for k in ("biome", "features", "encounter")} == {
+        k: first.json()[k] for k in ("biome", "features", "encounter")
+    }
+    assert client.get("/api/table2/hex/C4").json() == second.json()
+
+
+def test_cache_header_and_request_log(tmp_path, monkeypatch):
+    log_path = tmp_path / "requests.jsonl"
+    monkeypatch.setenv("SEEDSCAPE_REQUEST_LOG", str(log_path))
+    import seedscape.api.requestlog as requestlog
+
+    importlib.reload(requestlog)
+    client = make_client(tmp_path)
+    params = [
+        ("name", "c10"),
+        ("biomes", "b1"),
+        ("biomes_css", "biomes.css"),
+        ("features", "f1"),
+        ("encounters", "e1"),
+    ]
+    assert client.post("/api/campaigns", params=params).status_code == 200
+
+    generated = client.get("/api/c10/hex/B2")
+    assert generated.headers["X-Seedscape-Cache"] == "generated"
+    hit = client.get("/api/c10/hex/B2")
+    assert hit.headers["X-Seedscape-Cache"] == "hit"
+    assert hit.json() == generated.json()
+    assert client.get("/api/c10/tiles/3/0/0.png").headers["X-Seedscape-Cache"] == "generated"
+
+    entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert [(e["method"], e["route"], e["cache"]) for e in entries[-3:]] == [
+        ("GET", "/api/{campaign_name}/hex/{hex_id}", "generated"),
+        ("GET", "/api/{campaign_name}/hex/{hex_id}", "hit"),
+        ("GET", "/api/{campaign_name}/tiles/{z}/{x}/{y}.png", "generated"),
+    ]
+    assert entries[-1]["path"] == "/api/c10/tiles/3/0/0.png" and entries[-1]["status"] == 200
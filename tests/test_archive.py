@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import importlib
+import io
+from pathlib import Path
+
+import pytest
+
+from seedscape.core.models import Biome, BiomeType, Encounter, EncounterType, Feature, FeatureType, Hex
+
+
+def setup_modules(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SEEDSCAPE_DATA_DIR", str(tmp_path))
+    import seedscape.core.archive as archive
+    import seedscape.core.envconfig as envconfig
+    import seedscape.core.storage as storage
+
+    importlib.reload(envconfig)
+    storage = importlib.reload(storage)
+    archive = importlib.reload(archive)
+    return storage, archive
+
+
+def make_campaign(storage, name: str = "src", hexes: int = 20):
+    storage.create_campaign(
+        name,
+        seed="s",
+        biome_types=[
+            BiomeType(
+                name="a",
+                min_altitude=0,
+                max_altitude=1,
+                min_temperature=0,
+                max_temperature=1,
+                min_humidity=0,
+                max_humidity=1,
+            )
+        ],
+        biomes_css="biomes.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+    )
+    (storage.CAMPAIGNS_DIR / name / "biomes.css").write_text(".hex.a { fill: #fff; }", encoding="utf-8")
+    for i in range(hexes):
+        h = Hex(
+            id=f"A{i + 1}",
+            biome=Biome(name="a", altitude=0, temperature=0, humidity=0),
+            features=[Feature(name="f")],
+            encounter=Encounter(name="e"),
+            notes=f"note {i}",
+        )
+        storage.save_hex(name, h.id, h)
+
+
+def test_export_import_roundtrip(tmp_path, monkeypatch):
+    storage, archive = setup_modules(tmp_path, monkeypatch)
+    make_campaign(storage)
+
+    data = b"".join(archive.iter_export("src"))
+    meta = archive.import_archive(io.BytesIO(data), name="dst")
+    assert meta.name == "dst"
+    assert storage.load_campaign_meta("dst").name == "dst"
+    assert storage.load_hex("dst", "A7").notes == "note 6"
+    assert storage.campaign_biomes_css_path("dst") is not None
+
+    with pytest.raises(FileExistsError):
+        archive.import_archive(io.BytesIO(data), name="dst")
+
+
+def test_export_is_reproducible_and_resumable(tmp_path, monkeypatch):
+    storage, archive = setup_modules(tmp_path, monkeypatch)
+    make_campaign(storage)
+
+    full = b"".join(archive.iter_export("src"))
+    assert full == b"".join(archive.iter_export("src"))
+    assert b"".join(archive.iter_export("src", offset=100)) == full[100:]
+
+
+def test_import_rejects_tampered_archive(tmp_path, monkeypatch):
+    storage, archive = setup_modules(tmp_path, monkeypatch)
+    make_campaign(storage)
+
+    data = bytearray(b"".join(archive.iter_export("src")))
+    data[len(data) // 2] ^= 0xFF
+    with pytest.raises(ValueError):
+        archive.import_archive(io.BytesIO(bytes(data)), name="bad")
+    assert not storage.campaign_exists("bad")
+
+
+def test_resumable_upload(tmp_path, monkeypatch):
+    storage, archive = setup_modules(tmp_path, monkeypatch)
+    make_campaign(storage)
+    data = b"".join(archive.iter_export("src"))
+
+    assert archive.append_upload("up", 0, data[:50]) == 50
+    with pytest.raises(archive.UploadOffsetError):
+        archive.append_upload("up", 0, data[50:])
+    archive.append_upload("up", archive.upload_size("up"), data[50:])
+
+    meta = archive.complete_upload("up", sha256=archive.hashlib.sha256(data).hexdigest(), name="up")
+    assert meta.name == "up"
+    assert storage.load_hex("up", "A1") is not None
+    assert archive.upload_size("up") == 0
+
+
+def test_upload_chunks_are_limited(tmp_path, monkeypatch):
+    _, archive = setup_modules(tmp_path, monkeypatch)
+
+    with archive.open_upload("up", 0, limit=10) as write:
+        write(b"12345")
+        write(b"67890")
+    with pytest.raises(archive.UploadTooLargeError), archive.open_upload("up", 10, limit=10) as write:
+        write(b"abcdef")
+        write(b"ghijkl")
+    assert archive.upload_size("up") == 10  # the rejected chunk is dropped whole
+
+    # A broken-off request keeps what arrived, so the upload resumes after it.
+    with pytest.raises(ConnectionError), archive.open_upload("up", 10) as write:
+        write(b"abc")
+        raise ConnectionError
+    assert archive.upload_size("up") == 13
+
+
+def test_overlay_hexes_are_exported_in_full_and_compacted_on_import(tmp_path, monkeypatch):
+    from seedscape.core import generator
+
+    storage, archive = setup_modules(tmp_path, monkeypatch)
+    make_campaign(storage, hexes=2)
+    meta = storage.load_campaign_meta("src")
+    rules_key = generator.rules_key(meta)
+    generated = generator.generate_hex(meta, "C3").model_copy(update={"notes": "overlay"})
+    storage.save_overlay_hex("src", rules_key, generated)
+
+    data = b"".join(archive.iter_export("src"))
+    assert data == b"".join(archive.iter_export("src"))
+    archive.import_archive(io.BytesIO(data), name="clone")
+
+    assert storage.load_hex("clone", "C3") == generated
+    assert storage.load_hex_json("clone", "C3") is None  # stored as an overlay again
+    assert storage.load_hex_json("clone", "A1") is not None  # never generated here, kept in full
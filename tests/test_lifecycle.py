@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import importlib
+import signal
+import threading
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from seedscape.core import generator
+from seedscape.core.models import BiomeType, EncounterType, FeatureType
+
+
+def setup_modules(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SEEDSCAPE_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("SEEDSCAPE_MIGRATE_ON_START", "0")
+    import seedscape.core.envconfig as envconfig
+    import seedscape.core.lifecycle as lifecycle
+    import seedscape.core.storage as storage
+
+    importlib.reload(envconfig)
+    storage = importlib.reload(storage)
+    lifecycle = importlib.reload(lifecycle)
+    return storage, lifecycle
+
+
+def make_campaign(storage, name: str = "w", hexes: int = 5):
+    meta = storage.create_campaign(
+        name,
+        seed="s",
+        biome_types=[
+            BiomeType(
+                name="b",
+                min_altitude=0,
+                max_altitude=1,
+                min_temperature=0,
+                max_temperature=1,
+                min_humidity=0,
+                max_humidity=1,
+            )
+        ],
+        biomes_css="b.css",
+        feature_types=[FeatureType(name="f"), FeatureType(name="village", density=0.3, min_spacing=3)],
+        encounter_types=[EncounterType(name="e")],
+    )
+    for i in range(hexes):
+        hex_id = f"G{i + 7}"
+        storage.save_overlay_hex(name, generator.rules_key(meta), generator.generate_hex(meta, hex_id))
+    return meta
+
+
+def test_warm_up_preloads_recent_campaigns(tmp_path, monkeypatch):
+    storage, lifecycle = setup_modules(tmp_path, monkeypatch)
+    make_campaign(storage, "w")
+    make_campaign(storage, "empty", hexes=0)
+
+    report = lifecycle.Lifecycle().warm_up()
+    assert sorted(report.campaigns) == ["empty", "w"]
+    assert report.chunks >= 2
+    assert report.errors == {}
+
+
+def test_warm_up_reports_broken_campaigns_and_still_gets_ready(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEEDSCAPE_PRELOAD_CAMPAIGNS", "w,broken,missing")
+    storage, lifecycle = setup_modules(tmp_path, monkeypatch)
+    make_campaign(storage, "w")
+    (storage.CAMPAIGNS_DIR / "broken").mkdir()
+    (storage.CAMPAIGNS_DIR / "broken" / "meta.json").write_text("{", encoding="utf-8")
+
+    life = lifecycle.Lifecycle()
+    life.start()
+    assert life.wait_ready(10)
+    assert life.report.campaigns == ["w"]
+    assert list(life.report.errors) == ["broken"]
+    assert life.status()["status"] == "ready"
+
+
+def test_shutdown_drains_pending_writes_within_deadline(tmp_path, monkeypatch):
+    storage, lifecycle = setup_modules(tmp_path, monkeypatch)
+    release = threading.Event()
+
+    def slow_write():
+        with storage._pending_writes:
+            release.wait(5)
+
+    writer = threading.Thread(target=slow_write)
+    writer.start()
+    while storage.pending_writes() == 0:
+        time.sleep(0.001)
+
+    life = lifecycle.Lifecycle()
+    assert not life.shutdown(timeout=0.05)
+    assert life.status()["pending_writes"] == 1
+
+    threading.Timer(0.1, release.set).start()
+    started = time.monotonic()
+    assert lifecycle.Lifecycle().shutdown(timeout=5)
+    assert time.monotonic() - started >= 0.05
+    writer.join()
+
+
+def test_sigterm_marks_draining_and_chains_previous_handler(tmp_path, monkeypatch):
+    _, lifecycle = setup_modules(tmp_path, monkeypatch)
+    calls = []
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: calls.append("previous"))
+    try:
+        life = lifecycle.Lifecycle()
+        life.state = lifecycle.READY
+        restore = lifecycle.on_sigterm(life.begin_drain)
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+        assert life.state == lifecycle.DRAINING
+        assert calls == ["previous"]
+        restore()
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+        assert calls == ["previous", "previous"]
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+
+def test_readiness_endpoint_follows_lifespan(tmp_path, monkeypatch):
+    storage, lifecycle = setup_modules(tmp_path, monkeypatch)
+    make_campaign(storage, "w")
+    import seedscape.main as main
+
+    main = importlib.reload(main)
+
+    assert TestClient(main.app).get("/healthz/ready").status_code == 503
+    with TestClient(main.app) as client:
+        assert lifecycle.manager.wait_ready(10)
+        r = client.get("/healthz/ready")
+        assert r.status_code == 200
+        assert r.json()["warmup"]["campaigns"] == ["w"]
+        assert client.get("/healthz/live").json() == {"status": "ok"}
+    assert lifecycle.manager.state == lifecycle.STOPPED
+
+
+def test_migrator_starts_only_with_registered_migrations(tmp_path, monkeypatch):
+    _, lifecycle = setup_modules(tmp_path, monkeypatch)
+    from seedscape.core import migrations
+
+    started = []
+    monkeypatch.setattr(lifecycle.migrator.runner, "start", lambda: started.append(True))
+    monkeypatch.setattr(migrations, "HEX_MIGRATIONS", {})
+    monkeypatch.setattr(migrations, "META_MIGRATIONS", {})
+    life = lifecycle.Lifecycle()
+    life.start(migrate=True)
+    assert life.wait_ready(10)
+    assert started == []
+
+    monkeypatch.setitem(migrations.HEX_MIGRATIONS, "0.0", migrations.Migration("0.0", "0.1", lambda d: d))
+    life.start(migrate=True)
+    assert life.wait_ready(10)
+    assert started == [True]
+
+
+def test_drain_during_warm_up_is_not_overwritten_by_ready(tmp_path, monkeypatch):
+    _, lifecycle = setup_modules(tmp_path, monkeypatch)
+    life = lifecycle.Lifecycle()
+
+    def warm_up_then_sigterm():
+        life.begin_drain()  # SIGTERM arrives right as warm-up finishes
+        return lifecycle.WarmupReport()
+
+    monkeypatch.setattr(life, "warm_up", warm_up_then_sigterm)
+    life.start()
+    assert not life.wait_ready(10)
+    assert life.state == lifecycle.DRAINING
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+from test_api import make_client
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "loadtest.py"
+
+
+def load_script(monkeypatch):
+    spec = importlib.util.spec_from_file_location("loadtest", SCRIPT)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "loadtest", module)  # dataclasses resolve annotations through it
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_replay_creates_missing_campaigns_only(tmp_path, monkeypatch):
+    client = make_client(tmp_path / "data")
+    params = [("name", "kept"), ("biomes", "forest"), ("biomes_css", "biomes.css")]
+    params += [("features", "none"), ("encounters", "none")]
+    assert client.post("/api/campaigns", params=params).status_code == 200
+    loadtest = load_script(monkeypatch)
+
+    log = tmp_path / "requests.jsonl"
+    entries = [
+        # Requests that matched no route are recorded with a null route.
+        {"t": 1.0, "method": "GET", "path": "/api/nowhere", "route": None},
+        {"t": 1.1, "method": "GET", "path": "/api/kept/hex/A1", "route": loadtest.HEX_ROUTE},
+        {"t": 1.2, "method": "GET", "path": "/api/fresh/hex/A1", "route": loadtest.HEX_ROUTE},
+    ]
+    log.write_text("".join(json.dumps(e) + "\n" for e in entries), encoding="utf-8")
+
+    args = argparse.Namespace(log=str(log), url=None, speed=100.0, concurrency=4)
+    stats = asyncio.run(loadtest.replay(args))
+
+    report = stats.report()
+    assert report["requests"] == 3 and "errors" not in report
+    assert report["statuses"] == {200: 2, 404: 1}
+    # The existing campaign keeps its own tables; the missing one gets the defaults.
+    assert client.get("/api/campaigns/kept/biomes").json() == ["forest"]
+    assert "water" in client.get("/api/campaigns/fresh/biomes").json()
+    assert client.get("/api/campaigns/missing/biomes").status_code == 404
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import importlib
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from seedscape.core import generator, migrations
+from seedscape.core.models import BiomeType, EncounterType, FeatureType
+
+
+def setup_modules(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SEEDSCAPE_DATA_DIR", str(tmp_path))
+    import seedscape.core.envconfig as envconfig
+    import seedscape.core.migrator as migrator
+    import seedscape.core.storage as storage
+
+    importlib.reload(envconfig)
+    storage = importlib.reload(storage)
+    migrator = importlib.reload(migrator)
+    return storage, migrator
+
+
+@pytest.fixture
+def legacy_hexes(monkeypatch):
+    """Pretend hexes used to be stored as version "0.0" without a ``notes`` field."""
+
+    def upgrade(data):
+        data["notes"] = data.pop("legacy_notes", "")
+        return data
+
+    monkeypatch.setitem(
+        migrations.HEX_MIGRATIONS, "0.0", migrations.Migration("0.0", migrations.CURRENT_HEX_VERSION, upgrade)
+    )
+
+
+def make_world(storage, hexes: int = 10, legacy: int = 0):
+    meta = storage.create_campaign(
+        "w",
+        seed="s",
+        biome_types=[
+            BiomeType(
+                name="plains",
+                min_altitude=0,
+                max_altitude=1,
+                min_temperature=0,
+                max_temperature=1,
+                min_humidity=0,
+                max_humidity=1,
+            )
+        ],
+        biomes_css="b.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+    )
+    for i in range(hexes):
+        hex_id = f"A{i + 1}"
+        storage.save_hex("w", hex_id, generator.generate_hex(meta, hex_id))
+    for i in range(legacy):
+        path = storage.CAMPAIGNS_DIR / "w" / "hexes" / f"A{i + 1}.json"
+        data = json.loads(path.read_text())
+        data["legacy_notes"] = f"old {i}"
+        del data["notes"]
+        data["version"] = "0.0"
+        path.write_text(json.dumps(data))
+    return meta
+
+
+def test_upgrade_chains_steps(monkeypatch):
+    monkeypatch.setattr(migrations, "CURRENT_HEX_VERSION", "0.3")
+    monkeypatch.setattr(migrations, "HEX_MIGRATIONS", {})
+    migrations.hex_migration("0.1", "0.2")(lambda d: {**d, "a": 1})
+    migrations.hex_migration("0.2", "0.3")(lambda d: {**d, "b": d["a"] + 1})
+
+    data = {"version": "0.1"}
+    assert migrations.upgrade_hex(data)
+    assert data == {"version": "0.3", "a": 1, "b": 2}
+    assert not migrations.upgrade_hex(data)
+
+
+def test_upgrade_without_path_fails():
+    with pytest.raises(ValueError, match="no hex migration path"):
+        migrations.upgrade_hex({"version": "9.9"})
+
+
+def test_duplicate_migration_rejected(monkeypatch):
+    monkeypatch.setattr(migrations, "HEX_MIGRATIONS", {})
+    migrations.hex_migration("0.0", "0.1")(lambda d: d)
+    with pytest.raises(ValueError, match="duplicate"):
+        migrations.hex_migration("0.0", "0.1")(lambda d: d)
+
+
+def test_load_hex_upgrades_and_rewrites(tmp_path, monkeypatch, legacy_hexes):
+    storage, _ = setup_modules(tmp_path, monkeypatch)
+    make_world(storage, hexes=2, legacy=1)
+
+    assert storage.hex_needs_migration("w", "A1")
+    assert not storage.hex_needs_migration("w", "A2")
+    h = storage.load_hex("w", "A1")
+    assert h is not None
+    assert h.notes == "old 0"
+    assert h.version == migrations.CURRENT_HEX_VERSION
+    assert not storage.hex_needs_migration("w", "A1")
+    assert storage.load_hex_json("w", "A1") is not None
+    assert storage.is_current_hex_json(storage.load_hex_json("w", "A1"))
+
+
+def test_migrator_rewrites_in_batches_and_records_progress(tmp_path, monkeypatch, legacy_hexes):
+    storage, migrator = setup_modules(tmp_path, monkeypatch)
+    make_world(storage, hexes=10, legacy=7)
+
+    progress = migrator.Migrator("w", batch_size=3, pause=0).run()
+
+    assert (progress.total, progress.scanned, progress.migrated, progress.failed) == (10, 10, 7, 0)
+    assert progress.done
+    assert not any(storage.hex_needs_migration("w", h) for h in storage.iter_hex_ids("w"))
+    assert migrator.load_progress("w") == progress
+    # A finished campaign is not scanned again.
+    assert migrator.Migrator("w").run().scanned == 10
+
+
+def test_migrator_resumes_after_stop(tmp_path, monkeypatch, legacy_hexes):
+    storage, migrator = setup_modules(tmp_path, monkeypatch)
+    make_world(storage, hexes=10, legacy=10)
+
+    stop = threading.Event()
+    first = migrator.Migrator("w", batch_size=4, pause=0, stop=stop)
+    monkeypatch.setattr(stop, "wait", lambda timeout=None: stop.set())
+    progress = first.run()
+    assert not progress.done
+    assert progress.migrated == 4
+
+    resumed = migrator.Migrator("w", batch_size=4, pause=0).run()
+    assert resumed.done
+    assert resumed.migrated == 10
+    assert resumed.failed == 0
+
+
+def test_migrator_counts_failures(tmp_path, monkeypatch, legacy_hexes):
+    storage, migrator = setup_modules(tmp_path, monkeypatch)
+    make_world(storage, hexes=3, legacy=3)
+    path = storage.CAMPAIGNS_DIR / "w" / "hexes" / "A2.json"
+    path.write_text(path.read_text().replace('"0.0"', '"7.7"'))
+
+    progress = migrator.Migrator("w", pause=0).run()
+    assert (progress.migrated, progress.failed) == (2, 1)
+    assert not progress.done
+
+
+def test_runner_reports_status(tmp_path, monkeypatch, legacy_hexes):
+    storage, migrator = setup_modules(tmp_path, monkeypatch)
+    make_world(storage, hexes=5, legacy=5)
+
+    runner = migrator.MigrationRunner()
+    assert runner.start(["w"])
+    runner._thread.join(10)
+    status = runner.status()
+    assert not status["running"]
+    assert status["campaigns"]["w"]["migrated"] == 5
+    assert status["campaigns"]["w"]["done"]
+
+
+def test_migrator_rewrites_files_without_version(tmp_path, monkeypatch):
+    storage, migrator = setup_modules(tmp_path, monkeypatch)
+    make_world(storage, hexes=2)
+    path = storage.CAMPAIGNS_DIR / "w" / "hexes" / "A1.json"
+    data = json.loads(path.read_text())
+    del data["version"]
+    path.write_text(json.dumps(data))
+
+    progress = migrator.Migrator("w", pause=0).run()
+    assert (progress.migrated, progress.failed, progress.done) == (1, 0, True)
+    assert not storage.hex_needs_migration("w", "A1")
+
+
+def test_upgrade_does_not_overwrite_a_newer_write(tmp_path, monkeypatch, legacy_hexes):
+    storage, _ = setup_modules(tmp_path, monkeypatch)
+    make_world(storage, hexes=1, legacy=1)
+    stale = storage.load_hex_json("w", "A1")
+
+    # A request saves the hex between the migrator's read and its rewrite.
+    edited = storage.load_hex("w", "A1").model_copy(update={"notes": "edited"})
+    storage.save_hex("w", "A1", edited)
+    upgraded = storage.parse_hex_json("w", "A1", stale)
+
+    assert upgraded.notes == "old 0"
+    assert storage.load_hex("w", "A1").notes == "edited"
+
+
+def make_overlays(storage, meta, legacy: dict[str, dict]):
+    """Store B1..B3 as overlays and turn the ones in ``legacy`` into version "0.0" files with those fields."""
+    key = generator.rules_key(meta)
+    for i in range(3):
+        hex_id = f"B{i + 1}"
+        storage.save_overlay_hex("w", key, generator.generate_hex(meta, hex_id))
+    for hex_id, fields in legacy.items():
+        path = storage.CAMPAIGNS_DIR / "w" / "overlays" / f"{hex_id}.json"
+        data = json.loads(path.read_text())
+        del data["notes"]
+        data.update(fields, version="0.0")
+        path.write_text(json.dumps(data))
+    return key
+
+
+def test_migrator_rewrites_old_overlays(tmp_path, monkeypatch, legacy_hexes):
+    storage, migrator = setup_modules(tmp_path, monkeypatch)
+    meta = make_world(storage, hexes=2, legacy=1)
+    key = make_overlays(storage, meta, {"B2": {"legacy_notes": "kept"}})
+    assert storage.hex_needs_migration("w", "B2", overlay=True)
+
+    progress = migrator.Migrator("w", pause=0).run()
+    assert (progress.total, progress.migrated, progress.failed, progress.done) == (5, 2, 0, True)
+    assert not storage.hex_needs_migration("w", "B2", overlay=True)
+    assert storage.load_hex_overlay("w", "B2").base == key
+    assert storage.load_hex("w", "B2").notes == "kept"
+
+
+def test_overlay_upgrade_changing_generated_fields_is_stored_in_full(tmp_path, monkeypatch):
+    def upgrade(data):
+        data["encounter"] = {**data["encounter"], "name": data["encounter"]["name"].upper()}
+        data["notes"] = None
+        return data
+
+    monkeypatch.setitem(
+        migrations.HEX_MIGRATIONS, "0.0", migrations.Migration("0.0", migrations.CURRENT_HEX_VERSION, upgrade)
+    )
+    storage, migrator = setup_modules(tmp_path, monkeypatch)
+    meta = make_world(storage, hexes=0)
+    key = make_overlays(storage, meta, {"B1": {}})
+
+    assert storage.load_hex("w", "B1").encounter.name == "E"
+    assert storage.load_hex_overlay("w", "B1") is None
+    assert storage.is_current_hex_json(storage.load_hex_json("w", "B1"))
+    # The shared entry, which other campaigns may still use, is left alone.
+    assert storage.load_generated(key, "B1")["encounter"]["name"] == "e"
+    assert migrator.Migrator("w", pause=0).run().migrated == 0
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from seedscape.core import hexgrid, pathfinding
+from seedscape.core.models import (
+    Biome,
+    BiomeType,
+    CampaignMeta,
+    Encounter,
+    EncounterType,
+    Feature,
+    FeatureType,
+    Hex,
+)
+
+
+def make_campaign() -> CampaignMeta:
+    def biome_type(name: str, cost: float) -> BiomeType:
+        return BiomeType(
+            name=name,
+            min_altitude=0,
+            max_altitude=1,
+            min_temperature=0,
+            max_temperature=1,
+            min_humidity=0,
+            max_humidity=1,
+            travel_cost=cost,
+        )
+
+    return CampaignMeta(
+        name="paths",
+        seed="s",
+        biome_types=[biome_type("plains", 1.0), biome_type("mountain", 10.0)],
+        biomes_css="biomes.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+        base_temperature=15,
+    )
+
+
+def make_source(mountains: set[str], calls: list[str] | None = None):
+    def source(hex_id: str) -> Hex:
+        if calls is not None:
+            calls.append(hex_id)
+        name = "mountain" if hex_id in mountains else "plains"
+        return Hex(
+            id=hex_id,
+            biome=Biome(name=name, altitude=0, temperature=0, humidity=0),
+            features=[Feature(name="f")],
+            encounter=Encounter(name="e"),
+        )
+
+    return source
+
+
+def test_hexgrid_id_roundtrip_and_distance():
+    assert hexgrid.id_to_axial("G7") == (0, 0)
+    assert hexgrid.axial_to_id(0, 0) == "G7"
+    assert hexgrid.axial_to_id(-7, 0) is None
+    assert hexgrid.distance((0, 0), (2, -1)) == 2
+    with pytest.raises(ValueError):
+        hexgrid.id_to_axial("g7")
+
+
+def test_find_path_avoids_expensive_biomes():
+    # A straight line G7 -> H7 -> I7 is blocked by a mountain on H7.
+    finder = pathfinding.Pathfinder(make_campaign(), make_source({"H7"}))
+    result = finder.find_path("G7", "I7")
+    assert result is not None
+    assert result.path[0] == "G7" and result.path[-1] == "I7"
+    assert "H7" not in result.path
+    assert result.cost == 3.0
+
+
+def test_cost_cache_avoids_repeated_loads():
+    calls: list[str] = []
+    finder = pathfinding.Pathfinder(make_campaign(), make_source(set(), calls))
+    finder.find_path("G7", "J7")
+    first = len(calls)
+    finder.find_path("G7", "J7")
+    assert len(calls) == first
+
+
+def test_invalidate_drops_stale_costs():
+    mountains: set[str] = set()
+    finder = pathfinding.Pathfinder(make_campaign(), make_source(mountains))
+    assert finder.find_path("G7", "I7").path == ["G7", "H7", "I7"]
+
+    mountains.add("H7")
+    assert finder.find_path("G7", "I7").path == ["G7", "H7", "I7"]  # still cached
+    finder.invalidate("H7")
+    assert "H7" not in finder.find_path("G7", "I7").path
+
+
+def test_lookup_racing_invalidate_is_not_cached():
+    calls: list[str] = []
+    source = make_source(set(), calls)
+
+    def racing_source(hex_id: str) -> Hex:
+        hex_model = source(hex_id)
+        finder.invalidate(hex_id)  # the hex is saved while its old version is being read
+        return hex_model
+
+    finder = pathfinding.Pathfinder(make_campaign(), racing_source)
+    finder.cost("G7")
+    finder.cost("G7")
+    assert calls == ["G7", "G7"]
+
+
+def test_find_path_limits():
+    finder = pathfinding.Pathfinder(make_campaign(), make_source(set()))
+    with pytest.raises(ValueError):
+        finder.find_path("G7", "Z7", max_distance=5)
+    assert finder.find_path("G7", "M7", max_expansions=2) is None
+
+
+def test_cost_cache_is_thread_safe():
+    finder = pathfinding.Pathfinder(make_campaign(), make_source(set()), cache_size=4)
+    ids = [hexgrid.axial_to_id(q, 0) for q in range(-6, 6)]
+
+    def lookups(_: int) -> bool:
+        return all(finder.cost(hex_id) == 1.0 for _ in range(200) for hex_id in ids)
+
+    with ThreadPoolExecutor(8) as pool:
+        assert all(pool.map(lookups, range(8)))
+    assert len(finder._costs) == 4
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import importlib
+import threading
+from pathlib import Path
+
+
+def setup_modules(tmp_path: Path, monkeypatch, **env: str):
+    monkeypatch.setenv("SEEDSCAPE_DATA_DIR", str(tmp_path))
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    import seedscape.core.envconfig as envconfig
+    import seedscape.core.profiling as profiling
+    import seedscape.core.storage as storage
+
+    importlib.reload(envconfig)
+    importlib.reload(storage)
+    return importlib.reload(profiling)
+
+
+def test_profiling_disabled_never_profiles(tmp_path, monkeypatch):
+    profiling = setup_modules(tmp_path, monkeypatch, SEEDSCAPE_ADMIN_TOKEN="secret", SEEDSCAPE_PROFILE_SAMPLE_RATE="1")
+    assert not profiling.should_profile("1", "secret")
+    assert not profiling.should_profile(None, None)
+
+
+def test_should_profile_on_admin_request_or_sample(tmp_path, monkeypatch):
+    profiling = setup_modules(tmp_path, monkeypatch, SEEDSCAPE_PROFILING="1", SEEDSCAPE_ADMIN_TOKEN="secret")
+    assert profiling.should_profile("1", "secret")
+    assert not profiling.should_profile("1", "wrong")
+    assert not profiling.should_profile("1", None)
+    assert not profiling.should_profile("0", "secret")
+    assert not profiling.should_profile(None, None)
+
+    monkeypatch.setattr(profiling.envconfig, "SEEDSCAPE_PROFILE_SAMPLE_RATE", 1.0)
+    assert profiling.should_profile(None, None)
+
+
+def test_session_saves_profile_files_and_keeps_newest(tmp_path, monkeypatch):
+    profiling = setup_modules(tmp_path, monkeypatch, SEEDSCAPE_PROFILING="1", SEEDSCAPE_PROFILE_MAX_FILES="1")
+
+    def busy() -> int:
+        return sum(i * i for i in range(20_000))
+
+    ids = []
+    for path in ("/first", "/second"):
+        session = profiling.ProfileSession("GET", path)
+        assert session.run(busy) == busy()
+        assert session.captured
+        ids.append(session.save(200))
+
+    assert [p["path"] for p in profiling.list_profiles()] == ["/second"]
+    assert profiling.profile_file(ids[0], "prof") is None
+    for ext in profiling.PROFILE_EXTENSIONS:
+        assert profiling.profile_file(ids[1], ext) is not None
+    assert "busy" in profiling.profile_file(ids[1], "txt").read_text(encoding="utf-8")
+    assert profiling.profile_file(ids[1], "json") is None
+    assert profiling.profile_file("../" + ids[1], "prof") is None
+
+
+def test_concurrent_session_runs_unprofiled(tmp_path, monkeypatch):
+    profiling = setup_modules(tmp_path, monkeypatch, SEEDSCAPE_PROFILING="1")
+    session = profiling.ProfileSession("GET", "/x")
+    with profiling._profiler_lock:
+        result = threading.Thread(target=lambda: session.run(lambda: None))
+        result.start()
+        result.join()
+    assert not session.captured
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+
+import pytest
+
+from seedscape.core import generator
+from seedscape.core.models import BiomeType, EncounterType, FeatureType
+
+
+def setup_modules(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SEEDSCAPE_DATA_DIR", str(tmp_path))
+    import seedscape.core.envconfig as envconfig
+    import seedscape.core.regenerate as regenerate
+    import seedscape.core.storage as storage
+
+    importlib.reload(envconfig)
+    storage = importlib.reload(storage)
+    regenerate = importlib.reload(regenerate)
+    return storage, regenerate
+
+
+def biome_type(name: str) -> BiomeType:
+    return BiomeType(
+        name=name,
+        min_altitude=0,
+        max_altitude=1,
+        min_temperature=0,
+        max_temperature=1,
+        min_humidity=0,
+        max_humidity=1,
+    )
+
+
+def make_world(storage, hexes: int = 30):
+    meta = storage.create_campaign(
+        "w",
+        seed="s",
+        biome_types=[biome_type("old")],
+        biomes_css="b.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+    )
+    for i in range(hexes):
+        hex_id = f"A{i + 1}"
+        h = generator.generate_hex(meta, hex_id).model_copy(update={"notes": f"n{i}", "discovered": i % 2 == 0})
+        storage.save_hex("w", hex_id, h)
+    return meta
+
+
+def test_dry_run_reports_changes_without_writing(tmp_path, monkeypatch):
+    storage, regenerate = setup_modules(tmp_path, monkeypatch)
+    meta = make_world(storage)
+    new_meta = meta.model_copy(update={"biome_types": [biome_type("new")]})
+
+    regen = regenerate.Regenerator("w", new_meta)
+    diffs = list(regen.diffs())
+    assert regen.scanned == 30 and regen.changed == 30
+    assert set(diffs[0].changes) == {"biome"}
+    assert diffs[0].changes["biome"][1]["name"] == "new"
+    assert storage.load_hex("w", "A1").biome.name == "old"
+
+    # Unchanged rules produce no diff
+    assert list(regenerate.Regenerator("w").diffs()) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_apply_keeps_user_fields(tmp_path, monkeypatch, workers):
+    storage, regenerate = setup_modules(tmp_path, monkeypatch)
+    meta = make_world(storage)
+    new_meta = meta.model_copy(update={"biome_types": [biome_type("new")]})
+
+    regen = regenerate.Regenerator("w", new_meta, workers=workers, chunk_size=4, batch_size=7)
+    ids = [d.hex_id for d in regen.diffs(apply=True)]
+    assert len(ids) == 30
+
+    h = storage.load_hex("w", "A3")
+    assert h.biome.name == "new"
+    assert h.notes == "n2" and h.discovered is True
+    assert storage.load_campaign_meta("w").biome_types[0].name == "new"
+
+
+def test_apply_keeps_unchanged_overlays_as_overlays(tmp_path, monkeypatch):
+    storage, regenerate = setup_modules(tmp_path, monkeypatch)
+    meta = storage.create_campaign(
+        "w",
+        seed="s",
+        biome_types=[biome_type("old"), biome_type("other")],
+        biomes_css="b.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+    )
+    key = generator.rules_key(meta)
+    for i in range(20):
+        h = generator.generate_hex(meta, f"A{i + 1}").model_copy(update={"notes": f"n{i}"})
+        storage.save_overlay_hex("w", key, h)
+
+    # Same number of biomes, so every hex draws the same one: only "other" hexes change.
+    new_meta = meta.model_copy(update={"biome_types": [biome_type("old"), biome_type("new")]})
+    changed = {d.hex_id for d in regenerate.Regenerator("w", new_meta).diffs(apply=True)}
+    assert 0 < len(changed) < 20
+
+    new_key = generator.rules_key(new_meta)
+    assert list(storage.iter_hex_ids("w")) == []
+    assert sorted(storage.iter_overlay_ids("w")) == sorted(f"A{i + 1}" for i in range(20))
+    for i in range(20):
+        hex_id = f"A{i + 1}"
+        assert storage.load_hex_overlay("w", hex_id).base == new_key
+        h = storage.load_hex("w", hex_id)
+        assert h.notes == f"n{i}"
+        assert h.biome.name == ("new" if hex_id in changed else "old")
@@ -106,3 +106,243 @@ def test_hex_load_save(tmp_path, monkeypatch):
     assert got is not None
     assert got.id == "A1"
     assert got.biome.name == "a"
+
+
+def _biome_types() -> list[BiomeType]:
+    return [
+        BiomeType(
+            name="a",
+            min_altitude=0,
+            max_altitude=1,
+            min_temperature=0,
+            max_temperature=1,
+            min_humidity=0,
+            max_humidity=1,
+        )
+    ]
+
+
+def test_catalog_summaries_and_pagination(tmp_path, monkeypatch):
+    storage = setup_storage(tmp_path, monkeypatch)
+
+    for name in ("c3", "c1", "c2"):
+        storage.create_campaign(
+            name,
+            seed=name,
+            biome_types=_biome_types(),
+            biomes_css="b.css",
+            feature_types=[FeatureType(name="f")],
+            encounter_types=[EncounterType(name="e")],
+        )
+    h = Hex(
+        id="A1",
+        biome=Biome(name="a", altitude=0.0, temperature=0.0, humidity=0.0),
+        features=[Feature(name="f")],
+        encounter=Encounter(name="e"),
+    )
+    storage.save_hex("c2", "A1", h)
+    storage.save_hex("c2", "A1", h)  # overwrite does not count twice
+    storage.save_hex("c2", "A2", h)
+
+    assert storage.list_campaigns() == ["c1", "c2", "c3"]
+    total, page = storage.list_campaign_summaries(offset=1, limit=1)
+    assert total == 3 and [s.name for s in page] == ["c2"]
+    assert page[0].hex_count == 2 and page[0].last_activity is not None
+
+    _, page = storage.list_campaign_summaries(sort="hex_count", descending=True, limit=1)
+    assert page[0].name == "c2"
+
+
+def test_catalog_is_built_from_existing_directories(tmp_path, monkeypatch):
+    storage = setup_storage(tmp_path, monkeypatch)
+    storage.create_campaign(
+        "old",
+        seed="s",
+        biome_types=_biome_types(),
+        biomes_css="b.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+    )
+    (storage.CAMPAIGNS_DIR / "old" / "hexes" / "A1.json").write_text("{}", encoding="utf-8")
+    storage.CATALOG.close()
+    (tmp_path / "catalog.sqlite").unlink()
+
+    storage = setup_storage(tmp_path, monkeypatch)
+    _, page = storage.list_campaign_summaries()
+    assert [(s.name, s.hex_count) for s in page] == [("old", 1)]
+
+
+def test_trusted_hex_json_and_meta_cache(tmp_path, monkeypatch):
+    storage = setup_storage(tmp_path, monkeypatch)
+    storage.create_campaign(
+        "c4",
+        seed="s",
+        biome_types=_biome_types(),
+        biomes_css="b.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+    )
+    h = Hex(
+        id="A1",
+        biome=Biome(name="a", altitude=0.0, temperature=0.0, humidity=0.0),
+        features=[Feature(name="f")],
+        encounter=Encounter(name="e"),
+        notes='"version": "0.1"}',
+    )
+    storage.save_hex("c4", "A1", h)
+    raw = storage.load_hex_json("c4", "A1")
+    assert storage.is_current_hex_json(raw)
+    assert Hex.model_validate_json(raw) == h
+    assert not storage.is_current_hex_json(raw.replace(b'"version": "0.1"\n', b'"version": "0.0"\n'))
+    assert storage.load_hex_json("c4", "missing") is None
+
+    first = storage.load_campaign_meta("c4")
+    assert storage.load_campaign_meta("c4") is first
+    storage.save_campaign_meta(first.model_copy(update={"description": "changed"}))
+    assert storage.load_campaign_meta("c4").description == "changed"
+
+
+def test_generation_cache_shared_between_campaigns(tmp_path, monkeypatch):
+    import shutil
+
+    from seedscape.core import generator
+
+    storage = setup_storage(tmp_path, monkeypatch)
+    metas = [
+        storage.create_campaign(
+            name,
+            seed=seed,
+            biome_types=_biome_types(),
+            biomes_css="b.css",
+            feature_types=[FeatureType(name="f"), FeatureType(name="g")],
+            encounter_types=[EncounterType(name="e")],
+        )
+        for name, seed in (("t1", "same"), ("t2", "same"), ("t3", "other"))
+    ]
+    keys = [generator.rules_key(m) for m in metas]
+    assert keys[0] == keys[1] != keys[2]
+
+    generated = generator.generate_hex(metas[0], "B2")
+    storage.save_overlay_hex("t1", keys[0], generated.model_copy(update={"notes": "mine"}))
+    storage.save_overlay_hex("t2", keys[1], generated)
+
+    assert list((storage.GENERATED_DIR / keys[0]).iterdir()) == [storage.GENERATED_DIR / keys[0] / "B2.json"]
+    assert "biome" not in (storage.CAMPAIGNS_DIR / "t1" / "overlays" / "B2.json").read_text()
+    assert storage.load_hex("t1", "B2") == generated.model_copy(update={"notes": "mine"})
+    assert storage.load_hex("t2", "B2") == generated
+    assert storage.load_hex("t3", "B2") is None
+    storage.index_campaign("t1")
+    assert storage.list_campaign_summaries()[1][0].hex_count == 1
+
+    # The shared cache can be dropped: overlays on the current rules regenerate it.
+    shutil.rmtree(storage.GENERATED_DIR)
+    assert storage.load_hex("t2", "B2") == generated
+
+    # Editing only user fields keeps the hex an overlay.
+    storage.save_hex("t1", "B2", generated.model_copy(update={"notes": "edited", "discovered": True}))
+    assert storage.load_hex_json("t1", "B2") is None
+    assert storage.load_hex("t1", "B2").notes == "edited"
+
+    # Other content is stored in full and replaces the overlay.
+    renamed = generated.model_copy(update={"biome": generated.biome.model_copy(update={"name": "elsewhere"})})
+    storage.save_hex("t1", "B2", renamed)
+    assert not (storage.CAMPAIGNS_DIR / "t1" / "overlays" / "B2.json").exists()
+    assert storage.load_hex("t1", "B2").biome.name == "elsewhere"
+
+    # Full copies written while the cache lacked the hex are compacted back into overlays.
+    other = generator.generate_hex(metas[1], "C3")
+    storage.save_hex("t2", "C3", other)
+    assert storage.load_hex_json("t2", "C3") is not None
+    storage.save_generated(keys[1], other)
+    assert storage.compact_hexes("t2") == 1
+    assert storage.load_hex_json("t2", "C3") is None
+    assert storage.load_hex("t2", "C3") == other
+
+
+def test_concurrent_first_writes_count_a_hex_once(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from seedscape.core import generator
+
+    storage = setup_storage(tmp_path, monkeypatch)
+    meta = storage.create_campaign(
+        "race",
+        seed="s",
+        biome_types=_biome_types(),
+        biomes_css="b.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+    )
+    key = generator.rules_key(meta)
+    generated = generator.generate_hex(meta, "C3")
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: storage.save_overlay_hex("race", key, generated), range(32)))
+
+    _, page = storage.list_campaign_summaries()
+    assert page[0].hex_count == 1
+
+
+def test_tiles_rendered_before_a_biome_change_are_not_cached(tmp_path, monkeypatch):
+    from seedscape.core import generator, tiles
+
+    storage = setup_storage(tmp_path, monkeypatch)
+    meta = storage.create_campaign(
+        "t",
+        seed="s",
+        biome_types=_biome_types(),
+        biomes_css="b.css",
+        feature_types=[FeatureType(name="f")],
+        encounter_types=[EncounterType(name="e")],
+    )
+    (z, x, y), *_ = tiles.tiles_for_hex(0, 0)  # G7
+    epoch = storage.tile_epoch("t")  # a render starts and draws G7 as generated ...
+    h = generator.generate_hex(meta, "G7")
+    storage.save_hex("t", "G7", h.model_copy(update={"biome": h.biome.model_copy(update={"name": "b"})}))
+    # ... and finishes after the change invalidated the tile.
+    assert not storage.save_tile("t", "p", z, x, y, b"stale", epoch=epoch)
+    assert storage.load_tile("t", "p", z, x, y) is None
+
+    assert storage.save_tile("t", "p", z, x, y, b"fresh", epoch=storage.tile_epoch("t"))
+    assert storage.load_tile("t", "p", z, x, y) == b"fresh"
+
+
+def test_rules_change_pins_overlays_on_old_rules(tmp_path, monkeypatch):
+    import shutil
+
+    from seedscape.core import generator
+
+    storage = setup_storage(tmp_path, monkeypatch)
+    metas = {
+        name: storage.create_campaign(
+            name,
+            seed="s",
+            biome_types=_biome_types(),
+            biomes_css="b.css",
+            feature_types=[FeatureType(name="f")],
+            encounter_types=[EncounterType(name="e")],
+        )
+        for name in ("p1", "p2")
+    }
+    old_key = generator.rules_key(metas["p1"])
+    hexes = {hex_id: generator.generate_hex(metas["p1"], hex_id) for hex_id in ("C3", "C4")}
+    for h in hexes.values():
+        storage.save_overlay_hex("p1", old_key, h.model_copy(update={"notes": "mine"}))
+        storage.save_overlay_hex("p2", old_key, h)
+
+    # p2 gets new rules; pretend they generate the same C3 (as cached) but not C4.
+    changed = metas["p2"].model_copy(update={"feature_types": [FeatureType(name="f"), FeatureType(name="g")]})
+    new_key = generator.rules_key(changed)
+    storage.save_generated(new_key, hexes["C3"])
+    storage.save_campaign_meta(changed)
+
+    assert storage.load_hex_overlay("p2", "C3").base == new_key
+    assert storage.load_hex_overlay("p2", "C4") is None
+    assert storage.load_hex_json("p2", "C4") is not None
+    assert storage.load_hex_overlay("p1", "C4").base == old_key  # other campaigns are untouched
+    assert storage.load_hex("p2", "C3") == hexes["C3"]
+
+    shutil.rmtree(storage.GENERATED_DIR)
+    assert storage.load_hex("p2", "C4") == hexes["C4"]
+    assert storage.load_hex("p1", "C4") == hexes["C4"].model_copy(update={"notes": "mine"})
+    _, page = storage.list_campaign_summaries(sort="name")
+    assert [s.hex_count for s in page] == [2, 2]